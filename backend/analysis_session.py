@@ -0,0 +1,196 @@
+import difflib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+# ========== ANALYSIS SESSION SETTINGS ==========
+ANALYSIS_SESSION_MAX = int(os.environ.get("ANALYSIS_SESSION_MAX", "1024"))
+# Sessions not updated for this long are dropped; the client starts a new one
+ANALYSIS_SESSION_TTL_SECONDS = float(os.environ.get("ANALYSIS_SESSION_TTL_SECONDS", "1800"))
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+# Last reported result of each session, shared by all server processes (WEB_WORKERS)
+ANALYSIS_DB_PATH = os.environ.get("ANALYSIS_DB_PATH", os.path.join(DATA_DIR, "analysis.db"))
+
+# Characters compared per slice when looking for the unchanged head and tail
+COMPARE_BLOCK = 4096
+
+
+def _common_prefix(a, b, limit):
+    """Length of the common prefix of a and b, at most limit, compared block-wise in C"""
+    start = 0
+    while start < limit and a[start:start + COMPARE_BLOCK] == b[start:start + COMPARE_BLOCK]:
+        start += COMPARE_BLOCK
+    low, high = start, min(start + COMPARE_BLOCK, limit)
+    if low >= limit:
+        return limit
+    # Binary search inside the first block that differs
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[start:middle] == b[start:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a, b, limit):
+    """Length of the common suffix of a and b, at most limit"""
+    end = 0
+    while end < limit:
+        # Clamped at 0: a negative start would wrap around to the other end
+        a_block = a[max(0, len(a) - end - COMPARE_BLOCK):len(a) - end]
+        if a_block != b[max(0, len(b) - end - COMPARE_BLOCK):len(b) - end]:
+            break
+        end += COMPARE_BLOCK
+    if end >= limit:
+        return limit
+    low, high = end, min(end + COMPARE_BLOCK, limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:len(a) - end] == b[len(b) - middle:len(b) - end]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class IncrementalSkillScan:
+    """Skills mentioned in a text, kept per line so an edit only rescans what changed.
+
+    update() first trims the part of the text that did not change at
+    either end, comparing whole blocks of characters rather than lines,
+    so an edit costs a memcmp over the document plus work proportional to
+    the edited lines. difflib then aligns the edited lines, and only
+    inserted or replaced lines go through the matcher. A skill stays found
+    while any line still mentions it. Lines are matched on their own, so
+    an alias broken across a line break ("machine\\nlearning") is not
+    found, unlike a scan of the whole text.
+    """
+
+    def __init__(self, matcher, text=""):
+        self.matcher = matcher
+        self.text = ""
+        self.found = [()]
+        self.counts = Counter()
+        self.rescanned = 0
+        self.update(text)
+
+    @property
+    def skills(self):
+        return sorted(self.counts)
+
+    def update(self, text):
+        """Rescan the changed lines of text; returns (skills added, skills removed)"""
+        old = self.text
+        shortest = min(len(old), len(text))
+        prefix = _common_prefix(old, text, shortest)
+        suffix = _common_suffix(old, text, shortest - prefix)
+
+        # Widen the changed span to whole lines; they are the same in both texts
+        start = old.rfind("\n", 0, prefix) + 1
+        old_stop = old.find("\n", len(old) - suffix)
+        old_stop = len(old) if old_stop == -1 else old_stop
+        new_stop = len(text) - (len(old) - old_stop)
+        first_line = old.count("\n", 0, start)
+        old_lines = old[start:old_stop].split("\n")
+        new_lines = text[start:new_stop].split("\n")
+        last_line = first_line + len(old_lines)
+
+        before = set(self.counts)
+        middle = []
+        self.rescanned = 0
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        for tag, old_from, old_to, new_from, new_to in matcher.get_opcodes():
+            if tag == "equal":
+                middle.extend(self.found[first_line + old_from:first_line + old_to])
+                continue
+            for skills in self.found[first_line + old_from:first_line + old_to]:
+                self.counts.subtract(skills)
+            for line in new_lines[new_from:new_to]:
+                skills = tuple(self.matcher.find(line)) if line.strip() else ()
+                self.counts.update(skills)
+                middle.append(skills)
+                self.rescanned += 1
+
+        self.counts = +self.counts
+        self.found[first_line:last_line] = middle
+        self.text = text
+        after = set(self.counts)
+        return sorted(after - before), sorted(before - after)
+
+
+class AnalysisSession:
+    """One user's resume being edited: its skill scan and last gap analysis"""
+
+    def __init__(self, catalog, text):
+        self.catalog_version = catalog.version
+        self.scan = IncrementalSkillScan(catalog.skill_matcher, text)
+        self.user_skills = []
+        self.gaps = ([], [])
+        self.lock = threading.Lock()
+
+    def rescan(self, catalog, text):
+        """Update the scan for text; a new catalog means starting over"""
+        if catalog.version != self.catalog_version:
+            self.catalog_version = catalog.version
+            before = set(self.scan.skills)
+            self.scan = IncrementalSkillScan(catalog.skill_matcher, text)
+            after = set(self.scan.skills)
+            return sorted(after - before), sorted(before - after)
+        return self.scan.update(text)
+
+
+class SessionStore:
+    """The last result sent for each analysis session, in SQLite (WAL).
+
+    The skill scan itself stays in the memory of the process that built
+    it; this store holds what the client was last told (skills and gaps),
+    so an update that lands on another server process can rebuild the
+    scan and still answer with the right deltas. No resume text is kept.
+    """
+
+    def __init__(self, path=ANALYSIS_DB_PATH, ttl=ANALYSIS_SESSION_TTL_SECONDS):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, updated REAL NOT NULL, result TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated);"
+        )
+        self._db.commit()
+
+    def save(self, session_id, user_skills, gaps, now=None):
+        """Remember the skills and (required, preferred) gaps sent for a session"""
+        now = now or time.time()
+        result = json.dumps([user_skills, list(gaps)], separators=(",", ":"))
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE updated <= ?", (now - self.ttl,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (id, updated, result) VALUES (?, ?, ?)",
+                (session_id, now, result)
+            )
+            self._db.commit()
+
+    def load(self, session_id, now=None):
+        """(user_skills, gaps) last saved for a session; None if unknown or expired"""
+        now = now or time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM sessions WHERE id = ? AND updated > ?", (session_id, now - self.ttl)
+            ).fetchone()
+        if row is None:
+            return None
+        user_skills, gaps = json.loads(row[0])
+        return user_skills, tuple(gaps)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
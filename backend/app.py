@@ -1,663 +1,1264 @@
-from fastapi import FastAPI, UploadFile, File
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import uvicorn
-from datetime import datetime
-import random
-import re
-import io
-
-# Create the app
-app = FastAPI()
-
-# Allow frontend to connect
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Define what data we expect
-class UserProfile(BaseModel):
-    resume_text: str = ""
-    dream_role: str = "ml_engineer"
-    hours_per_week: int = 15
-    current_skills: list = []
-
-# ========== JOB REQUIREMENTS DATABASE ==========
-job_requirements = {
-    "ml_engineer": {
-        "required": ["python", "tensorflow", "pytorch", "sql", "machine learning", "data structures", "algorithms"],
-        "preferred": ["docker", "aws", "kubernetes", "spark", "computer vision", "nlp"],
-        "projects": ["Build an image classifier", "Create a recommendation system", "Fine-tune a language model"]
-    },
-    "fullstack_developer": {
-        "required": ["javascript", "react", "node.js", "html", "css", "git", "sql", "rest api"],
-        "preferred": ["typescript", "docker", "aws", "graphql", "mongodb", "next.js"],
-        "projects": ["Build a full-stack CRUD app", "Create a real-time chat app", "E-commerce website"]
-    },
-    "data_scientist": {
-        "required": ["python", "sql", "pandas", "numpy", "machine learning", "statistics", "data visualization"],
-        "preferred": ["spark", "tensorflow", "aws", "tableau", "big data", "scikit-learn"],
-        "projects": ["Exploratory data analysis", "Predictive modeling", "Data visualization dashboard"]
-    },
-    "devops_engineer": {
-        "required": ["linux", "docker", "kubernetes", "aws", "jenkins", "git", "python", "ci/cd"],
-        "preferred": ["terraform", "ansible", "prometheus", "grafana", "bash"],
-        "projects": ["CI/CD pipeline setup", "Infrastructure as Code", "Monitoring system"]
-    },
-    "cybersecurity_analyst": {
-        "required": ["networking", "linux", "python", "security", "firewalls", "encryption"],
-        "preferred": ["ethical hacking", "cloud security", "penetration testing", "siem"],
-        "projects": ["Security audit tool", "Network scanner", "Incident response plan"]
-    },
-    "product_manager": {
-        "required": ["agile", "user research", "analytics", "communication", "roadmapping", "product strategy"],
-        "preferred": ["technical background", "figma", "sql", "a/b testing", "jira"],
-        "projects": ["Product requirements doc", "User research study", "Product roadmap"]
-    }
-}
-
-# ========== RESOURCES DATABASE ==========
-learning_resources = {
-    "python": "https://www.python.org/about/gettingstarted/",
-    "javascript": "https://javascript.info/",
-    "react": "https://react.dev/learn",
-    "node.js": "https://nodejs.org/en/learn",
-    "tensorflow": "https://www.tensorflow.org/learn",
-    "pytorch": "https://pytorch.org/tutorials/",
-    "docker": "https://docs.docker.com/get-started/",
-    "kubernetes": "https://kubernetes.io/docs/tutorials/",
-    "aws": "https://aws.amazon.com/training/",
-    "git": "https://git-scm.com/doc",
-    "sql": "https://www.w3schools.com/sql/",
-    "machine learning": "https://www.coursera.org/learn/machine-learning",
-    "linux": "https://linuxjourney.com/",
-    "html": "https://www.w3schools.com/html/",
-    "css": "https://www.w3schools.com/css/",
-    "mongodb": "https://university.mongodb.com/",
-    "pandas": "https://pandas.pydata.org/docs/",
-    "numpy": "https://numpy.org/doc/stable/",
-    "algorithms": "https://www.coursera.org/learn/algorithms",
-    "rest api": "https://restfulapi.net/",
-    "data visualization": "https://www.tableau.com/learn",
-}
-
-# ========== SKILL DATABASE ==========
-# Create a list of all possible skills from requirements
-all_skills = []
-for role, data in job_requirements.items():
-    all_skills.extend(data["required"])
-    all_skills.extend(data["preferred"])
-all_skills = list(set(all_skills))  # Remove duplicates
-
-# Add learning resources skills
-all_skills.extend(list(learning_resources.keys()))
-all_skills = list(set(all_skills))
-
-# Create skill synonyms for better matching
-skill_synonyms = {
-    "python": ["python", "py", "python3", "python 3"],
-    "javascript": ["javascript", "js", "ecmascript", "typescript", "ts"],
-    "react": ["react", "reactjs", "react.js", "jsx"],
-    "node.js": ["node", "nodejs", "node.js", "express"],
-    "machine learning": ["machine learning", "ml", "ai", "artificial intelligence", "deep learning", "neural networks"],
-    "sql": ["sql", "mysql", "postgresql", "sqlite", "database", "relational", "t-sql"],
-    "docker": ["docker", "container", "containerization", "dockerfile"],
-    "aws": ["aws", "amazon web services", "amazon aws", "ec2", "s3", "lambda", "cloud"],
-    "git": ["git", "github", "gitlab", "bitbucket", "version control", "vcs"],
-    "html": ["html", "html5"],
-    "css": ["css", "css3", "styling", "sass", "scss", "less"],
-    "data structures": ["data structures", "dsa", "arrays", "linked lists", "trees", "graphs", "hashmap"],
-    "algorithms": ["algorithms", "algorithm", "sorting", "searching", "dynamic programming"],
-    "rest api": ["rest", "api", "rest api", "restful", "http"],
-    "linux": ["linux", "unix", "ubuntu", "bash", "shell", "command line"],
-    "pandas": ["pandas", "data analysis", "dataframe"],
-    "numpy": ["numpy", "numerical python", "scientific computing"],
-    "ci/cd": ["ci/cd", "cicd", "continuous integration", "continuous deployment", "jenkins", "gitlab ci"],
-    "tensorflow": ["tensorflow", "tf", "neural networks"],
-    "pytorch": ["pytorch", "pth"],
-    "kubernetes": ["kubernetes", "k8s", "orchestration"],
-    "mongodb": ["mongodb", "nosql", "document database"],
-    "react": ["react", "reactjs", "jsx"],
-    "fullstack": ["fullstack", "full stack", "full-stack", "frontend", "backend"],
-    "agile": ["agile", "scrum", "sprint", "kanban", "project management"],
-    "statistics": ["statistics", "statistical", "probability", "inference"],
-    "security": ["security", "cybersecurity", "encryption", "authentication"],
-    "networking": ["networking", "network", "tcp/ip"],
-    "ansible": ["ansible", "infrastructure automation"],
-    "terraform": ["terraform", "infrastructure as code", "iac"],
-    "prometheus": ["prometheus", "monitoring"],
-    "grafana": ["grafana", "dashboards"],
-}
-
-
-# Test route
-@app.get("/")
-def home():
-    return {
-        "message": "Career Navigator API is LIVE! 🚀",
-        "version": "2.0",
-        "features": ["Skill Analysis", "Gap Detection", "Smart Roadmap", "Progress Tracking"]
-    }
-
-# ========== FILE UPLOAD & EXTRACTION =========
-@app.post("/api/extract-resume")
-async def extract_resume(file: UploadFile = File(...)):
-    """Extract text from uploaded resume (TXT, PDF, DOCX)"""
-    try:
-        filename = file.filename.lower()
-        content = await file.read()
-        
-        extracted_text = ""
-        
-        # Handle TXT files
-        if filename.endswith('.txt'):
-            extracted_text = content.decode('utf-8', errors='ignore')
-        
-        # Handle PDF files with fallback
-        elif filename.endswith('.pdf'):
-            pdf_success = False
-            
-            # Try pdfplumber first (more reliable)
-            try:
-                import pdfplumber
-                with pdfplumber.open(io.BytesIO(content)) as pdf:
-                    for page in pdf.pages:
-                        text = page.extract_text()
-                        if text:
-                            extracted_text += text + "\n"
-                pdf_success = True
-            except Exception as e1:
-                # Fallback to PyPDF2
-                try:
-                    import PyPDF2
-                    pdf_file = io.BytesIO(content)
-                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-                    for page in pdf_reader.pages:
-                        text = page.extract_text()
-                        if text:
-                            extracted_text += text + "\n"
-                    pdf_success = True
-                except Exception as e2:
-                    return {
-                        "success": False,
-                        "error": f"PDF extraction failed. Tried pdfplumber and PyPDF2. Errors: {str(e1)[:100]}",
-                        "extracted_text": ""
-                    }
-        
-        # Handle DOCX files
-        elif filename.endswith('.docx') or filename.endswith('.doc'):
-            try:
-                from docx import Document
-                doc = Document(io.BytesIO(content))
-                extracted_text = "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
-            except Exception as e:
-                return {
-                    "success": False,
-                    "error": f"DOCX parsing failed: {str(e)[:100]}. Try converting to PDF or plain text.",
-                    "extracted_text": ""
-                }
-        
-        else:
-            return {
-                "success": False,
-                "error": f"Unsupported file type: {filename}. Supported: .txt, .pdf, .docx",
-                "extracted_text": ""
-            }
-        
-        # Validate extracted text
-        if not extracted_text or not extracted_text.strip():
-            return {
-                "success": False,
-                "error": "No text could be extracted from the file. File may be corrupted or encrypted.",
-                "extracted_text": ""
-            }
-        
-        return {
-            "success": True,
-            "extracted_text": extracted_text.strip(),
-            "filename": filename
-        }
-    
-    except Exception as e:
-        return {
-            "success": False,
-            "error": f"Unexpected error: {str(e)[:100]}",
-            "extracted_text": ""
-        }
-
-# Alternative: Handle base64 encoded files to avoid multipart requirement
-class FileUploadBase64(BaseModel):
-    filename: str
-    content_base64: str
-
-@app.post("/api/extract-resume-base64")
-async def extract_resume_base64(data: FileUploadBase64):
-    """Extract text from base64 encoded file (avoids multipart dependency)"""
-    try:
-        import base64
-        filename = data.filename.lower()
-        content = base64.b64decode(data.content_base64)
-        
-        extracted_text = ""
-        
-        # Handle TXT files
-        if filename.endswith('.txt'):
-            extracted_text = content.decode('utf-8', errors='ignore')
-        
-        # Handle PDF files
-        elif filename.endswith('.pdf'):
-            try:
-                import pdfplumber
-                with pdfplumber.open(io.BytesIO(content)) as pdf:
-                    for page in pdf.pages:
-                        text = page.extract_text()
-                        if text:
-                            extracted_text += text + "\n"
-            except Exception as e1:
-                try:
-                    import PyPDF2
-                    pdf_file = io.BytesIO(content)
-                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-                    for page in pdf_reader.pages:
-                        text = page.extract_text()
-                        if text:
-                            extracted_text += text + "\n"
-                except Exception as e2:
-                    return {
-                        "success": False,
-                        "error": f"PDF extraction failed: {str(e1)[:80]}",
-                        "extracted_text": ""
-                    }
-        
-        # Handle DOCX files
-        elif filename.endswith('.docx') or filename.endswith('.doc'):
-            try:
-                from docx import Document
-                doc = Document(io.BytesIO(content))
-                extracted_text = "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
-            except Exception as e:
-                return {
-                    "success": False,
-                    "error": f"DOCX parsing failed: {str(e)[:80]}",
-                    "extracted_text": ""
-                }
-        
-        else:
-            return {
-                "success": False,
-                "error": f"Unsupported file type: {filename}",
-                "extracted_text": ""
-            }
-        
-        if not extracted_text or not extracted_text.strip():
-            return {
-                "success": False,
-                "error": "No text could be extracted from the file.",
-                "extracted_text": ""
-            }
-        
-        return {
-            "success": True,
-            "extracted_text": extracted_text.strip(),
-            "filename": filename
-        }
-    
-    except Exception as e:
-        return {
-            "success": False,
-            "error": f"Error: {str(e)[:100]}",
-            "extracted_text": ""
-        }
-# ========== IMPROVED SKILL EXTRACTION ==========
-def extract_skills_from_text(text):
-    """Extract skills from text using keyword matching, synonyms, and context analysis"""
-    text = text.lower()
-    found_skills = set()
-    
-    # Look for experience indicators with skills
-    experience_patterns = [
-        r'(\d+)\s+(?:years?|yrs?)?\s+(?:of\s+)?(?:experience\s+)?(?:with\s+)?([a-zA-Z\s\+\#\.\-]+)',
-        r'expertise\s+in\s+([a-zA-Z\s\+\#\.\-]+)',
-        r'proficient\s+(?:in|with)\s+([a-zA-Z\s\+\#\.\-]+)',
-        r'skilled\s+(?:in|with)\s+([a-zA-Z\s\+\#\.\-]+)',
-        r'(?:built|developed|created|designed|implemented)\s+(?:[a-zA-Z\s]+?\s+)?(?:with|using|in)\s+([a-zA-Z\s\+\#\.\-]+)',
-    ]
-    
-    # Direct skill matching
-    for skill in all_skills:
-        skill_lower = skill.lower()
-        
-        # Direct exact or substring match
-        if skill_lower in text:
-            found_skills.add(skill)
-            continue
-        
-        # Check synonyms
-        if skill in skill_synonyms:
-            for synonym in skill_synonyms[skill]:
-                if synonym.lower() in text:
-                    found_skills.add(skill)
-                    break
-    
-    # Context-aware matching: look for technical terms mentioned with action words
-    action_words = ['built', 'developed', 'created', 'designed', 'implemented', 'worked', 'used', 'experienced']
-    tech_terms = text.split()
-    
-    for i, word in enumerate(tech_terms):
-        # Look for action verb + tech skill pattern
-        if word in action_words and i + 1 < len(tech_terms):
-            next_words = ' '.join(tech_terms[i+1:min(i+5, len(tech_terms))])
-            for skill in all_skills:
-                if skill.lower() in next_words.lower():
-                    found_skills.add(skill)
-    
-    return list(found_skills)
-
-
-# ========== MAIN ROADMAP FUNCTION ==========
-@app.post("/api/roadmap")
-def create_roadmap(profile: UserProfile):
-    print("\n" + "="*60)
-    print("📥 NEW ROADMAP REQUEST")
-    print("="*60)
-    print(f"📋 Dream Role: {profile.dream_role}")
-    print(f"⏰ Hours/Week: {profile.hours_per_week}")
-    print(f"📄 Resume Length: {len(profile.resume_text)} characters")
-    
-    # Step 1: Extract skills from resume using improved method
-    user_skills = extract_skills_from_text(profile.resume_text)
-    
-    print(f"\n🔍 Skills extracted from resume: {user_skills}")
-    
-    # Add skills from input field
-    input_skills = []
-    for skill in profile.current_skills:
-        skill = skill.lower().strip()
-        if skill:
-            input_skills.append(skill)
-            # Check if this skill matches any in our database
-            matched = False
-            for db_skill in all_skills:
-                if skill in db_skill.lower() or db_skill.lower() in skill:
-                    if db_skill not in user_skills:
-                        user_skills.append(db_skill)
-                    matched = True
-                    break
-            if not matched and skill not in user_skills:
-                user_skills.append(skill)  # Add as-is if no match
-    
-    user_skills = list(set(user_skills))  # Remove duplicates
-    print(f"📝 Skills from input field: {input_skills}")
-    print(f"✅ Total unique skills found: {len(user_skills)} - {user_skills}")
-
-    
-    # Step 2: Get requirements for dream role
-    role = profile.dream_role
-    if role not in job_requirements:
-        role = "ml_engineer"
-    
-    requirements = job_requirements[role]
-    
-    # Step 3: Find skill gaps with better matching
-    missing_required = []
-    missing_preferred = []
-    
-    # Helper function for intelligent skill matching
-    def skill_matches(required_skill, user_skills_list):
-        """Check if required skill is covered by user skills with fuzzy matching"""
-        required_lower = required_skill.lower()
-        
-        for user_skill in user_skills_list:
-            user_lower = user_skill.lower()
-            
-            # Exact match
-            if required_lower == user_lower:
-                return True
-            
-            # Substring match (e.g., 'python' in 'python3')
-            if required_lower in user_lower or user_lower in required_lower:
-                return True
-            
-            # Synonym checking
-            if required_skill in skill_synonyms:
-                for syn in skill_synonyms[required_skill]:
-                    if syn.lower() in user_lower:
-                        return True
-            
-            # Check if user skill has a synonym that matches required
-            for skill_key, syns in skill_synonyms.items():
-                if user_lower in [s.lower() for s in syns] and skill_key.lower() == required_lower:
-                    return True
-        
-        return False
-    
-    for skill in requirements["required"]:
-        if not skill_matches(skill, user_skills):
-            missing_required.append(skill)
-    
-    for skill in requirements["preferred"]:
-        if not skill_matches(skill, user_skills) and skill not in missing_required:
-            missing_preferred.append(skill)
-
-    
-    print(f"❌ Missing required: {missing_required}")
-    print(f"⚠️ Missing preferred: {missing_preferred}")
-    
-    # Step 4: Generate SMART roadmap based on gaps
-    roadmap = {
-        "weeks": [],
-        "hours_per_week": profile.hours_per_week,
-        "start_date": datetime.now().strftime("%Y-%m-%d"),
-        "skill_gaps": {
-            "required": missing_required,
-            "preferred": missing_preferred[:3]
-        },
-        "analysis": {
-            "skills_found": user_skills,
-            "total_skills": len(user_skills),
-            "gaps_count": len(missing_required) + len(missing_preferred)
-        }
-    }
-    
-    # If no gaps found, add some default learning
-    if len(missing_required) == 0 and len(missing_preferred) == 0:
-        missing_required = ["advanced concepts", "best practices"]
-    
-    # Week 1: Foundation (Learn missing required skills)
-    week1_tasks = []
-    skills_to_learn = missing_required[:3] if missing_required else ["advanced concepts"]
-    
-    for i, skill in enumerate(skills_to_learn):
-        resource = learning_resources.get(skill, f"https://www.google.com/search?q=learn+{skill.replace(' ', '+')}")
-        week1_tasks.append({
-            "day": i * 2 + 1,
-            "title": f"Master {skill.title()}",
-            "description": f"Learn fundamentals and best practices of {skill}",
-            "resources": [resource],
-            "time": f"{int(profile.hours_per_week/3)} hours",
-            "type": "learning"
-        })
-        week1_tasks.append({
-            "day": i * 2 + 2,
-            "title": f"Practice {skill.title()}",
-            "description": f"Build hands-on projects using {skill}",
-            "resources": ["https://github.com/topics/project-ideas"],
-            "time": f"{int(profile.hours_per_week/3)} hours",
-            "type": "practice"
-        })
-    
-    roadmap["weeks"].append({
-        "week": 1,
-        "focus": f"Core {role.replace('_', ' ').title()} Skills",
-        "tasks": sorted(week1_tasks, key=lambda x: x["day"])
-    })
-    
-    # Week 2: Project Building
-    project_idea = random.choice(requirements["projects"])
-    roadmap["weeks"].append({
-        "week": 2,
-        "focus": "Build Portfolio Project",
-        "tasks": [
-            {
-                "day": 8,
-                "title": "Project Planning",
-                "description": f"Plan your project: {project_idea}",
-                "resources": ["https://www.atlassian.com/agile/project-management"],
-                "time": "2 hours"
-            },
-            {
-                "day": 9,
-                "title": "Setup Development Environment",
-                "description": "Install tools, create repo, setup project structure",
-                "resources": ["https://git-scm.com/book/en/v2/Git-Basics-Getting-a-Git-Repository"],
-                "time": "1.5 hours"
-            },
-            {
-                "day": 11,
-                "title": "Core Features Implementation",
-                "description": "Build main functionality of your project",
-                "resources": ["https://stackoverflow.com/"],
-                "time": "3 hours"
-            },
-            {
-                "day": 14,
-                "title": "MVP Complete",
-                "description": "Working version with core features done",
-                "resources": [],
-                "time": "2.5 hours"
-            }
-        ]
-    })
-    
-    # Week 3: Advanced Concepts
-    week3_tasks = []
-    if missing_preferred:
-        for i, skill in enumerate(missing_preferred[:2]):
-            resource = learning_resources.get(skill, f"https://www.google.com/search?q=learn+{skill.replace(' ', '+')}")
-            week3_tasks.append({
-                "day": 15 + i,
-                "title": f"Advanced {skill.title()}",
-                "description": f"Deep dive into {skill} with real-world applications",
-                "resources": [resource],
-                "time": "2.5 hours"
-            })
-    
-    week3_tasks.extend([
-        {
-            "day": 18,
-            "title": "Code Review & Optimization",
-            "description": "Refactor code, improve performance, fix bugs",
-            "resources": ["https://refactoring.guru/"],
-            "time": "2 hours"
-        },
-        {
-            "day": 20,
-            "title": "Add Advanced Features",
-            "description": "Enhance project with additional capabilities",
-            "resources": [],
-            "time": "3 hours"
-        }
-    ])
-    
-    roadmap["weeks"].append({
-        "week": 3,
-        "focus": "Advanced Topics & Optimization",
-        "tasks": sorted(week3_tasks, key=lambda x: x["day"])
-    })
-    
-    # Week 4: Polish & Launch
-    roadmap["weeks"].append({
-        "week": 4,
-        "focus": "Portfolio Polish & Career Launch",
-        "tasks": [
-            {
-                "day": 22,
-                "title": "Documentation & README",
-                "description": "Write comprehensive docs, setup instructions, and comments",
-                "resources": ["https://www.makeareadme.com/"],
-                "time": "2 hours"
-            },
-            {
-                "day": 24,
-                "title": "Create Project Demo",
-                "description": "Record video demo or write case study",
-                "resources": ["https://www.youtube.com/"],
-                "time": "2 hours"
-            },
-            {
-                "day": 26,
-                "title": "Update LinkedIn & GitHub",
-                "description": "Showcase project, update skills section, pin repositories",
-                "resources": ["https://www.linkedin.com"],
-                "time": "1.5 hours"
-            },
-            {
-                "day": 28,
-                "title": "Job Applications",
-                "description": f"Start applying to {role.replace('_', ' ').title()} positions",
-                "resources": ["https://www.linkedin.com/jobs", "https://github.com/jobs"],
-                "time": "2 hours"
-            },
-            {
-                "day": 30,
-                "title": "Review & Next Steps",
-                "description": "Review progress, identify next learning goals",
-                "resources": [],
-                "time": "1 hour"
-            }
-        ]
-    })
-    
-    print("✅ Roadmap generated successfully!")
-    print("="*50 + "\n")
-    return {"success": True, "roadmap": roadmap}
-
-# ========== PROGRESS ADAPTATION ==========
-class AdaptRequest(BaseModel):
-    completed_days: list = []
-    current_roadmap: dict = {}
-
-@app.post("/api/adapt")
-def adapt_plan(request: AdaptRequest):
-    """Adapt roadmap based on user progress"""
-    completed_days = request.completed_days
-    completion_rate = len(completed_days) / 30
-    
-    if completion_rate > 0.3:
-        return {
-            "action": "accelerate",
-            "message": "You're making fast progress! Here's an accelerated path:",
-            "new_tasks": [
-                "Skip basic tutorials - move to advanced projects",
-                "Add extra features to your project",
-                "Start networking with industry professionals"
-            ]
-        }
-    elif completion_rate < 0.1 and len(completed_days) > 0:
-        return {
-            "action": "simplify",
-            "message": "Let's make this easier to match your pace:",
-            "new_tasks": [
-                "Focus on one skill at a time",
-                "More foundational resources added",
-                "Break down tasks into smaller steps"
-            ]
-        }
-    else:
-        return {
-            "action": "maintain",
-            "message": "You're on track! Keep up the good work!",
-            "new_tasks": []
-        }
-
-# Run the server
-if __name__ == "__main__":
-    print("\n" + "="*60)
-    print("✅ CAREER NAVIGATOR API V2.0 IS STARTING...")
-    print("📝 Open: http://localhost:8001")
-    print("🔌 Press CTRL+C to stop")
-    print("="*60 + "\n")
-    uvicorn.run(app, host="127.0.0.1", port=8001)
\ No newline at end of file
+from fastapi import FastAPI, UploadFile, File, Form, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel
+from typing import List
+from contextlib import asynccontextmanager
+from collections import Counter
+from datetime import datetime
+from math import ceil
+import asyncio
+import hashlib
+import hmac
+import logging
+import random
+import os
+import time
+import uuid
+
+from logging_setup import log_request, logger, sample_request, setup_logging, shutdown_logging
+from metrics import (
+    EXTRACT_FAILURES, METRICS_ENABLED, ROADMAP_REQUESTS, STAGE_SECONDS, Gauge, MetricsMiddleware, render_metrics
+)
+from extraction import (
+    INLINE_FORMATS, UPLOAD_MAX_BYTES, ParserWarmup, UploadTooLarge, extract_document, extractor_stats,
+    sniff_format, spool_bytes, spool_stream, spool_upload
+)
+from jobs import CallbackRejected, JobQueue, JobStore, QueueFull, check_callback_url
+from parse_pool import ParsePool, PoolSaturated
+from proficiency import skill_evidence
+from profiling import ProfileStore, ProfilingMiddleware, set_fingerprint, staged
+from progress_store import ProgressStore
+from responses import CompressionMiddleware, FastJSONResponse, dumps, etag_matches, negotiate_encoding, precompress
+from roadmap_cache import SingleFlight, TTLCache
+from scheduler import pack_sessions
+from analysis_session import ANALYSIS_SESSION_MAX, ANALYSIS_SESSION_TTL_SECONDS, AnalysisSession, SessionStore
+from catalog import CatalogError, CatalogStore
+from skill_matcher import normalize_skill
+from text_cache import ExtractionCache, digest_key
+
+
+@asynccontextmanager
+async def lifespan(app):
+    catalog_store.start_watching()
+    await parser_warmup.start()
+    yield
+    catalog_store.stop_watching()
+    await parser_warmup.stop()
+    await job_queue.shutdown()
+    # Stop resume parser workers with the server
+    parse_pool.shutdown()
+    extraction_cache.close()
+    progress_store.close()
+    job_queue.store.close()
+    session_store.close()
+    shutdown_logging()
+
+# Request records go through a background queue, not the request thread
+setup_logging()
+
+# Create the app
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+# Allow frontend to connect
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["*"],
+    allow_headers=["*"],
+    # ETag is read by the frontend to revalidate its saved roadmap
+    expose_headers=["ETag", "X-Profile-Id"],
+)
+
+# brotli/gzip for larger JSON bodies, as the client accepts
+app.add_middleware(CompressionMiddleware)
+
+# Request latency by route for /metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Opt-in profiles of single requests (PROFILE_TOKEN header or PROFILE_SAMPLE_RATE), see profiling.py
+profile_store = ProfileStore()
+app.add_middleware(ProfilingMiddleware, store=profile_store)
+
+
+# Admin endpoints (catalog reload, stored profiles) need this value in the
+# X-Admin-Token header; unset, they always answer 403
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
+
+def _admin_forbidden(request):
+    """403 response unless the request sends ADMIN_TOKEN, else None"""
+    value = request.headers.get("x-admin-token", "")
+    if ADMIN_TOKEN and value and hmac.compare_digest(value.encode(), ADMIN_TOKEN.encode()):
+        return None
+    return JSONResponse(
+        status_code=403,
+        content={"success": False, "error": "Send the ADMIN_TOKEN value in the X-Admin-Token header"}
+    )
+
+
+# Define what data we expect
+class UserProfile(BaseModel):
+    resume_text: str = ""
+    dream_role: str = "ml_engineer"
+    hours_per_week: int = 15
+    current_skills: list = []
+
+# ========== ROLE & SKILL CATALOG ==========
+# Roles, learning resources and skill synonyms live in data/catalog.json,
+# compiled to a memory-mapped SQLite file (see catalog.py). Handlers take
+# catalog_store.current once per request; replacing the file reloads it.
+catalog_store = CatalogStore()
+
+
+@app.get("/api/catalog")
+def catalog_info():
+    """Version and size of the live role/skill catalog"""
+    return {
+        **catalog_store.current.stats(),
+        "reloads": catalog_store.reloads,
+        "last_error": catalog_store.last_error
+    }
+
+
+@app.post("/api/catalog/reload")
+def reload_catalog(request: Request):
+    """Reload the catalog file now instead of waiting for the watcher"""
+    forbidden = _admin_forbidden(request)
+    if forbidden is not None:
+        return forbidden
+    try:
+        catalog = catalog_store.reload()
+    except CatalogError as e:
+        return JSONResponse(status_code=500, content={"success": False, "error": str(e)})
+    return {"success": True, "version": catalog.version}
+
+
+# What the frontend needs to preview skill gaps while the user types (see
+# frontend/gap_preview.js). Served under its catalog version, so browsers
+# keep it until the catalog changes; encoded and compressed once per version.
+CATALOG_BUNDLE_MAX_AGE = 365 * 24 * 3600
+_bundle_variants = {}
+
+
+def catalog_bundle(catalog):
+    """{encoding: bytes} of the client bundle of a catalog (see precompress)"""
+    variants = _bundle_variants.get(catalog.version)
+    if variants is None:
+        variants = precompress(dumps(catalog.client_bundle))
+        # Only the live version is served
+        _bundle_variants.clear()
+        _bundle_variants[catalog.version] = variants
+    return variants
+
+
+@app.get("/api/catalog/bundle/{version}")
+def catalog_bundle_endpoint(version: str, request: Request):
+    """Skill index, matcher regex and role requirements of a catalog version; the live version is in /api/catalog"""
+    catalog = catalog_store.current
+    if version != catalog.version:
+        return JSONResponse(
+            status_code=404,
+            content={"success": False, "error": f"Catalog version {version} is not served", "version": catalog.version}
+        )
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    headers = {
+        "Cache-Control": f"public, max-age={CATALOG_BUNDLE_MAX_AGE}, immutable",
+        "ETag": f'"{catalog.version}"',
+        "Vary": "Accept-Encoding"
+    }
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(catalog_bundle(catalog)[encoding], media_type="application/json", headers=headers)
+
+
+# Test route
+@app.get("/")
+def home():
+    return {
+        "message": "Career Navigator API is LIVE! 🚀",
+        "version": "2.0",
+        "features": ["Skill Analysis", "Gap Detection", "Smart Roadmap", "Progress Tracking"]
+    }
+
+# ========== FILE UPLOAD & EXTRACTION =========
+# PDF/DOCX parsing is blocking, so it runs in a bounded worker pool; plain
+# text is cheap enough to decode on a thread (see extraction.py)
+parse_pool = ParsePool()
+
+# Parser libraries and pool workers loaded before the first upload (EXTRACT_PRELOAD)
+parser_warmup = ParserWarmup(parse_pool)
+
+# Re-uploads of the same file reuse the text extracted the first time
+extraction_cache = ExtractionCache()
+
+
+def _parse_pool_busy():
+    EXTRACT_FAILURES.inc("parser_busy")
+    log_request("extract_resume", level=logging.WARNING, error="parser_busy", in_flight=parse_pool.in_flight)
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": "5"},
+        content={
+            "success": False,
+            "error": "Resume parser is busy. Please try again in a few seconds.",
+            "extracted_text": ""
+        }
+    )
+
+
+def _parse_timed_out():
+    EXTRACT_FAILURES.inc("timeout")
+    log_request("extract_resume", level=logging.WARNING, error="timeout", timeout_s=parse_pool.timeout)
+    return {
+        "success": False,
+        "error": f"Parsing took longer than {parse_pool.timeout:g} seconds. Try a smaller file or plain text.",
+        "extracted_text": ""
+    }
+
+
+async def _extract_with_cache(filename, path, digest):
+    """Extract a spooled upload unless the same bytes were extracted before.
+
+    The format comes from the file's magic bytes, not its extension, so a
+    mislabeled file goes straight to the right extractor.
+    """
+    started = time.perf_counter()
+    set_fingerprint(digest)
+    result = await _extract_spooled(filename, path, digest)
+    
+    metadata = result.get("metadata", {})
+    log_request(
+        "extract_resume",
+        sampled=sample_request(),
+        level=logging.INFO if result["success"] else logging.WARNING,
+        success=result["success"],
+        cached=result.get("cached", False),
+        format=metadata.get("format"),
+        backend=metadata.get("backend"),
+        pages=metadata.get("pages_parsed"),
+        chars=len(result["extracted_text"]),
+        duration_ms=round((time.perf_counter() - started) * 1000, 2)
+    )
+    return result
+
+
+async def _extract_spooled(filename, path, digest):
+    fmt = sniff_format(path)
+    if fmt == "doc":
+        EXTRACT_FAILURES.inc("legacy_doc")
+        return {
+            "success": False,
+            "error": "Legacy .doc files are not supported. Save the file as .docx or PDF and upload again.",
+            "extracted_text": ""
+        }
+    if fmt is None:
+        EXTRACT_FAILURES.inc("unsupported_type")
+        return {
+            "success": False,
+            "error": f"Unsupported file type: {filename}. Supported: .txt, .pdf, .docx",
+            "extracted_text": ""
+        }
+    
+    key = digest_key(digest, fmt)
+    if fmt not in INLINE_FORMATS:
+        # The disk tier is SQLite: off the event loop
+        cached_text = await asyncio.to_thread(extraction_cache.get, key)
+        if cached_text is not None:
+            return {
+                "success": True,
+                "extracted_text": cached_text,
+                "filename": filename,
+                "cached": True
+            }
+        # A pool forked while the warm-up thread holds the import lock would deadlock
+        await parser_warmup.wait()
+    
+    result = await asyncio.wait_for(extract_document(parse_pool, path, fmt), parse_pool.timeout)
+    result["filename"] = filename
+    if result.get("success") and fmt not in INLINE_FORMATS:
+        await asyncio.to_thread(extraction_cache.put, key, result["extracted_text"])
+    return result
+
+
+@app.post("/api/extract-resume")
+async def extract_resume(file: UploadFile = File(...)):
+    """Extract text from uploaded resume (TXT, PDF, DOCX)"""
+    try:
+        filename = file.filename.lower()
+        path, digest = await spool_upload(file, os.path.splitext(filename)[1])
+        
+        try:
+            return await _extract_with_cache(filename, path, digest)
+        finally:
+            os.unlink(path)
+    
+    except PoolSaturated:
+        return _parse_pool_busy()
+    except asyncio.TimeoutError:
+        return _parse_timed_out()
+    except Exception as e:
+        EXTRACT_FAILURES.inc("error")
+        return {
+            "success": False,
+            "error": f"Unexpected error: {str(e)[:100]}",
+            "extracted_text": ""
+        }
+
+def _upload_too_large():
+    EXTRACT_FAILURES.inc("too_large")
+    log_request("extract_resume", level=logging.WARNING, error="too_large", max_bytes=UPLOAD_MAX_BYTES)
+    return JSONResponse(
+        status_code=413,
+        content={
+            "success": False,
+            "error": f"File is larger than {UPLOAD_MAX_BYTES // (1024 * 1024)} MB.",
+            "extracted_text": ""
+        }
+    )
+
+
+@app.post("/api/extract-resume-raw")
+async def extract_resume_raw(request: Request, filename: str = "resume"):
+    """Extract text from a resume sent as the raw request body (application/pdf, application/octet-stream, ...)
+
+    The body is streamed to a temp file as it arrives, with no multipart
+    or base64 decoding, and the upload is cut off past UPLOAD_MAX_BYTES.
+    """
+    try:
+        declared = request.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > UPLOAD_MAX_BYTES:
+            return _upload_too_large()
+        
+        filename = filename.lower()
+        path, digest = await spool_stream(request.stream(), os.path.splitext(filename)[1], UPLOAD_MAX_BYTES)
+        
+        try:
+            return await _extract_with_cache(filename, path, digest)
+        finally:
+            os.unlink(path)
+    
+    except UploadTooLarge:
+        return _upload_too_large()
+    except PoolSaturated:
+        return _parse_pool_busy()
+    except asyncio.TimeoutError:
+        return _parse_timed_out()
+    except Exception as e:
+        EXTRACT_FAILURES.inc("error")
+        return {
+            "success": False,
+            "error": f"Unexpected error: {str(e)[:100]}",
+            "extracted_text": ""
+        }
+
+# Alternative: Handle base64 encoded files to avoid multipart requirement
+class FileUploadBase64(BaseModel):
+    filename: str
+    content_base64: str
+
+@app.post("/api/extract-resume-base64")
+async def extract_resume_base64(data: FileUploadBase64):
+    """Extract text from base64 encoded file (avoids multipart dependency)"""
+    try:
+        import base64
+        filename = data.filename.lower()
+        path, digest = spool_bytes(base64.b64decode(data.content_base64), os.path.splitext(filename)[1])
+        
+        try:
+            return await _extract_with_cache(filename, path, digest)
+        finally:
+            os.unlink(path)
+    
+    except PoolSaturated:
+        return _parse_pool_busy()
+    except asyncio.TimeoutError:
+        return _parse_timed_out()
+    except Exception as e:
+        EXTRACT_FAILURES.inc("error")
+        return {
+            "success": False,
+            "error": f"Error: {str(e)[:100]}",
+            "extracted_text": ""
+        }
+
+@app.get("/api/cache-stats")
+def cache_stats():
+    """Hit/miss/eviction counters for the extracted-text cache"""
+    return {
+        "extraction": extraction_cache.stats(),
+        "roadmap": roadmap_cache.stats(),
+        "profile": profile_keys.stats(),
+        "roadmap_flights": roadmap_flights.stats()
+    }
+
+
+@app.get("/api/extractor-stats")
+def get_extractor_stats():
+    """Latency and failure rate of each resume extraction backend"""
+    return {"backends": extractor_stats()}
+
+
+@app.get("/api/ready")
+def readiness():
+    """503 until the parser warm-up is done, for load balancer readiness checks"""
+    if not parser_warmup.ready:
+        return JSONResponse(
+            status_code=503,
+            headers={"Retry-After": "1"},
+            content={"success": False, "error": "Warming up", "parsers": parser_warmup.stats()}
+        )
+    return {"success": True, "parsers": parser_warmup.stats()}
+
+
+# Parser backlog, read when /metrics is scraped
+Gauge("career_navigator_parse_pool_in_flight", "Documents parsing or waiting for a parser", lambda: parse_pool.in_flight)
+Gauge("career_navigator_parsers_ready", "1 once the parser warm-up is done", lambda: int(parser_warmup.ready))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Request and stage latency histograms and failure counters in Prometheus text format"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# ========== IMPROVED SKILL EXTRACTION ==========
+@STAGE_SECONDS.timed("skill_match")
+@staged("skill_match")
+def extract_skills_from_text(text, catalog=None):
+    """Extract skills from text using the compiled skill and synonym matcher"""
+    catalog = catalog or catalog_store.current
+    # Every skill and synonym is matched on word boundaries in one pass
+    return catalog.skill_matcher.find(text)
+
+
+@STAGE_SECONDS.timed("skill_match")
+@staged("skill_match")
+def extract_skill_evidence(text, catalog=None):
+    """Skills in text with mentions, years of experience, level and confidence (see proficiency.py)"""
+    catalog = catalog or catalog_store.current
+    return skill_evidence(catalog.skill_matcher, text)
+
+
+# ========== SKILL GAP ANALYSIS ==========
+def canonical_skill_ids(skills, catalog=None):
+    """Map skill names to the set of canonical skill IDs they cover"""
+    skill_index = (catalog or catalog_store.current).skill_index
+    covered = set()
+    for skill in skills:
+        name = normalize_skill(skill)
+        covered.update(skill_index.get(name, (name,)))
+    return covered
+
+
+@STAGE_SECONDS.timed("gap_analysis")
+@staged("gap_analysis")
+def find_skill_gaps(requirements, user_skills, catalog=None):
+    """Return (missing_required, missing_preferred) for a role's requirements"""
+    covered = canonical_skill_ids(user_skills, catalog)
+    missing_required = [skill for skill in requirements["required"] if skill not in covered]
+    required = set(requirements["required"])
+    missing_preferred = [
+        skill for skill in requirements["preferred"]
+        if skill not in covered and skill not in required
+    ]
+    return missing_required, missing_preferred
+
+
+# ========== ROLE RANKING ==========
+# "Roles you're closest to": every catalog role scored in one pass (see role_ranker.py)
+ROLE_RANK_MAX_K = 50
+
+
+class RoleRankRequest(BaseModel):
+    resume_text: str = ""
+    current_skills: list = []
+    top_k: int = 10
+
+
+@STAGE_SECONDS.timed("role_rank")
+def rank_roles(user_skills, top_k=10, catalog=None):
+    """The top_k catalog roles by weighted required/preferred skill overlap, with their gaps"""
+    catalog = catalog or catalog_store.current
+    return catalog.role_ranker.rank(canonical_skill_ids(user_skills, catalog), top_k)
+
+
+@app.post("/api/roles/rank")
+def rank_roles_endpoint(request: RoleRankRequest):
+    """Rank every role by how well the resume and listed skills fit it"""
+    catalog = catalog_store.current
+    user_skills = collect_user_skills(request, catalog=catalog)
+    top_k = min(max(request.top_k, 1), ROLE_RANK_MAX_K)
+    return {
+        "success": True,
+        "skills": user_skills,
+        "roles_ranked": len(catalog.job_requirements),
+        "roles": rank_roles(user_skills, top_k, catalog)
+    }
+
+
+# ========== MAIN ROADMAP FUNCTION ==========
+def collect_user_skills(profile, resume_skills=None, catalog=None):
+    """Canonical skills from the resume text plus the current_skills field"""
+    catalog = catalog or catalog_store.current
+    # Step 1: Extract skills from resume using improved method
+    if resume_skills is None:
+        resume_skills = extract_skills_from_text(profile.resume_text, catalog)
+    user_skills = list(resume_skills)
+    
+    # Add skills from input field
+    for skill in profile.current_skills:
+        skill = skill.lower().strip()
+        if skill:
+            # Known skill or synonym, else any skill mentioned in the phrase, else as-is
+            matched = (catalog.skill_index.get(normalize_skill(skill))
+                       or catalog.skill_matcher.find(skill) or [skill])
+            user_skills.extend(matched)
+    
+    return sorted(set(user_skills))  # Remove duplicates
+
+
+# Roadmap bodies keyed by (catalog version, sorted canonical skills, role,
+# hours); many users share a profile, e.g. new grads who list "python, sql"
+roadmap_cache = TTLCache()
+# Raw profile -> (canonical key, resume skill evidence), so a repeated profile
+# skips skill extraction too
+profile_keys = TTLCache()
+# Identical profiles arriving together (a cohort opening the same link) are
+# built once, before the first of them has reached the caches
+roadmap_flights = SingleFlight()
+
+
+def _forget_roadmaps(catalog):
+    roadmap_cache.clear()
+    profile_keys.clear()
+
+
+# Keys carry the catalog version, so this only frees memory early
+catalog_store.on_reload(_forget_roadmaps)
+
+
+def raw_profile_key(profile, catalog):
+    """Hex digest of a profile and the catalog version, also used as the roadmap's ETag.
+
+    Skill matching is case-insensitive and current_skills are collected into
+    a sorted set, so case, surrounding whitespace and skill order are
+    normalized away first: profiles that differ only there share a key.
+    """
+    skills = sorted({skill.lower().strip() for skill in profile.current_skills})
+    digest = hashlib.sha256(dumps([catalog.version, profile.dream_role, profile.hours_per_week, skills]))
+    digest.update(profile.resume_text.strip().lower().encode("utf-8"))
+    return digest.hexdigest()
+
+
+@STAGE_SECONDS.timed("roadmap_build")
+@staged("roadmap_build")
+def build_roadmap(profile, resume_evidence=None, raw_key=None):
+    """Analyze a profile and build its roadmap.
+
+    resume_evidence lets batch callers pass extract_skill_evidence output
+    for an identical resume instead of scanning it again, and raw_key the
+    profile's raw_profile_key when it is already known. Only the start
+    date and the per-skill evidence differ between profiles with the same
+    canonical key, so the rest of the roadmap comes from roadmap_cache
+    when possible.
+    """
+    catalog = catalog_store.current
+    raw_key = raw_key or raw_profile_key(profile, catalog)
+    key, evidence = profile_keys.get(raw_key) or (None, None)
+    body = roadmap_cache.get(key) if key is not None else None
+    
+    if body is None:
+        evidence = resume_evidence
+        if evidence is None:
+            evidence = extract_skill_evidence(profile.resume_text, catalog)
+        user_skills = collect_user_skills(profile, list(evidence), catalog)
+        
+        # Step 2: Get requirements for dream role
+        role = profile.dream_role
+        if role not in catalog.job_requirements:
+            role = "ml_engineer"
+        
+        key = (catalog.version, tuple(user_skills), role, profile.hours_per_week)
+        body = roadmap_cache.get(key)
+        if body is None:
+            body = assemble_roadmap(user_skills, role, profile.hours_per_week, catalog)
+            roadmap_cache.put(key, body)
+        profile_keys.put(raw_key, (key, evidence))
+    
+    roadmap = dict(body)
+    roadmap["start_date"] = datetime.now().strftime("%Y-%m-%d")
+    # Tells "used Docker once" from "5 years of Docker" for the resume's skills
+    roadmap["analysis"] = {**body["analysis"], "proficiency": evidence}
+    return {"success": True, "roadmap": roadmap}
+
+
+# Fixed tasks around the skills: (phase, title, description, hours, resources).
+# "{project}" and "{role}" are filled in per roadmap.
+PROJECT_TASKS = [
+    ("project", "Project Planning", "Plan your project: {project}", 2,
+     ["https://www.atlassian.com/agile/project-management"]),
+    ("project", "Setup Development Environment", "Install tools, create repo, setup project structure", 1.5,
+     ["https://git-scm.com/book/en/v2/Git-Basics-Getting-a-Git-Repository"]),
+    ("project", "Core Features Implementation", "Build main functionality of your project", 3,
+     ["https://stackoverflow.com/"]),
+    ("project", "MVP Complete", "Working version with core features done", 2.5, []),
+]
+REVIEW_TASKS = [
+    ("advanced", "Code Review & Optimization", "Refactor code, improve performance, fix bugs", 2,
+     ["https://refactoring.guru/"]),
+    ("advanced", "Add Advanced Features", "Enhance project with additional capabilities", 3, []),
+]
+LAUNCH_TASKS = [
+    ("launch", "Documentation & README", "Write comprehensive docs, setup instructions, and comments", 2,
+     ["https://www.makeareadme.com/"]),
+    ("launch", "Create Project Demo", "Record video demo or write case study", 2, ["https://www.youtube.com/"]),
+    ("launch", "Update LinkedIn & GitHub", "Showcase project, update skills section, pin repositories", 1.5,
+     ["https://www.linkedin.com"]),
+    ("launch", "Job Applications", "Start applying to {role} positions", 2,
+     ["https://www.linkedin.com/jobs", "https://github.com/jobs"]),
+    ("launch", "Review & Next Steps", "Review progress, identify next learning goals", 1, []),
+]
+PHASE_FOCUS = {
+    "core": "Core {role} Skills",
+    "project": "Build Portfolio Project",
+    "advanced": "Advanced Topics & Optimization",
+    "launch": "Portfolio Polish & Career Launch",
+}
+
+
+def _hours_text(hours):
+    hours = round(hours, 1)
+    return f"{hours:g} hour" if hours == 1 else f"{hours:g} hours"
+
+
+def _part_suffix(part, parts):
+    return f" ({part}/{parts})" if parts > 1 else ""
+
+
+def _skill_task(day, hours, phase, skill, needed_for, part, parts, learning_resources):
+    """One study session on a skill: the first half of its sessions learn it, the rest practise it"""
+    learn_parts = ceil(parts / 2)
+    if part <= learn_parts:
+        title = f"Advanced {skill.title()}" if phase == "advanced" else f"Master {skill.title()}"
+        task = {
+            "title": title + _part_suffix(part, learn_parts),
+            "description": (f"Deep dive into {skill} with real-world applications" if phase == "advanced"
+                            else f"Learn fundamentals and best practices of {skill}"),
+            "resources": [learning_resources.get(skill, f"https://www.google.com/search?q=learn+{skill.replace(' ', '+')}")],
+            "type": "learning",
+        }
+    else:
+        task = {
+            "title": f"Practice {skill.title()}" + _part_suffix(part - learn_parts, parts - learn_parts),
+            "description": f"Build hands-on projects using {skill}",
+            "resources": ["https://github.com/topics/project-ideas"],
+            "type": "practice",
+        }
+    if needed_for:
+        task["description"] += f" (needed before {needed_for})"
+    return {"day": day, **task, "time": _hours_text(hours), "skill": skill}
+
+
+def assemble_roadmap(user_skills, role, hours_per_week, catalog):
+    """Build the roadmap body for a canonical skill set, role and weekly hours.
+
+    The result depends on nothing else: the project idea is drawn from an
+    RNG seeded with the same inputs and start_date is left for the caller.
+
+    The missing required skills come first, each right after the missing
+    prerequisites it needs (see scheduler.py). The portfolio project
+    follows, then the missing preferred skills, then the launch tasks.
+    Every item is sized by its effort estimate and packed into study days
+    of hours_per_week, so the plan is as long as the gaps need.
+    """
+    requirements = catalog.job_requirements[role]
+    learning_resources = catalog.learning_resources
+    graph = catalog.skill_graph
+    role_title = role.replace('_', ' ').title()
+    
+    # Step 3: Find skill gaps against canonical skill IDs
+    missing_required, missing_preferred = find_skill_gaps(requirements, user_skills, catalog)
+    
+    # Step 4: Order the skills to learn, prerequisites first
+    covered = canonical_skill_ids(user_skills, catalog)
+    core_goals = missing_required
+    # If no gaps found, add some default learning
+    if not missing_required and not missing_preferred:
+        core_goals = ["advanced concepts", "best practices"]
+    core = graph.learning_order(core_goals, covered)
+    advanced = graph.learning_order(missing_preferred, covered | {skill for skill, _ in core})
+    
+    # Seeded by the cache key, so a cached and a fresh roadmap pick the same project
+    rng = random.Random("|".join([role, str(hours_per_week), *user_skills]))
+    project_idea = rng.choice(requirements["projects"])
+    
+    # Step 5: Pack everything into study days of the weekly budget
+    items = [(graph.effort(skill), ("core", skill, needed_for)) for skill, needed_for in core]
+    items += [(task[3], task) for task in PROJECT_TASKS]
+    items += [(graph.effort(skill), ("advanced", skill, needed_for)) for skill, needed_for in advanced]
+    items += [(task[3], task) for task in REVIEW_TASKS + LAUNCH_TASKS]
+    
+    weeks = {}
+    total_hours = 0
+    # A day can hold several tasks, so progress is reported by task id
+    for number, (day, hours, item, part, parts) in enumerate(pack_sessions(items, hours_per_week), 1):
+        total_hours += hours
+        if len(item) == 3:
+            phase, skill, needed_for = item
+            task = _skill_task(day, hours, phase, skill, needed_for, part, parts, learning_resources)
+        else:
+            phase, title, description, _, resources = item
+            task = {
+                "day": day,
+                "title": title + _part_suffix(part, parts),
+                "description": description.format(project=project_idea, role=role_title),
+                "resources": resources,
+                "time": _hours_text(hours)
+            }
+        week = weeks.setdefault((day - 1) // 7 + 1, {"tasks": [], "phases": Counter()})
+        week["tasks"].append({"id": number, **task})
+        week["phases"][phase] += hours
+    
+    return {
+        "weeks": [
+            {
+                "week": number,
+                # What most of the week's hours go to
+                "focus": PHASE_FOCUS[week["phases"].most_common(1)[0][0]].format(role=role_title),
+                "tasks": week["tasks"]
+            }
+            for number, week in weeks.items()
+        ],
+        "hours_per_week": hours_per_week,
+        "total_days": max(task["day"] for week in weeks.values() for task in week["tasks"]),
+        "total_hours": round(total_hours, 1),
+        "start_date": None,
+        "skill_gaps": {
+            "required": missing_required,
+            "preferred": missing_preferred[:3]
+        },
+        "analysis": {
+            "skills_found": user_skills,
+            "total_skills": len(user_skills),
+            "gaps_count": len(missing_required) + len(missing_preferred)
+        }
+    }
+
+
+@app.post("/api/roadmap")
+def create_roadmap(profile: UserProfile, request: Request):
+    """Build the roadmap for a profile.
+
+    The response's ETag is the profile's raw_profile_key, so it changes with
+    the profile or the catalog. A client that sends it back in If-None-Match
+    gets a 304 and keeps the roadmap (and roadmap_id) it already has.
+    Browsers do not cache POST responses, so the frontend stores the last
+    one itself.
+    """
+    started = time.perf_counter()
+    raw_key = raw_profile_key(profile, catalog_store.current)
+    set_fingerprint(raw_key)
+    # Weak: start_date and roadmap_id differ between equivalent responses
+    etag = f'W/"{raw_key}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        ROADMAP_REQUESTS.inc("not_modified")
+        log_request(
+            "roadmap",
+            sampled=sample_request(),
+            role=profile.dream_role,
+            outcome="not_modified",
+            duration_ms=round((time.perf_counter() - started) * 1000, 2)
+        )
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    shared_result, shared = roadmap_flights.do(raw_key, build_roadmap, profile, None, raw_key)
+    outcome = "shared" if shared else "built"
+    ROADMAP_REQUESTS.inc(outcome)
+    roadmap = shared_result["roadmap"]
+    # Progress on this roadmap is reported against its id (see /api/progress);
+    # each request gets its own, even when the roadmap was shared
+    result = {**shared_result, "roadmap_id": progress_store.save_roadmap(roadmap, profile.dream_role)}
+    
+    sampled = sample_request()
+    log_request(
+        "roadmap",
+        sampled=sampled,
+        role=profile.dream_role,
+        outcome=outcome,
+        hours_per_week=profile.hours_per_week,
+        resume_chars=len(profile.resume_text),
+        skills_found=roadmap["analysis"]["total_skills"],
+        missing_required=len(roadmap["skill_gaps"]["required"]),
+        gaps=roadmap["analysis"]["gaps_count"],
+        duration_ms=round((time.perf_counter() - started) * 1000, 2)
+    )
+    if sampled and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("roadmap_skills", extra={"fields": {
+            "skills_found": roadmap["analysis"]["skills_found"],
+            "skill_gaps": roadmap["skill_gaps"]
+        }})
+    # Plain dicts and lists: serialized directly, without the jsonable_encoder pass
+    return FastJSONResponse(result, headers={"ETag": etag})
+
+# ========== BATCH ROADMAPS ==========
+BATCH_MAX_PROFILES = int(os.environ.get("BATCH_MAX_PROFILES", "10000"))
+
+
+class BatchRoadmapRequest(BaseModel):
+    profiles: List[UserProfile] = []
+
+
+def _batch_key(profile):
+    return (profile.resume_text, tuple(profile.current_skills), profile.dream_role, profile.hours_per_week)
+
+
+def create_roadmaps(profiles):
+    """Build roadmaps for many profiles, yielding one result per profile in order.
+    
+    The compiled matcher and role data are shared across the batch, each
+    distinct resume text is scanned once, and identical profiles (common
+    in a cohort) are built once. A roadmap or scan is only kept until the
+    last profile in the batch that reuses it, not for the whole batch.
+    """
+    last_key_use = {}
+    last_text_use = {}
+    for index, profile in enumerate(profiles):
+        last_text_use[profile.resume_text] = index
+        try:
+            last_key_use[_batch_key(profile)] = index
+        except TypeError:
+            pass  # unhashable skills: reported on the profile's own line below
+    
+    resume_evidence = {}
+    built = {}
+    for index, profile in enumerate(profiles):
+        text = profile.resume_text
+        try:
+            key = _batch_key(profile)
+            result = built.pop(key, None)
+            if result is None:
+                if text not in resume_evidence:
+                    resume_evidence[text] = extract_skill_evidence(text)
+                result = build_roadmap(profile, resume_evidence[text])
+            if last_key_use[key] > index:
+                built[key] = result
+            yield {"index": index, **result}
+        except Exception as e:
+            yield {"index": index, "success": False, "error": f"Error: {str(e)[:100]}"}
+        finally:
+            if last_text_use[text] == index:
+                resume_evidence.pop(text, None)
+
+
+@app.post("/api/roadmap/batch")
+def create_roadmap_batch(request: BatchRoadmapRequest):
+    """Build roadmaps for a whole cohort, streamed back as NDJSON (one line per profile)"""
+    if len(request.profiles) > BATCH_MAX_PROFILES:
+        return JSONResponse(
+            status_code=413,
+            content={
+                "success": False,
+                "error": f"Batch too large: {len(request.profiles)} profiles (max {BATCH_MAX_PROFILES})"
+            }
+        )
+    
+    def ndjson_lines():
+        started = time.perf_counter()
+        failures = 0
+        for result in create_roadmaps(request.profiles):
+            failures += not result["success"]
+            yield dumps(result) + b"\n"
+        log_request(
+            "roadmap_batch",
+            profiles=len(request.profiles),
+            failures=failures,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2)
+        )
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+# ========== PROGRESS ADAPTATION ==========
+# Roadmaps and completion events, so adaptation is computed from history
+# instead of from a full roadmap re-sent by the client
+progress_store = ProgressStore()
+
+ADAPTATIONS = {
+    "accelerate": {
+        "message": "You're making fast progress! Here's an accelerated path:",
+        "new_tasks": [
+            "Skip basic tutorials - move to advanced projects",
+            "Add extra features to your project",
+            "Start networking with industry professionals"
+        ]
+    },
+    "simplify": {
+        "message": "Let's make this easier to match your pace:",
+        "new_tasks": [
+            "Focus on one skill at a time",
+            "More foundational resources added",
+            "Break down tasks into smaller steps"
+        ]
+    },
+    "maintain": {
+        "message": "You're on track! Keep up the good work!",
+        "new_tasks": []
+    }
+}
+
+
+class AdaptRequest(BaseModel):
+    completed_days: list = []
+    current_roadmap: dict = {}
+    roadmap_id: str = ""
+
+
+class ProgressEvents(BaseModel):
+    completed: List[int] = []
+    uncompleted: List[int] = []
+
+
+def _adaptation(action, **extra):
+    return {"action": action, **ADAPTATIONS[action], **extra}
+
+
+@STAGE_SECONDS.timed("adapt")
+def adapt_from_progress(progress):
+    """Pick an adaptation from a roadmap's stored history.
+
+    Progress is compared with where the plan expects the learner to be by
+    now. Someone well ahead, or finishing tasks much faster than planned
+    over the last week, gets an accelerated path; someone well behind gets
+    a simpler one that starts with their least-practised skill.
+    """
+    total = progress["total_tasks"] or 1
+    margin = max(2.0, 0.15 * total)
+    ahead = progress["completed"] - progress["expected_completed"]
+    pace = progress["pace"]
+    
+    if ahead >= margin or (pace["last_7_days"] >= 1.5 * pace["planned_per_week"] and ahead > 0):
+        return _adaptation("accelerate")
+    if -ahead >= margin and progress["days_elapsed"] >= 2:
+        lagging = [
+            skill for skill, counts in progress["skills"].items()
+            if counts["completed"] < counts["total"]
+        ]
+        lagging.sort(key=lambda skill: progress["skills"][skill]["completed"] / progress["skills"][skill]["total"])
+        adaptation = _adaptation("simplify", focus_skills=lagging[:2])
+        if lagging:
+            adaptation["new_tasks"] = [f"Focus on {lagging[0]} before moving on"] + adaptation["new_tasks"][1:]
+        return adaptation
+    return _adaptation("maintain")
+
+
+def _unknown_roadmap(roadmap_id):
+    return JSONResponse(status_code=404, content={"success": False, "error": f"Unknown roadmap: {roadmap_id}"})
+
+
+@app.get("/api/progress/{roadmap_id}")
+def get_progress(roadmap_id: str):
+    """Stored progress of a roadmap and the adaptation it calls for"""
+    progress = progress_store.progress(roadmap_id)
+    if progress is None:
+        return _unknown_roadmap(roadmap_id)
+    return {"success": True, "progress": progress, "adaptation": adapt_from_progress(progress)}
+
+
+@app.post("/api/progress/{roadmap_id}")
+def record_progress(roadmap_id: str, events: ProgressEvents):
+    """Record tasks (by id) completed or unchecked since the last call"""
+    if not progress_store.record(roadmap_id, events.completed, events.uncompleted):
+        return _unknown_roadmap(roadmap_id)
+    # Only the counts and the adaptation; the full history is on GET
+    progress = progress_store.progress(roadmap_id)
+    return {
+        "success": True,
+        "completed": progress["completed"],
+        "total_tasks": progress["total_tasks"],
+        "adaptation": adapt_from_progress(progress)
+    }
+
+
+@STAGE_SECONDS.timed("adapt")
+def adapt_from_completed_days(completed_days):
+    """Adaptation for clients without a stored roadmap, from the days they send"""
+    completion_rate = len(completed_days) / 30
+    
+    if completion_rate > 0.3:
+        return _adaptation("accelerate")
+    elif completion_rate < 0.1 and len(completed_days) > 0:
+        return _adaptation("simplify")
+    else:
+        return _adaptation("maintain")
+
+
+@app.post("/api/adapt")
+def adapt_plan(request: AdaptRequest):
+    """Adapt roadmap based on user progress"""
+    if request.roadmap_id:
+        progress = progress_store.progress(request.roadmap_id)
+        if progress is None:
+            return _unknown_roadmap(request.roadmap_id)
+        return adapt_from_progress(progress)
+    return adapt_from_completed_days(request.completed_days)
+
+# ========== INCREMENTAL RE-ANALYSIS ==========
+# A resume being edited keeps its per-line skill matches between requests,
+# so each update rescans only the lines that changed (see analysis_session.py).
+# The scans are per process; the last result of each session is shared, so
+# an update reaching another worker rescans the whole text and still
+# answers with what changed.
+analysis_sessions = TTLCache(max_entries=ANALYSIS_SESSION_MAX, ttl=ANALYSIS_SESSION_TTL_SECONDS)
+session_store = SessionStore()
+
+
+def _analyze(session, profile, catalog):
+    """Recompute the session's user skills and gaps from its scan"""
+    role = profile.dream_role if profile.dream_role in catalog.job_requirements else "ml_engineer"
+    user_skills = collect_user_skills(profile, session.scan.skills, catalog)
+    missing_required, missing_preferred = find_skill_gaps(catalog.job_requirements[role], user_skills, catalog)
+    session.user_skills = user_skills
+    session.gaps = (missing_required, missing_preferred)
+    return role
+
+
+def _delta(before, after):
+    before_set, after_set = set(before), set(after)
+    return {
+        "added": [item for item in after if item not in before_set],
+        "removed": [item for item in before if item not in after_set]
+    }
+
+
+@app.post("/api/analysis")
+def start_analysis(profile: UserProfile):
+    """Analyze a resume and keep its state for incremental updates"""
+    catalog = catalog_store.current
+    session = AnalysisSession(catalog, profile.resume_text)
+    role = _analyze(session, profile, catalog)
+    session_id = uuid.uuid4().hex
+    analysis_sessions.put(session_id, session)
+    session_store.save(session_id, session.user_skills, session.gaps)
+    return {
+        "success": True,
+        "session_id": session_id,
+        "role": role,
+        "skills": session.user_skills,
+        "missing_required": session.gaps[0],
+        "missing_preferred": session.gaps[1]
+    }
+
+
+@app.post("/api/analysis/{session_id}")
+def update_analysis(session_id: str, profile: UserProfile):
+    """Re-analyze an edited resume; returns only what changed since the last call"""
+    previous = session_store.load(session_id)
+    if previous is None:
+        return JSONResponse(status_code=404, content={"success": False, "error": f"Unknown session: {session_id}"})
+    
+    catalog = catalog_store.current
+    session = analysis_sessions.get(session_id)
+    if session is None:
+        # Started on another worker, or evicted here: the rescan below covers every line
+        session = AnalysisSession(catalog, "")
+        analysis_sessions.put(session_id, session)
+    with session.lock:
+        previous_skills, (previous_required, previous_preferred) = previous
+        session.rescan(catalog, profile.resume_text)
+        role = _analyze(session, profile, catalog)
+        session_store.save(session_id, session.user_skills, session.gaps)
+        return {
+            "success": True,
+            "role": role,
+            "skills": _delta(previous_skills, session.user_skills),
+            "missing_required": _delta(previous_required, session.gaps[0]),
+            "missing_preferred": _delta(previous_preferred, session.gaps[1]),
+            "lines_rescanned": session.scan.rescanned,
+            "lines_total": len(session.scan.found)
+        }
+
+
+# ========== BACKGROUND RESUME JOBS ==========
+# Upload now, collect later: the extraction (and optionally the roadmap)
+# runs on the job queue and the client polls /api/jobs/{id} or gets a
+# POST to its callback_url when the job finishes
+job_queue = JobQueue()
+Gauge("career_navigator_job_queue_depth", "Resume jobs waiting for a worker in this process", lambda: job_queue.depth)
+
+
+async def _extract_when_pool_free(filename, path, digest):
+    # A job has no client waiting on it, so wait for the parser instead of failing
+    while True:
+        try:
+            return await _extract_with_cache(filename, path, digest)
+        except PoolSaturated:
+            await asyncio.sleep(0.5)
+
+
+def _resume_job(filename, path, digest, profile):
+    async def run():
+        try:
+            extracted = await _extract_when_pool_free(filename, path, digest)
+        finally:
+            os.unlink(path)
+        result = {"extraction": extracted}
+        if profile is not None and extracted["success"]:
+            profile.resume_text = extracted["extracted_text"]
+            roadmap = await asyncio.to_thread(build_roadmap, profile)
+            roadmap["roadmap_id"] = progress_store.save_roadmap(roadmap["roadmap"], profile.dream_role)
+            result["roadmap"] = roadmap
+        return result
+    return run
+
+
+@app.post("/api/jobs/resume", status_code=202)
+async def submit_resume_job(
+    file: UploadFile = File(...),
+    dream_role: str = Form(""),
+    hours_per_week: int = Form(15),
+    current_skills: str = Form(""),
+    callback_url: str = Form("")
+):
+    """Queue a resume for extraction (and a roadmap if dream_role is set); returns a job id"""
+    if callback_url:
+        try:
+            await asyncio.to_thread(check_callback_url, callback_url)
+        except CallbackRejected as e:
+            return JSONResponse(status_code=400, content={"success": False, "error": str(e)})
+    
+    filename = file.filename.lower()
+    path, digest = await spool_upload(file, os.path.splitext(filename)[1])
+    
+    profile = None
+    skills = [skill.strip() for skill in current_skills.split(",") if skill.strip()]
+    if dream_role:
+        profile = UserProfile(dream_role=dream_role, hours_per_week=hours_per_week, current_skills=skills)
+    # Same bytes and same options means the same work
+    key = (digest, dream_role, hours_per_week, tuple(sorted(skills)))
+    
+    try:
+        job, deduplicated = await job_queue.submit(key, _resume_job(filename, path, digest, profile), callback_url or None)
+    except QueueFull:
+        os.unlink(path)
+        return JSONResponse(
+            status_code=503,
+            headers={"Retry-After": "5"},
+            content={"success": False, "error": "Too many resumes queued. Please try again in a few seconds."}
+        )
+    if deduplicated:
+        os.unlink(path)
+    
+    log_request("resume_job", sampled=sample_request(), job_id=job["job_id"], deduplicated=deduplicated, queued=job_queue.depth)
+    result = {
+        "success": True,
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "deduplicated": deduplicated,
+        "status_url": f"/api/jobs/{job['job_id']}"
+    }
+    if callback_url:
+        # False when a deduplicated job had already finished: poll status_url instead
+        result["callback_registered"] = callback_url in job.get("callback_status", {})
+    return result
+
+
+@app.get("/api/jobs")
+def job_stats():
+    """Queue depth, running jobs and outcome counters"""
+    return job_queue.stats()
+
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    """Status of a resume job queued on any worker, with its result once done"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"success": False, "error": f"Unknown job: {job_id}"})
+    return {"success": True, **job}
+
+# ========== REQUEST PROFILING ==========
+# A request sent with X-Profile-Token (or picked by PROFILE_SAMPLE_RATE) is
+# profiled and answered with an X-Profile-Id header; its profile is listed
+# and downloaded here. Profiles hold timings and function names, not resume
+# text, but these routes still need ADMIN_TOKEN.
+PROFILE_LIST_MAX = 200
+
+
+def _unknown_profile(profile_id):
+    return JSONResponse(status_code=404, content={"success": False, "error": f"Unknown profile: {profile_id}"})
+
+
+@app.get("/api/profiles")
+def list_profiles(request: Request, limit: int = 20):
+    """Newest stored request profiles: route, status, reason, fingerprint and duration"""
+    forbidden = _admin_forbidden(request)
+    if forbidden is not None:
+        return forbidden
+    return {
+        "success": True,
+        "store": profile_store.stats(),
+        "profiles": profile_store.recent(min(max(limit, 1), PROFILE_LIST_MAX))
+    }
+
+
+@app.get("/api/profiles/{profile_id}")
+def get_profile(profile_id: str, request: Request):
+    """A stored profile's stage timings and hottest functions (or stacks, in sample mode)"""
+    forbidden = _admin_forbidden(request)
+    if forbidden is not None:
+        return forbidden
+    summary = profile_store.summary(profile_id)
+    if summary is None:
+        return _unknown_profile(profile_id)
+    return {"success": True, **summary}
+
+
+@app.get("/api/profiles/{profile_id}/download")
+def download_profile(profile_id: str, request: Request):
+    """The profile itself: a pstats dump (cprofile mode) or collapsed stacks (sample mode)"""
+    forbidden = _admin_forbidden(request)
+    if forbidden is not None:
+        return forbidden
+    found = profile_store.data_path(profile_id)
+    if found is None:
+        return _unknown_profile(profile_id)
+    path, mode = found
+    media_type = "application/octet-stream" if mode == "cprofile" else "text/plain; charset=utf-8"
+    return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
+
+# ========== PRE-FORK WORKERS ==========
+# main.py imports this module once and forks workers from it, so the
+# catalog, skill index and compiled matcher are shared copy-on-write.
+# SQLite handles and the log thread do not survive fork() and are reopened.
+def warm_up():
+    """Build lazily created shared state now, so workers inherit it"""
+    catalog = catalog_store.current
+    catalog.role_ranker  # built on first access
+    extract_skills_from_text("python", catalog)
+    catalog.job_requirements.load_all()
+
+
+def before_fork():
+    """Release per-process resources in the parent before forking workers"""
+    shutdown_logging()
+    catalog_store.current.close()
+    extraction_cache.close()
+    progress_store.close()
+    job_queue.store.close()
+    session_store.close()
+
+
+def after_fork():
+    """Reopen per-process resources in a freshly forked worker"""
+    global extraction_cache, progress_store, session_store
+    setup_logging()
+    catalog_store.current.reconnect()
+    extraction_cache = ExtractionCache()
+    progress_store = ProgressStore()
+    job_queue.store = JobStore()
+    session_store = SessionStore()
+
+# Run the server
+if __name__ == "__main__":
+    from main import main
+    main()
\ No newline at end of file
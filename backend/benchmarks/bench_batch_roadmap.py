@@ -0,0 +1,75 @@
+"""Throughput of /api/roadmap/batch against one /api/roadmap call per profile.
+
+Run from the backend folder:
+    python benchmarks/bench_batch_roadmap.py [profiles]
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep per-request records out of the timings
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import app, catalog_store, create_roadmap, create_roadmaps, roadmap_cache, UserProfile  # noqa: E402
+
+RESUME_SNIPPETS = [
+    "Built REST APIs in Python and Flask, deployed with Docker on AWS.",
+    "Frontend work in React and TypeScript, styled with Sass.",
+    "Analyzed data with pandas and numpy, reported in Tableau dashboards.",
+    "Maintained Linux servers, wrote bash scripts and Jenkins pipelines.",
+    "Ran agile ceremonies, wrote user stories in Jira, led user research.",
+    "Trained neural networks in PyTorch for computer vision tasks.",
+]
+COMMON_SKILLS = [["python", "sql"], ["javascript", "html", "css"], ["excel"], []]
+
+
+def make_cohort(size, seed=7):
+    """A bootcamp-like cohort: many students share skills, resumes vary"""
+    rng = random.Random(seed)
+    roles = list(catalog_store.current.job_requirements)
+    profiles = []
+    for _ in range(size):
+        resume = " ".join(rng.sample(RESUME_SNIPPETS, rng.randint(1, 4))) * rng.randint(1, 5)
+        profiles.append({
+            "resume_text": resume,
+            "dream_role": rng.choice(roles),
+            "hours_per_week": rng.choice([5, 10, 15, 20]),
+            "current_skills": rng.choice(COMMON_SKILLS),
+        })
+    return profiles
+
+
+def timed(label, size, func):
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34} {elapsed:>8.2f}s {size / elapsed:>10.0f} profiles/s")
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cohort = make_cohort(size)
+    models = [UserProfile(**profile) for profile in cohort]
+    client = TestClient(app)
+
+    print(f"{size} profiles")
+    timed("sequential create_roadmap()", size, lambda: [create_roadmap(p) for p in models])
+    timed("create_roadmaps() batch API", size, lambda: list(create_roadmaps(models)))
+    timed("sequential POST /api/roadmap", size, lambda: [client.post("/api/roadmap", json=p) for p in cohort])
+
+    def batch_http():
+        with client.stream("POST", "/api/roadmap/batch", json={"profiles": cohort}) as response:
+            count = sum(1 for line in response.iter_lines() if line and json.loads(line)["success"])
+        assert count == size, count
+
+    timed("POST /api/roadmap/batch (NDJSON)", size, batch_http)
+    print(f"roadmap cache hit rate: {roadmap_cache.stats()['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Startup time and memory of a 50k-skill catalog: Python literals vs compiled SQLite.
+
+Each measurement runs in a fresh interpreter. "literals" imports a module
+holding the catalog as dict literals, the way app.py used to, and rebuilds
+all_skills with the same list/set churn. "compiled" opens the catalog
+file with catalog.Catalog. Both include building the skill matcher.
+
+Run from the backend folder:
+    python benchmarks/bench_catalog.py [skills] [roles]
+"""
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from catalog import compile_catalog  # noqa: E402
+
+
+def make_catalog(skill_count, role_count, seed=11):
+    """A labor-market sized catalog of made-up multi-word skills"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < skill_count // 2:
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))))
+    words = sorted(words)
+    skills = set()
+    while len(skills) < skill_count:
+        skills.add(" ".join(rng.sample(words, rng.randint(1, 3))))
+    skills = sorted(skills)
+
+    job_requirements = {}
+    for number in range(role_count):
+        picked = rng.sample(skills, 14)
+        job_requirements[f"role_{number}"] = {
+            "required": picked[:8],
+            "preferred": picked[8:],
+            "projects": [f"Project {number}-{i}" for i in range(3)]
+        }
+    learning_resources = {skill: f"https://learn.example.com/{skill.replace(' ', '-')}" for skill in skills}
+    skill_synonyms = {skill: [skill, skill.replace(" ", "-"), f"{skill} dev"] for skill in skills[::5]}
+    return {
+        "job_requirements": job_requirements,
+        "learning_resources": learning_resources,
+        "skill_synonyms": skill_synonyms
+    }
+
+
+LITERAL_LOADER = """
+all_skills = []
+for role, data in job_requirements.items():
+    all_skills.extend(data["required"])
+    all_skills.extend(data["preferred"])
+all_skills = list(set(all_skills))
+all_skills.extend(list(learning_resources.keys()))
+all_skills = list(set(all_skills))
+"""
+
+CHILD = """
+import json, os, sys, time
+sys.path.insert(0, {backend!r})
+sys.path.insert(0, {workdir!r})
+
+def rss():
+    with open("/proc/self/statm") as statm:
+        fields = statm.read().split()
+    page = os.sysconf("SC_PAGE_SIZE")
+    return int(fields[1]) * page, int(fields[2]) * page
+
+from skill_matcher import SkillMatcher, build_skill_index
+import catalog as catalog_module
+rss_before, _ = rss()
+started = time.perf_counter()
+if {mode!r} == "literals":
+    import catalog_literals as source
+    loaded = time.perf_counter()
+    index = build_skill_index(source.all_skills + list(source.skill_synonyms), source.skill_synonyms)
+    SkillMatcher(index)
+else:
+    catalog = catalog_module.Catalog({path!r})
+    loaded = None
+finished = time.perf_counter()
+rss_after, shared = rss()
+print(json.dumps({{
+    "load_s": loaded and loaded - started,
+    "total_s": finished - started,
+    "rss_mb": (rss_after - rss_before) / 2**20,
+    "shared_mb": shared / 2**20,
+}}))
+"""
+
+
+def run_child(mode, workdir, path):
+    code = CHILD.format(backend=BACKEND_DIR, workdir=workdir, mode=mode, path=path)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def main():
+    skill_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    role_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    source = make_catalog(skill_count, role_count)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        literals_path = os.path.join(workdir, "catalog_literals.py")
+        with open(literals_path, "w") as f:
+            for name in ("job_requirements", "learning_resources", "skill_synonyms"):
+                f.write(f"{name} = {source[name]!r}\n")
+            f.write(LITERAL_LOADER)
+
+        path = os.path.join(workdir, "catalog.db")
+        started = time.perf_counter()
+        compile_catalog(source, path)
+        compile_s = time.perf_counter() - started
+
+        print(f"{skill_count} skills, {role_count} roles")
+        print(f"literal module {os.path.getsize(literals_path) / 2**20:.1f} MB, "
+              f"compiled catalog {os.path.getsize(path) / 2**20:.1f} MB (compiled in {compile_s:.2f}s)")
+        # The first import writes the .pyc; report the cached import like a restart would see
+        run_child("literals", workdir, path)
+        print(f"{'':<22} {'data load':>10} {'+ matcher':>10} {'RSS delta':>10} {'shared':>9}")
+        for mode in ("literals", "compiled"):
+            result = run_child(mode, workdir, path)
+            # Catalog() reads the data and compiles the matcher in one step
+            load = f"{result['load_s']:.2f}s" if result["load_s"] else "-"
+            print(f"{mode:<22} {load:>10} {result['total_s']:>9.2f}s "
+                  f"{result['rss_mb']:>8.1f}MB {result['shared_mb']:>7.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""CPU cost of a cohort burst on /api/roadmap with and without coalescing and ETags.
+
+A cohort opens the same onboarding link: `users` requests for a handful of
+distinct profiles arrive with `concurrency` in flight, against cold
+roadmap caches. Then every user comes back and re-posts their profile,
+some of them edited. Scenarios:
+  - plain: every request computed (the caches still absorb repeats that
+    arrive after the first copy has finished)
+  - coalesced: identical requests in flight share one build
+  - coalesced + etag: the revisit sends If-None-Match and unchanged
+    profiles get a 304
+
+CPU time is the process time of the whole run, so it includes the
+server threads; the best of `REPEAT` runs is shown. "scans" counts resume
+scans (profile_keys misses): more than the number of distinct profiles
+means identical requests repeated the work.
+
+Run from the backend folder:
+    python benchmarks/bench_coalescing.py [users] [concurrency]
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep per-request records out of the timings
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+
+import app as app_module  # noqa: E402
+from app import app  # noqa: E402
+from progress_store import ProgressStore  # noqa: E402
+from responses import dumps  # noqa: E402
+from roadmap_cache import SingleFlight  # noqa: E402
+
+from bench_batch_roadmap import RESUME_SNIPPETS, make_cohort  # noqa: E402
+
+DISTINCT_PROFILES = 5
+EDITED_SHARE = 0.2
+REPEAT = 3
+
+
+class NoCoalescing:
+    """SingleFlight stand-in that runs every call"""
+
+    def do(self, key, func, *args):
+        return func(*args), False
+
+    def stats(self):
+        return {"shared_rate": 0.0}
+
+
+def make_burst(users, seed=7):
+    """users requests drawn from a few large profiles, as a cohort link produces"""
+    rng = random.Random(seed)
+    profiles = make_cohort(DISTINCT_PROFILES, seed)
+    for profile in profiles:
+        profile["resume_text"] = " ".join(rng.choice(RESUME_SNIPPETS) for _ in range(1600))
+    return [rng.choice(profiles) for _ in range(users)]
+
+
+async def send_all(client, requests, concurrency):
+    """POST [(profile, headers)] with `concurrency` in flight; returns the responses in order"""
+    responses = [None] * len(requests)
+    # Encoded up front, so the client's share of the CPU time stays small
+    bodies = {id(profile): dumps(profile) for profile, _ in requests}
+    pending = iter(enumerate(requests))
+
+    async def worker():
+        for index, (profile, headers) in pending:
+            request = client.build_request("POST", "/api/roadmap", content=bodies[id(profile)],
+                                           headers={"Content-Type": "application/json", **headers})
+            # Read as sent: decompressing is the client's work
+            response = await client.send(request, stream=True)
+            async for _ in response.aiter_raw():
+                pass
+            await response.aclose()
+            responses[index] = response
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return responses
+
+
+async def scenario(burst, concurrency, coalesce, revalidate, seed=7):
+    rng = random.Random(seed)
+    app_module.roadmap_cache.clear()
+    app_module.profile_keys.clear()
+    app_module.roadmap_flights = SingleFlight() if coalesce else NoCoalescing()
+
+    misses = app_module.profile_keys.misses
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        first = await send_all(client, [(profile, {}) for profile in burst], concurrency)
+        dedupe_rate = app_module.roadmap_flights.stats()["shared_rate"]
+
+        app_module.roadmap_cache.clear()
+        app_module.profile_keys.clear()
+        revisit = []
+        for profile, response in zip(burst, first):
+            if rng.random() < EDITED_SHARE:
+                profile = {**profile, "hours_per_week": profile["hours_per_week"] + 5}
+            headers = {"If-None-Match": response.headers["etag"]} if revalidate else {}
+            revisit.append((profile, headers))
+        second = await send_all(client, revisit, concurrency)
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+
+    not_modified = sum(response.status_code == 304 for response in second) / len(second)
+    return cpu, elapsed, app_module.profile_keys.misses - misses, dedupe_rate, not_modified
+
+
+def main(users, concurrency):
+    # Nothing written to data/
+    app_module.progress_store = ProgressStore(":memory:")
+    burst = make_burst(users)
+    requests = 2 * len(burst)
+    print(f"{users} users, {DISTINCT_PROFILES} distinct profiles, {concurrency} in flight, "
+          f"{EDITED_SHARE:.0%} edit before revisiting")
+    print(f"{'scenario':<18} {'CPU':>8} {'CPU/req':>9} {'wall':>8} {'scans':>6} {'deduped':>8} {'304s':>6}")
+
+    asyncio.run(scenario(burst[:concurrency], concurrency, True, True))  # warm-up
+    baseline = None
+    for label, coalesce, revalidate in (("plain", False, False), ("coalesced", True, False),
+                                        ("coalesced + etag", True, True)):
+        runs = [asyncio.run(scenario(burst, concurrency, coalesce, revalidate)) for _ in range(REPEAT)]
+        cpu, elapsed, scans, dedupe_rate, not_modified = min(runs)
+        baseline = baseline or cpu
+        print(f"{label:<18} {cpu:>7.2f}s {cpu / requests * 1000:>7.2f}ms {elapsed:>7.2f}s {scans:>6} "
+              f"{dedupe_rate:>8.1%} {not_modified:>6.1%}  ({1 - cpu / baseline:.0%} less CPU)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 40)
@@ -0,0 +1,109 @@
+"""Cold start of a server process under each EXTRACT_PRELOAD mode.
+
+Each run starts a fresh single-worker `python main.py` and reports, from
+process start:
+  - listening: when GET / first answers
+  - ready: when GET /api/ready first answers 200
+  - the latency of the first PDF upload, sent either as soon as the server
+    answers (what a load balancer without readiness checks does) or once
+    it reports ready, and of a second upload for comparison
+
+The extraction cache is disabled, so both uploads are parsed.
+
+Run from the backend folder:
+    python benchmarks/bench_cold_start.py [runs]
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx  # noqa: E402
+
+from corpus import write_pdf  # noqa: E402
+
+MODES = ("lazy", "background", "eager")
+RESUME = "\n".join(["Jane Doe", "Data engineer with Python, SQL, Airflow, Spark and Docker."] * 40)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(client, path, started, status=200, timeout=60):
+    """Seconds from started until GET path answers with status"""
+    while time.perf_counter() - started < timeout:
+        try:
+            if client.get(path).status_code == status:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(f"{path} did not answer {status} within {timeout}s")
+
+
+def upload(client, content):
+    started = time.perf_counter()
+    response = client.post("/api/extract-resume-raw?filename=resume.pdf", content=content)
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200 and response.json()["success"], response.text
+    return elapsed
+
+
+def cold_start(mode, content, wait_ready, workdir):
+    port = free_port()
+    env = {
+        **os.environ,
+        "EXTRACT_PRELOAD": mode,
+        "WEB_WORKERS": "1",
+        "PORT": str(port),
+        "LOG_LEVEL": "WARNING",
+        "RESUME_CACHE_MAX_BYTES": "0",
+        "CATALOG_RELOAD_SECONDS": "0",
+        "PROGRESS_DB_PATH": os.path.join(workdir, f"progress-{port}.db"),
+    }
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "main.py"], cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            listening = wait_for(client, "/", started)
+            if wait_ready:
+                ready = wait_for(client, "/api/ready", started)
+                first = upload(client, content)
+            else:
+                first = upload(client, content)
+                ready = wait_for(client, "/api/ready", started)
+            second = upload(client, content)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return listening, ready, first, second
+
+
+def run(runs):
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "resume.pdf")
+        write_pdf(RESUME, path)
+        with open(path, "rb") as f:
+            content = f.read()
+
+        print(f"{'mode':<11} {'first upload':<13} {'listening':>10} {'ready':>9} {'1st upload':>11} {'2nd upload':>11}")
+        for mode in MODES:
+            for wait_ready in (False, True):
+                samples = sorted(cold_start(mode, content, wait_ready, workdir) for _ in range(runs))
+                listening, ready, first, second = samples[len(samples) // 2]
+                print(f"{mode:<11} {'after ready' if wait_ready else 'at once':<13} {listening * 1000:>8.0f}ms "
+                      f"{ready * 1000:>7.0f}ms {first * 1000:>9.0f}ms {second * 1000:>9.0f}ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
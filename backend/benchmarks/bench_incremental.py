@@ -0,0 +1,60 @@
+"""Time per edit of a long resume: full rescan vs IncrementalSkillScan.update.
+
+Each "edit" replaces one random line of the resume with another line of
+text, then measures:
+  - full:        catalog.skill_matcher.find over the whole new text
+  - incremental: IncrementalSkillScan.update with the whole new text
+                 (diffing included), the way /api/analysis/{id} does
+
+Run from the backend folder:
+    python benchmarks/bench_incremental.py [edits]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from analysis_session import IncrementalSkillScan  # noqa: E402
+from app import catalog_store  # noqa: E402
+from corpus import catalog_aliases, resume_text  # noqa: E402
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    edits = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(4)
+    aliases = catalog_aliases()
+    matcher = catalog_store.current.skill_matcher
+
+    print(f"{'words':>8} {'lines':>7} {'full p50':>10} {'incr p50':>10} {'incr p99':>10}")
+    for words in (1000, 10000, 100000):
+        lines = resume_text(rng, aliases, words).split("\n")
+        spare = resume_text(rng, aliases, 2000).split("\n")
+        scan = IncrementalSkillScan(matcher, "\n".join(lines))
+
+        full, incremental = [], []
+        for _ in range(edits):
+            lines[rng.randrange(len(lines))] = rng.choice(spare)
+            text = "\n".join(lines)
+
+            started = time.perf_counter()
+            matcher.find(text)
+            full.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            scan.update(text)
+            incremental.append(time.perf_counter() - started)
+
+        print(f"{words:>8} {len(lines):>7} {percentile(full, 0.5) * 1000:>8.2f}ms "
+              f"{percentile(incremental, 0.5) * 1000:>8.3f}ms {percentile(incremental, 0.99) * 1000:>8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
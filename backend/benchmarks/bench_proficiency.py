@@ -0,0 +1,91 @@
+"""Proficiency extraction against the old action-word context loop on a 100 KB resume.
+
+The old extract_skills_from_text split the resume into words and, after
+every action verb, checked every catalog skill against the next four
+words: O(words x skills), and it only said whether a skill was found.
+skill_evidence (proficiency.py) counts skills with the compiled matcher
+and runs the five experience cues as one precompiled regex, giving years,
+level and confidence per skill. Both run against the live catalog and
+against it padded with made-up skills, since the old loop's cost grows
+with the number of skills.
+
+Run from the backend folder:
+    python benchmarks/bench_proficiency.py [kilobytes ...]
+"""
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import catalog_store  # noqa: E402
+from proficiency import skill_evidence  # noqa: E402
+from skill_matcher import SkillMatcher, build_skill_index  # noqa: E402
+
+EXTRA_SKILLS = (0, 1000, 5000)
+
+SAMPLE_PARAGRAPH = (
+    "Senior software engineer with 5 years of experience with Python and SQL. "
+    "Developed REST APIs in Node.js, deployed with Docker and k8s on AWS. "
+    "Proficient in pandas and scikit-learn; built dashboards using React and Grafana. "
+    "Worked on machine learning models using PyTorch, results were presented in sprint reviews. "
+    "Used Jenkins for CI and wrote documentation for the team.\n"
+)
+
+
+def legacy_action_word_loop(text, all_skills):
+    """The context pass the old extract_skills_from_text ran after its substring scan"""
+    found_skills = set()
+    action_words = ['built', 'developed', 'created', 'designed', 'implemented', 'worked', 'used', 'experienced']
+    tech_terms = text.lower().split()
+    for i, word in enumerate(tech_terms):
+        if word in action_words and i + 1 < len(tech_terms):
+            next_words = ' '.join(tech_terms[i+1:min(i+5, len(tech_terms))])
+            for skill in all_skills:
+                if skill.lower() in next_words.lower():
+                    found_skills.add(skill)
+    return list(found_skills)
+
+
+def padded_catalog(extra, seed=11):
+    """The live catalog's skills plus `extra` made-up ones, and a matcher compiled from them"""
+    rng = random.Random(seed)
+    catalog = catalog_store.current
+    skills = list(catalog.all_skills)
+    while len(skills) < len(catalog.all_skills) + extra:
+        skills.append(" ".join("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+                               for _ in range(rng.randint(1, 2))))
+    return skills, SkillMatcher(build_skill_index(skills, catalog.skill_synonyms))
+
+
+def make_resume(size):
+    repeats = size // len(SAMPLE_PARAGRAPH) + 1
+    return (SAMPLE_PARAGRAPH * repeats)[:size]
+
+
+def best_time(func, text, number):
+    return min(timeit.repeat(lambda: func(text), number=number, repeat=5)) / number
+
+
+def main(sizes_kb):
+    print(f"{'skills':>7} {'size':>7} {'action loop':>12} {'evidence':>10} {'speedup':>8} {'MB/s':>6}")
+    for extra in EXTRA_SKILLS:
+        skills, matcher = padded_catalog(extra)
+        for size_kb in sizes_kb:
+            text = make_resume(size_kb * 1000)
+            number = max(1, 400 // size_kb)
+            legacy = best_time(lambda t: legacy_action_word_loop(t, skills), text, max(1, number // (1 + extra // 500)))
+            evidence = best_time(lambda t: skill_evidence(matcher, t), text, number)
+            print(f"{len(skills):>7} {size_kb:>5}KB {legacy * 1000:>10.2f}ms {evidence * 1000:>8.2f}ms "
+                  f"{legacy / evidence:>7.1f}x {len(text) / evidence / 1e6:>6.1f}")
+
+    matcher = catalog_store.current.skill_matcher
+    with_years = {skill: found["years"] for skill, found in skill_evidence(matcher, make_resume(1000)).items()
+                  if found["years"]}
+    print(f"years found in the sample: {with_years}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 10, 100])
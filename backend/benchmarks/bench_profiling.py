@@ -0,0 +1,102 @@
+"""What request profiling costs when it is off, armed and on.
+
+Every request posts a distinct profile to /api/roadmap, so each one goes
+through skill matching, gap analysis and scheduling (no cache hits).
+Scenarios:
+  - off:      no PROFILE_TOKEN and no sampling; the middleware passes
+              requests straight through and stages find no profile
+  - armed:    PROFILE_TOKEN set, requests sent without the header (each
+              request's headers are scanned for it)
+  - cprofile: every request sends the token and is profiled with cProfile
+  - sample:   the same with the stack sampler
+Profiles are written to a temporary folder. Also times a call to a
+@staged function against the bare function, with no profile active.
+
+Run from the backend folder:
+    python benchmarks/bench_profiling.py [requests]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep per-request records out of the timings
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+
+import app as app_module  # noqa: E402
+from app import app, profile_store  # noqa: E402
+from profiling import staged  # noqa: E402
+from progress_store import ProgressStore  # noqa: E402
+from responses import dumps  # noqa: E402
+
+from bench_batch_roadmap import make_cohort  # noqa: E402
+
+TOKEN = "bench"
+SCENARIOS = (
+    ("off", "", "cprofile", False),
+    ("armed", TOKEN, "cprofile", False),
+    ("cprofile", TOKEN, "cprofile", True),
+    ("sample", TOKEN, "sample", True),
+)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run(profiles, send_token):
+    headers = {"Content-Type": "application/json", **({"X-Profile-Token": TOKEN} if send_token else {})}
+    bodies = [dumps(profile) for profile in profiles]
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        for body in bodies:
+            started = time.perf_counter()
+            response = await client.post("/api/roadmap", content=body, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200
+    return latencies
+
+
+def main(requests):
+    # Nothing written to data/
+    app_module.progress_store = ProgressStore(":memory:")
+    profile_store.directory = tempfile.mkdtemp(prefix="profiles-")
+    profile_store.keep = requests
+
+    def bare(x):
+        return x
+
+    wrapped = staged("bench")(bare)
+    calls = 1_000_000
+    bare_ns = min(timeit.repeat(lambda: bare(1), number=calls, repeat=3)) / calls * 1e9
+    wrapped_ns = min(timeit.repeat(lambda: wrapped(1), number=calls, repeat=3)) / calls * 1e9
+    print(f"@staged with no profile active: {wrapped_ns:.0f}ns per call vs {bare_ns:.0f}ns bare "
+          f"(+{wrapped_ns - bare_ns:.0f}ns)\n")
+
+    print(f"{requests} distinct roadmap requests per scenario, one at a time")
+    print(f"{'scenario':<10} {'p50':>8} {'p99':>8} {'vs off':>8}")
+    asyncio.run(run(make_cohort(50, seed=1), False))  # warm-up
+    baseline = None
+    for offset, (label, token, mode, send_token) in enumerate(SCENARIOS):
+        profile_store.token = token
+        profile_store.mode = mode
+        profiles = make_cohort(requests, seed=100 + offset)
+        for index, profile in enumerate(profiles):
+            # Unique text, so no roadmap comes from the caches
+            profile["resume_text"] += f" project {offset}-{index}"
+        latencies = asyncio.run(run(profiles, send_token))
+        p50 = percentile(latencies, 0.5) * 1000
+        baseline = baseline or p50
+        print(f"{label:<10} {p50:>6.2f}ms {percentile(latencies, 0.99) * 1000:>6.2f}ms {p50 / baseline - 1:>+7.1%}")
+    print(f"\n{profile_store.saved} profiles written to {profile_store.directory}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 400)
@@ -0,0 +1,102 @@
+"""Request size and latency of progress reporting: full-payload /api/adapt vs stored progress.
+
+Seeds a progress store with one roadmap per active user, each with a few
+completed tasks. Then replays "user ticks one more task" against both
+designs:
+  - legacy: POST /api/adapt with the full roadmap and every completed day
+  - stored: POST /api/progress/{id} with only the newly completed day
+
+Requests go through httpx's in-process ASGI transport, so the latencies
+are server-side cost without a network or TestClient's thread hop.
+
+Run from the backend folder:
+    python benchmarks/bench_progress.py [users] [requests]
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+
+import app as app_module  # noqa: E402
+from app import UserProfile, app, build_roadmap, catalog_store  # noqa: E402
+from progress_store import DAY_SECONDS, ProgressStore  # noqa: E402
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def report(label, sizes, latencies):
+    print(f"{label:<34} {sum(sizes) / len(sizes):>9.0f} B "
+          f"{percentile(latencies, 0.5) * 1000:>8.2f} ms {percentile(latencies, 0.99) * 1000:>8.2f} ms")
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    rng = random.Random(3)
+
+    roles = list(catalog_store.current.job_requirements)
+    roadmaps = [build_roadmap(UserProfile(dream_role=role, current_skills=["python"]))["roadmap"] for role in roles]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        store = app_module.progress_store = ProgressStore(os.path.join(workdir, "progress.db"))
+        started = time.perf_counter()
+        now = time.time()
+        users_state = []
+        for _ in range(users):
+            roadmap = rng.choice(roadmaps)
+            task_ids = [task["id"] for week in roadmap["weeks"] for task in week["tasks"]]
+            created = now - rng.uniform(0, 20) * DAY_SECONDS
+            roadmap_id = store.save_roadmap(roadmap, "role", now=created)
+            done = task_ids[:rng.randint(0, len(task_ids) - 1)]
+            store.record(roadmap_id, completed=done, now=created + DAY_SECONDS)
+            users_state.append((roadmap_id, roadmap, task_ids, done))
+        seed_s = time.perf_counter() - started
+        db_mb = os.path.getsize(os.path.join(workdir, "progress.db")) / 2**20
+        print(f"{users} users seeded in {seed_s:.1f}s ({store.stats()['completions']} completions, {db_mb:.1f} MB)")
+
+        sample = [rng.choice(users_state) for _ in range(requests)]
+        print(f"{'':<34} {'request':>11} {'p50':>11} {'p99':>11}")
+        asyncio.run(replay(sample))
+        store.close()
+
+
+async def timed_posts(client, requests):
+    sizes, latencies = [], []
+    for url, body in requests:
+        sizes.append(len(body))
+        started = time.perf_counter()
+        response = await client.post(url, content=body, headers={"Content-Type": "application/json"})
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.text
+    return sizes, latencies
+
+
+async def replay(sample):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        legacy = [
+            ("/api/adapt", json.dumps({"completed_days": done + task_ids[len(done):len(done) + 1], "current_roadmap": roadmap}))
+            for roadmap_id, roadmap, task_ids, done in sample
+        ]
+        report("legacy POST /api/adapt", *await timed_posts(client, legacy))
+
+        stored = [
+            (f"/api/progress/{roadmap_id}", json.dumps({"completed": task_ids[len(done):len(done) + 1]}))
+            for roadmap_id, roadmap, task_ids, done in sample
+        ]
+        report("stored POST /api/progress/{id}", *await timed_posts(client, stored))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Latency of ranking every role for one user: per-role gap analysis vs RoleRanker.
+
+Builds synthetic catalogs with bench_catalog.make_catalog: a sparse one
+(5,000 roles over 50,000 skills, most skills in one role) and a dense one
+(5,000 roles over 300 skills, every skill in hundreds of roles). Each
+user holds a random sample of the catalog's skills.
+  - per-role: find_skill_gaps-style set checks for every role, then sort
+  - ranker:   RoleRanker.rank (weighted overlap of all roles, top 10)
+
+Run from the backend folder:
+    python benchmarks/bench_role_rank.py [roles] [users]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_catalog import make_catalog  # noqa: E402
+from role_ranker import PREFERRED_WEIGHT, REQUIRED_WEIGHT, RoleRanker  # noqa: E402
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def rank_per_role(job_requirements, covered, top_k=10):
+    """What scoring every role one at a time costs"""
+    scored = []
+    for role, requirements in job_requirements.items():
+        required = set(requirements["required"])
+        missing_required = [skill for skill in requirements["required"] if skill not in covered]
+        missing_preferred = [
+            skill for skill in requirements["preferred"]
+            if skill not in covered and skill not in required
+        ]
+        preferred_total = sum(skill not in required for skill in requirements["preferred"])
+        total = REQUIRED_WEIGHT * len(required) + PREFERRED_WEIGHT * preferred_total
+        have = total - REQUIRED_WEIGHT * len(missing_required) - PREFERRED_WEIGHT * len(missing_preferred)
+        scored.append((have / total, role, missing_required, missing_preferred))
+    scored.sort(key=lambda entry: entry[0], reverse=True)
+    return scored[:top_k]
+
+
+def timed(function, users):
+    latencies = []
+    for covered in users:
+        started = time.perf_counter()
+        function(covered)
+        latencies.append(time.perf_counter() - started)
+    return percentile(latencies, 0.5) * 1000, percentile(latencies, 0.99) * 1000
+
+
+def main():
+    role_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    user_count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rng = random.Random(9)
+
+    print(f"{'':<32} {'build':>9} {'p50':>9} {'p99':>9}")
+    for label, skill_count, user_skills in (("sparse, 50k skills", 50000, 30), ("dense, 300 skills", 300, 30)):
+        source = make_catalog(skill_count, role_count)
+        job_requirements = source["job_requirements"]
+        skills = sorted(source["learning_resources"])
+        users = [set(rng.sample(skills, user_skills)) for _ in range(user_count)]
+
+        started = time.perf_counter()
+        ranker = RoleRanker((role, data["required"], data["preferred"]) for role, data in job_requirements.items())
+        build_ms = (time.perf_counter() - started) * 1000
+
+        for name, function, build in (
+                ("per-role", lambda covered: rank_per_role(job_requirements, covered), "-"),
+                ("ranker", ranker.rank, f"{build_ms:.0f}ms")):
+            p50, p99 = timed(function, users)
+            print(f"{label + ' ' + name:<32} {build:>9} {p50:>7.2f}ms {p99:>7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
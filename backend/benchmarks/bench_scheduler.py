@@ -0,0 +1,123 @@
+"""Latency of scheduling a roadmap over a prerequisite graph.
+
+A synthetic graph of `nodes` skills gets 0-3 prerequisites per skill
+among the skills before it, so it has no cycles. Chains run hundreds of
+skills deep. Each user has a role with `goals` missing skills and knows
+a random fifth of the graph.
+  - naive:    repeatedly scan the remaining skills for one whose
+              prerequisites are all placed (what a straightforward
+              topological sort over the needed skills costs)
+  - schedule: SkillGraph.learning_order (one depth-first walk over the
+              needed part of the graph) plus pack_sessions
+Also times assemble_roadmap on the live catalog for every role, with no
+skills known, and reports the plan lengths.
+
+Run from the backend folder:
+    python benchmarks/bench_scheduler.py [nodes] [users]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep per-request records out of the timings
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app import assemble_roadmap, catalog_store  # noqa: E402
+from scheduler import SkillGraph, pack_sessions  # noqa: E402
+
+GOAL_COUNTS = (10, 100, 500)
+
+
+def make_graph(nodes, seed=5):
+    rng = random.Random(seed)
+    prerequisites = {}
+    for index in range(1, nodes):
+        # Mostly recent skills, so chains get deep
+        candidates = range(max(0, index - 50), index)
+        prerequisites[f"skill {index}"] = [f"skill {before}" for before in rng.sample(candidates, min(len(candidates), rng.randint(0, 3)))]
+    hours = {f"skill {index}": rng.choice([4, 6, 8, 10, 15, 20]) for index in range(nodes)}
+    return prerequisites, hours
+
+
+def needed_skills(prerequisites, goals, covered):
+    needed = set()
+    pending = [goal for goal in goals if goal not in covered]
+    while pending:
+        skill = pending.pop()
+        if skill not in needed:
+            needed.add(skill)
+            pending.extend(before for before in prerequisites.get(skill, ()) if before not in covered)
+    return needed
+
+
+def naive_schedule(prerequisites, hours, goals, covered, hours_per_week):
+    """Pick the first remaining skill whose prerequisites are placed, until none remain"""
+    remaining = sorted(needed_skills(prerequisites, goals, covered))
+    placed = set(covered)
+    order = []
+    while remaining:
+        for position, skill in enumerate(remaining):
+            if all(before in placed for before in prerequisites.get(skill, ())):
+                order.append(skill)
+                placed.add(skill)
+                del remaining[position]
+                break
+    return pack_sessions([(hours[skill], skill) for skill in order], hours_per_week)
+
+
+def fast_schedule(graph, goals, covered, hours_per_week):
+    order = graph.learning_order(goals, covered)
+    return pack_sessions([(graph.effort(skill), skill) for skill, _ in order], hours_per_week)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def timed(function, cases):
+    latencies = []
+    for case in cases:
+        started = time.perf_counter()
+        function(*case)
+        latencies.append(time.perf_counter() - started)
+    return percentile(latencies, 0.5) * 1000, percentile(latencies, 0.99) * 1000
+
+
+def main(nodes, users):
+    rng = random.Random(11)
+    prerequisites, hours = make_graph(nodes)
+    started = time.perf_counter()
+    graph = SkillGraph(prerequisites, hours)
+    assert graph.find_cycle() is None
+    print(f"{nodes} skills: graph built and checked for cycles in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    names = [f"skill {index}" for index in range(nodes)]
+    print(f"{'goals':>6} {'skills planned':>15} {'naive p50':>10} {'p99':>8} {'schedule p50':>13} {'p99':>8}")
+    for goal_count in GOAL_COUNTS:
+        cases = []
+        for _ in range(users):
+            covered = set(rng.sample(names, nodes // 5))
+            goals = rng.sample([name for name in names if name not in covered], goal_count)
+            cases.append((goals, covered, rng.choice([5, 10, 15, 20])))
+        planned = sum(len(needed_skills(prerequisites, goals, covered)) for goals, covered, _ in cases) // users
+        naive = timed(lambda goals, covered, budget: naive_schedule(prerequisites, hours, goals, covered, budget),
+                      cases[:max(1, users // 10)])
+        fast = timed(lambda goals, covered, budget: fast_schedule(graph, goals, covered, budget), cases)
+        print(f"{goal_count:>6} {planned:>15} {naive[0]:>8.2f}ms {naive[1]:>6.2f}ms {fast[0]:>11.2f}ms {fast[1]:>6.2f}ms")
+
+    catalog = catalog_store.current
+    print("\nassemble_roadmap on the live catalog, nothing known, 15 hours/week")
+    for role in catalog.job_requirements:
+        started = time.perf_counter()
+        for _ in range(100):
+            roadmap = assemble_roadmap([], role, 15, catalog)
+        elapsed = (time.perf_counter() - started) / 100
+        print(f"  {role:<24} {elapsed * 1000:>6.2f}ms  {roadmap['total_days']:>4} days  {roadmap['total_hours']:>6g} hours")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,61 @@
+"""Serialization time and bytes on the wire of /api/roadmap bodies.
+
+Times turning one roadmap response into bytes the way FastAPI does for a
+returned dict (jsonable_encoder, then JSONResponse's json.dumps) against
+FastJSONResponse (orjson when installed, no encoder pass), and reports the
+size of the body uncompressed, gzipped and, when the brotli package is
+installed, brotli-compressed, with the compression time.
+
+Run from the backend folder:
+    python benchmarks/bench_serialization.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app import UserProfile, build_roadmap  # noqa: E402
+from responses import COMPRESSORS, FastJSONResponse, orjson  # noqa: E402
+
+PROFILE = UserProfile(
+    resume_text="Data analyst: Python, SQL, Excel, Tableau and some scikit-learn.",
+    dream_role="ml_engineer",
+    hours_per_week=10,
+    current_skills=["git"],
+)
+
+
+def per_call_us(function, iterations):
+    function()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run(iterations):
+    result = build_roadmap(PROFILE)
+    result["roadmap_id"] = "0" * 32
+
+    print(f"serializer: {'orjson' if orjson is not None else 'json (orjson not installed)'}")
+    default = per_call_us(lambda: JSONResponse(jsonable_encoder(result)).body, iterations)
+    fast = per_call_us(lambda: FastJSONResponse(result).body, iterations)
+    print(f"{'jsonable_encoder + JSONResponse':<34} {default:>8.1f} us")
+    print(f"{'FastJSONResponse':<34} {fast:>8.1f} us   ({default / fast:.1f}x)")
+
+    print()
+    body = FastJSONResponse(result).body
+    print(f"{'encoding':<9} {'bytes':>7} {'compress':>10}")
+    print(f"{'identity':<9} {len(body):>7}")
+    for encoding, compress in COMPRESSORS.items():
+        elapsed = per_call_us(lambda: compress(body), max(1, iterations // 10))
+        print(f"{encoding:<9} {len(compress(body)):>7} {elapsed:>7.1f} us")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,76 @@
+"""Compare the compiled skill matcher with the old per-skill substring scan.
+
+Run from the backend folder:
+    python benchmarks/bench_skill_matcher.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import catalog_store, extract_skills_from_text  # noqa: E402
+
+all_skills = catalog_store.current.all_skills
+skill_synonyms = catalog_store.current.skill_synonyms
+
+SAMPLE_PARAGRAPH = (
+    "Senior software engineer with 5 years of experience building data platforms. "
+    "Developed REST APIs in Python 3 and Node.js, deployed with Docker and k8s on AWS. "
+    "Designed dashboards with Grafana, maintained CI pipelines in GitLab CI and Jenkins. "
+    "Worked on machine learning models using PyTorch and scikit-learn; results were "
+    "presented to stakeholders during sprint reviews. Strong communication skills.\n"
+)
+
+
+def legacy_extract_skills_from_text(text):
+    """The substring scan extract_skills_from_text used before the compiled matcher"""
+    text = text.lower()
+    found_skills = set()
+    for skill in all_skills:
+        skill_lower = skill.lower()
+        if skill_lower in text:
+            found_skills.add(skill)
+            continue
+        if skill in skill_synonyms:
+            for synonym in skill_synonyms[skill]:
+                if synonym.lower() in text:
+                    found_skills.add(skill)
+                    break
+
+    action_words = ['built', 'developed', 'created', 'designed', 'implemented', 'worked', 'used', 'experienced']
+    tech_terms = text.split()
+    for i, word in enumerate(tech_terms):
+        if word in action_words and i + 1 < len(tech_terms):
+            next_words = ' '.join(tech_terms[i+1:min(i+5, len(tech_terms))])
+            for skill in all_skills:
+                if skill.lower() in next_words.lower():
+                    found_skills.add(skill)
+    return list(found_skills)
+
+
+def make_resume(size):
+    """Repeat the sample paragraph until the text is size bytes long"""
+    repeats = size // len(SAMPLE_PARAGRAPH) + 1
+    return (SAMPLE_PARAGRAPH * repeats)[:size]
+
+
+def best_time(func, text, number):
+    return min(timeit.repeat(lambda: func(text), number=number, repeat=5)) / number
+
+
+def main():
+    print(f"{'size':>8} {'legacy (ms)':>12} {'compiled (ms)':>14} {'speedup':>8} {'legacy hits':>12} {'compiled hits':>14}")
+    for size in (1_000, 10_000, 100_000):
+        text = make_resume(size)
+        number = max(1, 200_000 // size)
+        legacy = best_time(legacy_extract_skills_from_text, text, number)
+        compiled = best_time(extract_skills_from_text, text, number)
+        print(
+            f"{size // 1000:>6}KB {legacy * 1000:>12.3f} {compiled * 1000:>14.3f} {legacy / compiled:>7.1f}x "
+            f"{len(legacy_extract_skills_from_text(text)):>12} {len(extract_skills_from_text(text)):>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
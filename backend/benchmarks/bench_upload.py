@@ -0,0 +1,80 @@
+"""Peak Python memory of one resume upload: multipart vs base64 JSON vs raw body.
+
+Each endpoint gets the same file, streamed to the app in 64 KB chunks the
+way a socket delivers it, through httpx's in-process ASGI transport. The
+request bodies are built before measuring; tracemalloc reports the peak
+of what the server allocated while handling the request. The file is
+random bytes that no extractor accepts, so the numbers cover the upload
+path only (PDF/DOCX parsing runs in the worker processes either way).
+
+Run from the backend folder:
+    python benchmarks/bench_upload.py [megabytes ...]
+"""
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Every upload is rejected as an unsupported type; keep those warnings out of the table
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("UPLOAD_MAX_BYTES", str(64 * 1024 * 1024))
+
+import httpx  # noqa: E402
+
+from app import app  # noqa: E402
+
+CHUNK = 64 * 1024
+
+
+def request_bodies(content):
+    """(label, url, headers, body) for each way of sending the file"""
+    multipart = httpx.Request("POST", "http://bench", files={"file": ("resume.bin", content)})
+    multipart.read()
+    payload = json.dumps({"filename": "resume.bin", "content_base64": base64.b64encode(content).decode()})
+    return [
+        ("multipart /api/extract-resume", "/api/extract-resume",
+         {"Content-Type": multipart.headers["Content-Type"]}, multipart.content),
+        ("base64 /api/extract-resume-base64", "/api/extract-resume-base64",
+         {"Content-Type": "application/json"}, payload.encode()),
+        ("raw /api/extract-resume-raw", "/api/extract-resume-raw?filename=resume.bin",
+         {"Content-Type": "application/octet-stream"}, content),
+    ]
+
+
+async def chunked(body):
+    view = memoryview(body)
+    for start in range(0, len(body), CHUNK):
+        yield bytes(view[start:start + CHUNK])
+
+
+async def measure(client, url, headers, body):
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = await client.post(url, content=chunked(body), headers=headers)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert response.status_code == 200, response.text
+    return peak, elapsed
+
+
+async def run(sizes_mb):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'':<36} {'file':>7} {'body':>8} {'peak':>9} {'time':>9}")
+        for size_mb in sizes_mb:
+            content = b"\x00" + os.urandom(int(size_mb * 2**20) - 1)
+            for label, url, headers, body in request_bodies(content):
+                # Warm up once so imports and first-call caches are not counted
+                await measure(client, url, headers, body)
+                peak, elapsed = await measure(client, url, headers, body)
+                print(f"{label:<36} {size_mb:>5g}MB {len(body) / 2**20:>6.1f}MB "
+                      f"{peak / 2**20:>7.2f}MB {elapsed * 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(run([float(arg) for arg in sys.argv[1:]] or [1, 8]))
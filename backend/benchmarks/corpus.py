@@ -0,0 +1,143 @@
+"""Synthetic resume corpus for the benchmark suite.
+
+Resumes are built from the live catalog's skills and synonyms mixed into
+experience bullets and filler prose, at a few target lengths, and written
+as TXT, PDF and DOCX. The same seed always gives the same corpus. The PDF
+writer is a minimal one-font text PDF, so no extra dependency is needed.
+
+Run from the backend folder to write a corpus to a folder:
+    python benchmarks/corpus.py OUTPUT_DIR
+"""
+import os
+import random
+import sys
+import textwrap
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Target length in words; a one-page resume is about 400
+SIZES = {"small": 250, "medium": 1200, "large": 6000}
+FORMATS = ("txt", "pdf", "docx")
+
+BULLETS = [
+    "Built {a} services with {b}, cutting response times by {n}%.",
+    "Developed internal tools in {a} and {b} used by {n} engineers.",
+    "{n} years of experience with {a}; led the migration from {b}.",
+    "Proficient in {a}, with production work in {b}.",
+    "Designed a reporting pipeline using {a}, {b} and scheduled jobs.",
+    "Mentored {n} junior developers on {a} best practices.",
+]
+FILLER = [
+    "Worked closely with product and design to ship features on a two-week cadence.",
+    "Wrote documentation, ran onboarding sessions and reviewed pull requests.",
+    "Presented quarterly results to stakeholders and planned the next roadmap.",
+    "Improved test coverage and set up monitoring for the team's services.",
+    "Collaborated with customers to gather requirements and prioritize fixes.",
+]
+
+
+def resume_text(rng, aliases, words):
+    """One resume of roughly `words` words mentioning skills from `aliases`"""
+    lines = [
+        f"Candidate {rng.randint(1000, 9999)}",
+        "Summary",
+        f"Engineer with {rng.randint(1, 15)} years of experience across {rng.choice(aliases)} and {rng.choice(aliases)}.",
+        "Experience",
+    ]
+    count = sum(len(line.split()) for line in lines)
+    while count < words:
+        if rng.random() < 0.6:
+            line = rng.choice(BULLETS).format(a=rng.choice(aliases), b=rng.choice(aliases), n=rng.randint(2, 40))
+        else:
+            line = rng.choice(FILLER)
+        lines.append("- " + line)
+        count += len(line.split()) + 1
+    lines += ["Skills", ", ".join(rng.sample(aliases, min(12, len(aliases)))), "Education", "B.Sc. Computer Science"]
+    return "\n".join(lines)
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(text, path, lines_per_page=55, width=95):
+    """Write text as a simple PDF with one Helvetica text block per page"""
+    lines = [wrapped for paragraph in text.split("\n") for wrapped in (textwrap.wrap(paragraph, width) or [""])]
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
+
+    # 1: catalog, 2: page tree, 3: font, then a page and its content stream per page
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in pages:
+        stream = "BT /F1 10 Tf 13 TL 50 800 Td\n" + "".join(f"({_pdf_escape(line)}) Tj T*\n" for line in page) + "ET"
+        stream = stream.encode("latin-1", "replace")
+        objects.append(None)
+        page_ids.append(len(objects))
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects[page_ids[-1] - 1] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_ids[-1] + 1)
+        )
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_docx(text, path):
+    from docx import Document
+
+    document = Document()
+    for paragraph in text.split("\n"):
+        document.add_paragraph(paragraph)
+    document.save(path)
+
+
+def write_txt(text, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+WRITERS = {"txt": write_txt, "pdf": write_pdf, "docx": write_docx}
+
+
+def catalog_aliases():
+    from app import catalog_store
+
+    return sorted(catalog_store.current.skill_index)
+
+
+def generate_corpus(directory, variants=2, sizes=SIZES, formats=FORMATS, seed=7):
+    """Write variants x sizes x formats resumes to directory.
+
+    Returns a list of {"path", "format", "size", "words", "text"}, sorted
+    by name.
+    """
+    rng = random.Random(seed)
+    aliases = catalog_aliases()
+    os.makedirs(directory, exist_ok=True)
+    corpus = []
+    for size, words in sizes.items():
+        for variant in range(variants):
+            text = resume_text(rng, aliases, words)
+            for fmt in formats:
+                path = os.path.join(directory, f"resume_{size}_{variant}.{fmt}")
+                WRITERS[fmt](text, path)
+                corpus.append({"path": path, "format": fmt, "size": size, "words": len(text.split()), "text": text})
+    return corpus
+
+
+if __name__ == "__main__":
+    for entry in generate_corpus(sys.argv[1] if len(sys.argv) > 1 else "corpus"):
+        print(f"{entry['path']:<40} {entry['words']:>6} words {os.path.getsize(entry['path']):>9} bytes")
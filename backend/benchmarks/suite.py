@@ -0,0 +1,286 @@
+"""Offline benchmark suite with a regression check against a stored baseline.
+
+Everything runs in this process on a synthetic corpus (see corpus.py):
+  - microbenchmarks of extract_skills_from_text, find_skill_gaps and
+    assemble_roadmap, called directly
+  - load tests of /api/roadmap, /api/extract-resume and /api/adapt through
+    httpx's in-process ASGI transport, with N requests in flight at once
+
+Roadmap and extraction caches are disabled and progress goes to an
+in-memory store, so every request does the full work and nothing is
+written under data/. Each benchmark reports throughput and p50/p95/p99
+latency, from the median of --repeat runs. Results are written as JSON;
+with a baseline, the run fails (exit status 1) when a benchmark's p50 or
+p95 grows, its throughput drops, by more than the threshold, or it has
+more errors. Baselines depend on the machine, so save one on the machine
+that runs the check.
+
+Run from the backend folder:
+    python benchmarks/suite.py [--quick] [--concurrency 8] [--requests 300]
+    python benchmarks/suite.py --save-baseline
+    python benchmarks/suite.py --baseline benchmarks/baseline.json --threshold 0.25
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+# Keep per-request records out of the timings
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+# Measure parsing throughput, not load shedding: let every request wait for a parser
+os.environ.setdefault("EXTRACT_MAX_QUEUE", "1024")
+
+import httpx  # noqa: E402
+
+import app as app_module  # noqa: E402
+from app import (  # noqa: E402
+    UserProfile, app, assemble_roadmap, build_roadmap, catalog_store, collect_user_skills,
+    extract_skills_from_text, find_skill_gaps
+)
+from corpus import generate_corpus  # noqa: E402
+from progress_store import ProgressStore  # noqa: E402
+from roadmap_cache import TTLCache  # noqa: E402
+from text_cache import ExtractionCache  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results", "latest.json")
+# Compared with the baseline; p99 and the mean are reported only, they are too noisy to gate on
+GATED = {"p50_ms": "higher", "p95_ms": "higher", "throughput_per_s": "lower"}
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def median_run(runs):
+    """Of several runs of one benchmark, the one with the median p50"""
+    return sorted(runs, key=lambda result: result["p50_ms"])[len(runs) // 2]
+
+
+def summarize(latencies, elapsed, errors=0):
+    return {
+        "count": len(latencies),
+        "errors": errors,
+        "throughput_per_s": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 4),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+    }
+
+
+# ========== MICROBENCHMARKS ==========
+def micro(function, inputs, iterations):
+    """Call function(*args) for `iterations` inputs, cycling through them"""
+    for args in inputs[:3]:
+        function(*args)
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        args = inputs[i % len(inputs)]
+        call_started = time.perf_counter()
+        function(*args)
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def run_micro(corpus, iterations, repeat, rng):
+    catalog = catalog_store.current
+    roles = list(catalog.job_requirements)
+    results = {}
+    for size in sorted({entry["size"] for entry in corpus}):
+        texts = [(entry["text"],) for entry in corpus if entry["size"] == size and entry["format"] == "txt"]
+        results[f"micro.extract_skills.{size}"] = median_run(
+            [micro(extract_skills_from_text, texts, iterations) for _ in range(repeat)])
+
+    profiles = [
+        UserProfile(resume_text=entry["text"], dream_role=rng.choice(roles), current_skills=["python", "sql"])
+        for entry in corpus if entry["format"] == "txt"
+    ]
+    user_skills = [collect_user_skills(profile) for profile in profiles]
+    gap_inputs = [(catalog.job_requirements[profile.dream_role], skills) for profile, skills in zip(profiles, user_skills)]
+    results["micro.find_skill_gaps"] = median_run(
+        [micro(find_skill_gaps, gap_inputs, iterations) for _ in range(repeat)])
+
+    assemble_inputs = [
+        (skills, profile.dream_role, rng.choice([5, 10, 15, 20]), catalog)
+        for profile, skills in zip(profiles, user_skills)
+    ]
+    results["micro.assemble_roadmap"] = median_run(
+        [micro(assemble_roadmap, assemble_inputs, iterations) for _ in range(repeat)])
+    return results
+
+
+# ========== LOAD TESTS ==========
+async def load(client, requests, concurrency):
+    """Send requests [(method, url, kwargs)] with `concurrency` in flight"""
+    latencies = []
+    errors = 0
+    pending = iter(requests)
+
+    async def worker():
+        nonlocal errors
+        for method, url, kwargs in pending:
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code != 200 or not response.json().get("success", True)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+def load_requests(corpus, count, rng):
+    roles = list(catalog_store.current.job_requirements)
+    texts = [entry["text"] for entry in corpus if entry["format"] == "txt"]
+    uploads = {}
+    for entry in corpus:
+        with open(entry["path"], "rb") as f:
+            uploads[entry["path"]] = f.read()
+
+    roadmap = []
+    for _ in range(count):
+        roadmap.append(("POST", "/api/roadmap", {"json": {
+            "resume_text": rng.choice(texts),
+            "dream_role": rng.choice(roles),
+            "hours_per_week": rng.choice([5, 10, 15, 20]),
+            "current_skills": rng.sample(["python", "sql", "excel", "git", "docker"], 2),
+        }}))
+
+    extract = []
+    for _ in range(count):
+        entry = rng.choice(corpus)
+        extract.append(("POST", "/api/extract-resume", {
+            "files": {"file": (os.path.basename(entry["path"]), uploads[entry["path"]])}
+        }))
+
+    sample_roadmaps = [build_roadmap(UserProfile(dream_role=role))["roadmap"] for role in roles]
+    adapt = []
+    for _ in range(count):
+        current = rng.choice(sample_roadmaps)
+        task_ids = [task["id"] for week in current["weeks"] for task in week["tasks"]]
+        adapt.append(("POST", "/api/adapt", {"json": {
+            "completed_days": task_ids[:rng.randint(0, len(task_ids))],
+            "current_roadmap": current,
+        }}))
+    return {"load.roadmap": roadmap, "load.extract_resume": extract, "load.adapt": adapt}
+
+
+async def run_load(corpus, count, concurrency, repeat, rng):
+    requests = load_requests(corpus, count, rng)
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        for name, batch in requests.items():
+            # One untimed pass over a few requests warms imports and workers
+            await load(client, batch[:concurrency], concurrency)
+            runs = [await load(client, batch, concurrency) for _ in range(repeat)]
+            results[name] = {**median_run(runs), "concurrency": concurrency}
+    return results
+
+
+# ========== BASELINE CHECK ==========
+def compare(results, baseline, threshold):
+    """Regressions of results against baseline, as human-readable lines"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric, worse in GATED.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (worse == "higher" and change > threshold) or (worse == "lower" and -change > threshold):
+                regressions.append(f"{name} {metric}: {old} -> {new} ({change:+.0%})")
+        if current["errors"] > previous.get("errors", 0):
+            regressions.append(f"{name} errors: {previous.get('errors', 0)} -> {current['errors']}")
+    return regressions
+
+
+def print_table(results):
+    print(f"{'benchmark':<32} {'count':>6} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>6}")
+    for name, result in results.items():
+        print(f"{name:<32} {result['count']:>6} {result['throughput_per_s']:>9.1f} {result['p50_ms']:>9.3f} "
+              f"{result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f} {result['errors']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for a smoke run")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight during load tests")
+    parser.add_argument("--requests", type=int, default=300, help="requests per load test")
+    parser.add_argument("--iterations", type=int, default=2000, help="calls per microbenchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark; the median run is kept")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="results to compare against, if the file exists")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown, e.g. 0.25 = 25%%")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    args = parser.parse_args()
+    if args.quick:
+        args.requests, args.iterations, args.repeat = min(args.requests, 60), min(args.iterations, 200), 1
+
+    # Full work on every request, and nothing written to data/
+    app_module.roadmap_cache = TTLCache(max_entries=0)
+    app_module.profile_keys = TTLCache(max_entries=0)
+    app_module.extraction_cache = ExtractionCache(max_bytes=0, disk_path=None)
+    app_module.progress_store = ProgressStore(":memory:")
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        corpus = generate_corpus(workdir, seed=args.seed)
+        results = run_micro(corpus, args.iterations, args.repeat, rng)
+        results.update(asyncio.run(run_load(corpus, args.requests, args.concurrency, args.repeat, rng)))
+    app_module.parse_pool.shutdown()
+
+    print_table(results)
+    report = {
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "catalog_version": catalog_store.current.version,
+        "settings": {
+            "concurrency": args.concurrency, "requests": args.requests,
+            "iterations": args.iterations, "repeat": args.repeat
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) past {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"no regressions past {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,449 @@
+"""Role and skill catalog compiled to a read-only SQLite file.
+
+The source of truth is a JSON document (data/catalog.json) with
+job_requirements, learning_resources and skill_synonyms, plus the
+skill_prerequisites and skill_hours roadmaps are scheduled with. It is compiled
+once into a SQLite file where every string is stored once in an interned
+string table and everything else refers to it by id. The compiled file
+also carries the folded skill index and the rendered matcher regex, so a
+worker only has to re.compile it. Workers open the file read-only and
+memory-mapped, so its pages are shared through the OS page cache instead
+of being copied into each process; roles and learning resources are read
+on first use.
+
+Usage:
+    python catalog.py data/catalog.json data/catalog.db
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from functools import cached_property
+from urllib.parse import quote
+
+from role_ranker import RoleRanker
+from scheduler import SkillGraph
+from skill_matcher import SkillMatcher, build_skill_index, matcher_pattern
+
+# ========== CATALOG SETTINGS ==========
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CATALOG_SEED_PATH = os.environ.get("CATALOG_SEED_PATH", os.path.join(DATA_DIR, "catalog.json"))
+CATALOG_PATH = os.environ.get("CATALOG_PATH", os.path.join(DATA_DIR, "catalog.db"))
+# How often each worker checks whether the catalog file was replaced; 0 disables
+CATALOG_RELOAD_SECONDS = float(os.environ.get("CATALOG_RELOAD_SECONDS", "5"))
+
+# Bumped whenever the table layout, build_skill_index or matcher_pattern
+# changes; stored as PRAGMA user_version
+CATALOG_FORMAT = 2
+# Bumped whenever the layout of Catalog.client_bundle changes, together
+# with frontend/gap_preview.js
+CLIENT_BUNDLE_FORMAT = 1
+ROLE_FIELDS = ("required", "preferred", "projects")
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE strings (id INTEGER PRIMARY KEY, text TEXT NOT NULL);
+CREATE TABLE roles (position INTEGER PRIMARY KEY, role INTEGER NOT NULL);
+CREATE TABLE role_items (
+    role INTEGER NOT NULL, field INTEGER NOT NULL, position INTEGER NOT NULL, item INTEGER NOT NULL,
+    PRIMARY KEY (role, field, position)
+) WITHOUT ROWID;
+CREATE TABLE skills (skill INTEGER PRIMARY KEY);
+CREATE TABLE resources (skill INTEGER PRIMARY KEY, url INTEGER NOT NULL);
+CREATE TABLE synonyms (
+    skill INTEGER NOT NULL, position INTEGER NOT NULL, alias INTEGER NOT NULL,
+    PRIMARY KEY (skill, position)
+) WITHOUT ROWID;
+CREATE TABLE aliases (
+    alias INTEGER NOT NULL, skill INTEGER NOT NULL,
+    PRIMARY KEY (alias, skill)
+) WITHOUT ROWID;
+CREATE TABLE prerequisites (
+    skill INTEGER NOT NULL, position INTEGER NOT NULL, prerequisite INTEGER NOT NULL,
+    PRIMARY KEY (skill, position)
+) WITHOUT ROWID;
+CREATE TABLE efforts (skill INTEGER PRIMARY KEY, hours REAL NOT NULL);
+"""
+
+
+class CatalogError(Exception):
+    """Raised when a catalog file is missing, malformed or of another format version"""
+
+
+# ========== COMPILING ==========
+def catalog_version(source):
+    """Content hash of a catalog source, so every worker agrees on what it serves"""
+    canonical = json.dumps(source, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def compile_catalog(source, path):
+    """Write a catalog source dict to path as a compiled SQLite catalog.
+
+    The file is built next to its destination and renamed over it, so
+    readers only ever see a complete catalog.
+    """
+    job_requirements = source["job_requirements"]
+    learning_resources = source.get("learning_resources", {})
+    skill_synonyms = source.get("skill_synonyms", {})
+    skill_prerequisites = source.get("skill_prerequisites", {})
+    skill_hours = source.get("skill_hours", {})
+
+    cycle = SkillGraph(skill_prerequisites, skill_hours).find_cycle()
+    if cycle:
+        raise CatalogError(f"Prerequisite cycle: {' -> '.join(cycle)}")
+
+    # Every skill a role asks for, a resource teaches or another skill needs first
+    all_skills = {skill for data in job_requirements.values() for skill in data["required"] + data["preferred"]}
+    all_skills.update(learning_resources)
+    all_skills.update(skill_prerequisites)
+    all_skills.update(skill for before in skill_prerequisites.values() for skill in before)
+
+    strings = {}
+
+    def intern(text):
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+
+    role_rows = [(position, intern(role)) for position, role in enumerate(job_requirements)]
+    item_rows = [
+        (intern(role), field, position, intern(item))
+        for role, data in job_requirements.items()
+        for field, name in enumerate(ROLE_FIELDS)
+        for position, item in enumerate(data.get(name, []))
+    ]
+    skill_rows = [(intern(skill),) for skill in sorted(all_skills)]
+    resource_rows = [(intern(skill), intern(url)) for skill, url in learning_resources.items()]
+    synonym_rows = [
+        (intern(skill), position, intern(alias))
+        for skill, aliases in skill_synonyms.items()
+        for position, alias in enumerate(aliases)
+    ]
+    prerequisite_rows = [
+        (intern(skill), position, intern(before))
+        for skill, prerequisites in skill_prerequisites.items()
+        for position, before in enumerate(prerequisites)
+    ]
+    effort_rows = [(intern(skill), float(hours)) for skill, hours in skill_hours.items()]
+    skill_index = build_skill_index(sorted(all_skills) + list(skill_synonyms), skill_synonyms)
+    alias_rows = [(intern(alias), intern(skill)) for alias, skills in skill_index.items() for skill in skills]
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    if os.path.exists(temp_path):
+        os.unlink(temp_path)
+
+    db = sqlite3.connect(temp_path)
+    try:
+        db.executescript(SCHEMA)
+        db.executemany("INSERT INTO strings (id, text) VALUES (?, ?)", ((i, s) for s, i in strings.items()))
+        db.executemany("INSERT INTO roles VALUES (?, ?)", role_rows)
+        db.executemany("INSERT INTO role_items VALUES (?, ?, ?, ?)", item_rows)
+        db.executemany("INSERT INTO skills VALUES (?)", skill_rows)
+        db.executemany("INSERT INTO resources VALUES (?, ?)", resource_rows)
+        db.executemany("INSERT INTO synonyms VALUES (?, ?, ?)", synonym_rows)
+        db.executemany("INSERT INTO aliases VALUES (?, ?)", alias_rows)
+        db.executemany("INSERT INTO prerequisites VALUES (?, ?, ?)", prerequisite_rows)
+        db.executemany("INSERT INTO efforts VALUES (?, ?)", effort_rows)
+        db.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("version", catalog_version(source)),
+            ("matcher_pattern", matcher_pattern(skill_index)),
+            ("compiled_at", str(time.time())),
+            ("roles", str(len(role_rows))),
+            ("skills", str(len(skill_rows))),
+        ])
+        db.execute(f"PRAGMA user_version = {CATALOG_FORMAT}")
+        db.commit()
+        db.execute("VACUUM")
+    finally:
+        db.close()
+    os.replace(temp_path, path)
+
+
+def compile_catalog_file(seed_path, path):
+    with open(seed_path, encoding="utf-8") as f:
+        compile_catalog(json.load(f), path)
+
+
+def compiled_format(path):
+    """CATALOG_FORMAT a compiled catalog file was written with, or None if unreadable"""
+    try:
+        db = sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True)
+        try:
+            return db.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            db.close()
+    except sqlite3.Error:
+        return None
+
+
+def ensure_compiled(seed_path=CATALOG_SEED_PATH, path=CATALOG_PATH):
+    """Compile the seed JSON when the catalog file is missing, older than it or of another format"""
+    if not seed_path or not os.path.exists(seed_path):
+        return
+    if (not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(seed_path)
+            or compiled_format(path) != CATALOG_FORMAT):
+        compile_catalog_file(seed_path, path)
+
+
+# ========== READING ==========
+class _LazyTable(Mapping):
+    """Read-only mapping that runs a query on first access to each key"""
+
+    def __init__(self, ids, load):
+        self._ids = ids
+        self._load = load
+        self._loaded = {}
+
+    def __getitem__(self, key):
+        value = self._loaded.get(key)
+        if value is None:
+            value = self._loaded[key] = self._load(self._ids[key])
+        return value
+
+    def load_all(self):
+        """Run the query of every key not loaded yet"""
+        for key in self._ids:
+            self[key]
+
+    def __contains__(self, key):
+        return key in self._ids
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+
+class Catalog:
+    """One compiled catalog file, opened read-only and memory-mapped.
+
+    Exposes the same shapes the app has always used: job_requirements
+    (role -> {"required", "preferred", "projects"}), learning_resources
+    (skill -> url), skill_synonyms and all_skills, plus the skill_index
+    and skill_matcher built from them. The role_ranker that scores every
+    role at once and the skill_graph roadmaps are scheduled with are built
+    on first use.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            raise CatalogError(f"Catalog not found: {path}") from e
+        self.file_id = (stat.st_ino, stat.st_mtime_ns)
+        self.size_bytes = stat.st_size
+
+        self._db = self._connect()
+        self._lock = threading.Lock()
+        try:
+            format_version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            if format_version != CATALOG_FORMAT:
+                raise CatalogError(f"Catalog format {format_version} is not supported (expected {CATALOG_FORMAT})")
+            self.meta = dict(self._db.execute("SELECT key, value FROM meta WHERE key != 'matcher_pattern'"))
+            self.version = self.meta["version"]
+
+            # name -> string id; the ids are what the lazy tables query by
+            role_ids = dict(self._db.execute(
+                "SELECT s.text, r.role FROM roles r JOIN strings s ON s.id = r.role ORDER BY r.position"))
+            resource_ids = dict(self._db.execute(
+                "SELECT s.text, r.skill FROM resources r JOIN strings s ON s.id = r.skill"))
+            self.all_skills = [row[0] for row in self._db.execute(
+                "SELECT s.text FROM skills k JOIN strings s ON s.id = k.skill")]
+
+            self.skill_synonyms = {}
+            for skill, alias in self._db.execute(
+                    "SELECT s.text, a.text FROM synonyms y JOIN strings s ON s.id = y.skill "
+                    "JOIN strings a ON a.id = y.alias ORDER BY y.skill, y.position"):
+                self.skill_synonyms.setdefault(skill, []).append(alias)
+
+            covered = {}
+            for alias, skill in self._db.execute(
+                    "SELECT a.text, s.text FROM aliases x JOIN strings a ON a.id = x.alias "
+                    "JOIN strings s ON s.id = x.skill"):
+                covered.setdefault(alias, []).append(skill)
+            pattern = self._db.execute("SELECT value FROM meta WHERE key = 'matcher_pattern'").fetchone()[0]
+        except sqlite3.DatabaseError as e:
+            self._db.close()
+            raise CatalogError(f"Unreadable catalog {path}: {e}") from e
+
+        self.job_requirements = _LazyTable(role_ids, self._load_role)
+        self.learning_resources = _LazyTable(resource_ids, self._load_resource)
+        self.skill_index = {alias: frozenset(skills) for alias, skills in covered.items()}
+        self.skill_matcher = SkillMatcher(self.skill_index, pattern)
+
+    def _connect(self):
+        # immutable=1: the file is never written in place (new versions are
+        # renamed over it), so SQLite can skip locking entirely
+        db = sqlite3.connect(f"file:{quote(self.path)}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+        db.execute(f"PRAGMA mmap_size = {max(self.size_bytes, 1 << 20)}")
+        return db
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def reconnect(self):
+        """Open a fresh connection, e.g. in a worker forked after the catalog was loaded.
+
+        SQLite connections must not be used across fork(); everything else
+        the catalog holds (index, matcher, loaded roles) stays shared.
+        """
+        with self._lock:
+            self._db = self._connect()
+
+    def _query(self, sql, params):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _load_role(self, role_id):
+        requirements = {field: [] for field in ROLE_FIELDS}
+        rows = self._query(
+            "SELECT i.field, s.text FROM role_items i JOIN strings s ON s.id = i.item "
+            "WHERE i.role = ? ORDER BY i.field, i.position",
+            (role_id,)
+        )
+        for field, item in rows:
+            requirements[ROLE_FIELDS[field]].append(item)
+        return requirements
+
+    def _load_resource(self, skill_id):
+        return self._query(
+            "SELECT u.text FROM resources r JOIN strings u ON u.id = r.url WHERE r.skill = ?",
+            (skill_id,)
+        )[0][0]
+
+    def role_skills(self):
+        """(role, required, preferred) for every role, read in one query"""
+        # Fields 0 and 1 of ROLE_FIELDS; projects are not skills
+        skills = {}
+        for role, field, item in self._query(
+                "SELECT r.text, i.field, s.text FROM role_items i JOIN strings r ON r.id = i.role "
+                "JOIN strings s ON s.id = i.item WHERE i.field < 2 ORDER BY i.role, i.field, i.position",
+                ()):
+            skills.setdefault(role, ([], []))[field].append(item)
+        return [(role, *skills.get(role, ([], []))) for role in self.job_requirements]
+
+    @cached_property
+    def role_ranker(self):
+        return RoleRanker(self.role_skills())
+
+    @cached_property
+    def skill_graph(self):
+        prerequisites = {}
+        for skill, before in self._query(
+                "SELECT s.text, b.text FROM prerequisites p JOIN strings s ON s.id = p.skill "
+                "JOIN strings b ON b.id = p.prerequisite ORDER BY p.skill, p.position",
+                ()):
+            prerequisites.setdefault(skill, []).append(before)
+        hours = dict(self._query("SELECT s.text, e.hours FROM efforts e JOIN strings s ON s.id = e.skill", ()))
+        return SkillGraph(prerequisites, hours)
+
+    @cached_property
+    def client_bundle(self):
+        """What a browser needs to compute skill gaps exactly as the server does.
+
+        The matcher regex, the folded skill index and each role's required
+        and preferred skills in order; see frontend/gap_preview.js.
+        """
+        return {
+            "format": CLIENT_BUNDLE_FORMAT,
+            "version": self.version,
+            "pattern": self.skill_matcher.pattern,
+            "aliases": {alias: sorted(skills) for alias, skills in sorted(self.skill_index.items())},
+            "roles": {role: [required, preferred] for role, required, preferred in self.role_skills()},
+        }
+
+    def stats(self):
+        return {
+            "version": self.version,
+            "path": self.path,
+            "size_bytes": self.size_bytes,
+            "roles": len(self.job_requirements),
+            "skills": len(self.all_skills),
+            "aliases": len(self.skill_index),
+            "roles_loaded": len(self.job_requirements._loaded),
+        }
+
+
+class CatalogStore:
+    """Holds the live catalog and swaps in a new one when its file is replaced.
+
+    Readers take `store.current` once per request and use that object
+    throughout, so a reload never mixes two catalogs in one response. A
+    background thread polls the file's inode and mtime every `interval`
+    seconds; the replacement catalog (including its skill matcher) is
+    built on that thread and published with a single assignment.
+    """
+
+    def __init__(self, path=CATALOG_PATH, seed_path=CATALOG_SEED_PATH, interval=CATALOG_RELOAD_SECONDS):
+        self.path = path
+        self.seed_path = seed_path
+        self.interval = interval
+        self.reloads = 0
+        self.last_error = None
+        self._listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+        ensure_compiled(seed_path, path)
+        self.current = Catalog(path)
+
+    def on_reload(self, callback):
+        """Call callback(new_catalog) after every successful reload"""
+        self._listeners.append(callback)
+
+    def changed(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns) != self.current.file_id
+
+    def reload(self):
+        """Load the catalog file again and publish it; the old one stays live on failure"""
+        try:
+            catalog = Catalog(self.path)
+        except CatalogError as e:
+            self.last_error = str(e)
+            raise
+        self.current = catalog
+        self.reloads += 1
+        self.last_error = None
+        for callback in self._listeners:
+            callback(catalog)
+        return catalog
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            if self.changed():
+                try:
+                    self.reload()
+                except CatalogError:
+                    pass
+
+    def start_watching(self):
+        if self.interval > 0 and self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="catalog-watch", daemon=True)
+            self._thread.start()
+
+    def stop_watching(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python catalog.py SOURCE.json CATALOG.db")
+    compile_catalog_file(sys.argv[1], sys.argv[2])
+    print(json.dumps(Catalog(sys.argv[2]).stats(), indent=2))
@@ -0,0 +1,41 @@
+import pytest
+
+import app as app_module
+from analysis_session import SessionStore
+from jobs import JobStore
+from progress_store import ProgressStore
+
+
+@pytest.fixture(autouse=True)
+def temp_progress_store(tmp_path_factory, monkeypatch):
+    """Roadmaps saved by the endpoints go to a throwaway file, not data/progress.db"""
+    store = ProgressStore(str(tmp_path_factory.mktemp("progress") / "progress.db"))
+    monkeypatch.setattr(app_module, "progress_store", store)
+    yield store
+    store.close()
+
+
+@pytest.fixture(autouse=True)
+def temp_profile_dir(tmp_path_factory, monkeypatch):
+    """Profiles of profiled requests go to a throwaway folder, not data/profiles"""
+    directory = str(tmp_path_factory.mktemp("profiles"))
+    monkeypatch.setattr(app_module.profile_store, "directory", directory)
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def temp_job_store(tmp_path_factory, monkeypatch):
+    """Job records go to a throwaway file, not data/jobs.db"""
+    store = JobStore(str(tmp_path_factory.mktemp("jobs") / "jobs.db"))
+    monkeypatch.setattr(app_module.job_queue, "store", store)
+    yield store
+    store.close()
+
+
+@pytest.fixture(autouse=True)
+def temp_session_store(tmp_path_factory, monkeypatch):
+    """Analysis session results go to a throwaway file, not data/analysis.db"""
+    store = SessionStore(str(tmp_path_factory.mktemp("analysis") / "analysis.db"))
+    monkeypatch.setattr(app_module, "session_store", store)
+    yield store
+    store.close()
@@ -0,0 +1,526 @@
+import asyncio
+import codecs
+import hashlib
+import importlib
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+
+from logging_setup import log_request
+from metrics import EXTRACT_BACKEND_FAILURES, EXTRACT_BACKEND_SECONDS, EXTRACT_FAILURES, EXTRACT_FALLBACKS
+from profiling import current_profile, profiled_call, stage
+
+# ========== EXTRACTION BUDGETS ==========
+# A resume is a handful of pages; anything past these budgets is not read
+EXTRACT_MAX_PAGES = int(os.environ.get("EXTRACT_MAX_PAGES", "50"))
+EXTRACT_MAX_CHARS = int(os.environ.get("EXTRACT_MAX_CHARS", "200000"))
+# Pages handed to one worker at a time; chunks of one PDF are parsed in parallel
+EXTRACT_PAGES_PER_CHUNK = int(os.environ.get("EXTRACT_PAGES_PER_CHUNK", "4"))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Largest raw-body upload accepted; checked while the body streams in
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+
+
+# ========== UPLOAD SPOOLING ==========
+async def spool_upload(upload, suffix=""):
+    """Copy an UploadFile to a temp file in fixed-size chunks.
+
+    Returns (path, sha256 hexdigest). The upload is hashed while it is
+    copied, so it is never held in memory as a whole. The caller deletes
+    the file.
+    """
+    hasher = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as spool:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            spool.write(chunk)
+    return spool.name, hasher.hexdigest()
+
+
+class UploadTooLarge(Exception):
+    """Raised when a streamed upload goes past its size limit"""
+
+
+async def spool_stream(chunks, suffix="", max_bytes=UPLOAD_MAX_BYTES):
+    """Write an async iterator of body chunks to a temp file as they arrive.
+
+    Returns (path, sha256 hexdigest). Each chunk is hashed and written,
+    then dropped, so memory stays at one network chunk whatever the file
+    size. Raises UploadTooLarge (and removes the partial file) as soon as
+    more than max_bytes have been received.
+    """
+    hasher = hashlib.sha256()
+    received = 0
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as spool:
+        try:
+            async for chunk in chunks:
+                received += len(chunk)
+                if received > max_bytes:
+                    raise UploadTooLarge(f"Upload is larger than {max_bytes} bytes")
+                hasher.update(chunk)
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            os.unlink(spool.name)
+            raise
+    return spool.name, hasher.hexdigest()
+
+
+def spool_bytes(content, suffix=""):
+    """Write in-memory upload bytes to a temp file; returns (path, sha256 hexdigest)"""
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as spool:
+        spool.write(content)
+    return spool.name, hashlib.sha256(content).hexdigest()
+
+
+# ========== FORMAT SNIFFING ==========
+SNIFF_BYTES = 4096
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+# Byte order marks of text encodings; UTF-32 before UTF-16, whose LE mark it starts with
+TEXT_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def text_encoding(head):
+    """Encoding named by a byte order mark at the start of head, else UTF-8"""
+    for bom, encoding in TEXT_BOMS:
+        if head.startswith(bom):
+            return encoding
+    return "utf-8"
+
+
+def sniff_format(path):
+    """Detect a document's format from its first bytes rather than its name.
+
+    Returns "pdf", "docx", "txt", "doc" for legacy Word files (which
+    python-docx cannot read) or None for anything else.
+    """
+    with open(path, "rb") as f:
+        head = f.read(SNIFF_BYTES)
+
+    # Text with a byte order mark first: UTF-16 is full of NUL bytes
+    if any(head.startswith(bom) for bom, _ in TEXT_BOMS):
+        return "txt"
+    # The PDF header may be preceded by junk within the first kilobyte
+    if PDF_MAGIC in head[:1024]:
+        return "pdf"
+    if head.startswith(OLE_MAGIC):
+        return "doc"
+    if head.startswith(ZIP_MAGIC):
+        try:
+            with zipfile.ZipFile(path) as archive:
+                archive.getinfo("word/document.xml")
+            return "docx"
+        except (KeyError, zipfile.BadZipFile):
+            return None
+    if head and b"\x00" not in head:
+        return "txt"
+    return None
+
+
+# ========== EXTRACTOR REGISTRY ==========
+# format -> [(backend name, function)], tried in order until one succeeds.
+# Every backend takes (path, start, stop) and yields the text of pages
+# [start, stop); formats without pages yield a single "page".
+EXTRACTORS = {}
+
+# Cheapest first: PyPDF2 reads the text layer directly, pdfplumber runs a
+# full layout analysis and is only needed when PyPDF2 comes back sparse
+EXTRACT_PDF_BACKENDS = os.environ.get("EXTRACT_PDF_BACKENDS", "PyPDF2,pdfplumber").split(",")
+# Average characters per page below which the next PDF backend is tried
+EXTRACT_PDF_MIN_CHARS_PER_PAGE = int(os.environ.get("EXTRACT_PDF_MIN_CHARS_PER_PAGE", "20"))
+
+# Formats cheap enough to extract on a thread instead of the parse pool
+INLINE_FORMATS = {"txt"}
+
+
+def register_extractor(fmt, name):
+    """Decorator adding a page-text backend for fmt to the registry"""
+    def register(func):
+        backends = EXTRACTORS.setdefault(fmt, [])
+        backends.append((name, func))
+        if fmt == "pdf":
+            order = {backend: i for i, backend in enumerate(EXTRACT_PDF_BACKENDS)}
+            backends.sort(key=lambda backend: order.get(backend[0], len(order)))
+        return func
+    return register
+
+
+@register_extractor("pdf", "PyPDF2")
+def _pypdf2_pages(path, start, stop):
+    import PyPDF2
+    reader = PyPDF2.PdfReader(path)
+    for number in range(start, min(stop, len(reader.pages))):
+        yield reader.pages[number].extract_text()
+
+
+@register_extractor("pdf", "pdfplumber")
+def _pdfplumber_pages(path, start, stop):
+    import pdfplumber
+    with pdfplumber.open(path, pages=list(range(start + 1, stop + 1))) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text()
+            # Drop the cached layout objects before moving to the next page
+            page.close()
+            yield text
+
+
+@register_extractor("docx", "python-docx")
+def _docx_pages(path, start, stop):
+    from docx import Document
+    doc = Document(path)
+    yield "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
+
+
+@register_extractor("txt", "text")
+def _text_pages(path, start, stop):
+    with open(path, "rb") as f:
+        content = f.read()
+    yield content.decode(text_encoding(content), errors="ignore")
+
+
+# ========== BACKEND STATS ==========
+# Backends run in pool workers, so they report their attempts back with the
+# result and the stats are kept here in the serving process
+backend_stats = {}
+
+
+def record_attempts(fmt, attempts):
+    if len(attempts) > 1:
+        EXTRACT_FALLBACKS.inc(fmt)
+    for name, seconds, ok in attempts:
+        stats = backend_stats.setdefault(name, {"calls": 0, "failures": 0, "seconds": 0.0})
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        EXTRACT_BACKEND_SECONDS.observe(seconds, name)
+        if not ok:
+            stats["failures"] += 1
+            EXTRACT_BACKEND_FAILURES.inc(name)
+
+
+def extractor_stats():
+    """Per-backend call counts, average latency and failure rate"""
+    return {
+        name: {
+            "calls": stats["calls"],
+            "failures": stats["failures"],
+            "failure_rate": round(stats["failures"] / stats["calls"], 4),
+            "avg_ms": round(stats["seconds"] / stats["calls"] * 1000, 2),
+        }
+        for name, stats in backend_stats.items()
+    }
+
+
+# ========== PAGE WORKERS ==========
+# These run inside the parse pool, so they take a file path rather than bytes
+
+def _current_rss():
+    """Resident set size of this process in bytes"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def page_count(fmt, path):
+    """Number of pages to extract; only PDFs have more than one"""
+    if fmt != "pdf":
+        return 1
+    try:
+        import PyPDF2
+        return len(PyPDF2.PdfReader(path).pages)
+    except Exception:
+        import pdfplumber
+        with pdfplumber.open(path) as pdf:
+            return len(pdf.pages)
+
+
+def extract_pages(fmt, path, start, stop, max_chars):
+    """Extract the text of pages [start, stop) with the registered backends.
+
+    Backends are tried in registry order. A PDF backend that succeeds but
+    finds almost no text is followed by the next one, whose result is used
+    if it finds more. Returns a dict with the page texts, the backend used,
+    when the first page finished (epoch seconds), the peak RSS seen while
+    parsing and every backend attempt, or with an "error".
+    """
+    peak_rss = _current_rss()
+    attempts = []
+    best = None
+    first_error = None
+
+    for name, backend in EXTRACTORS[fmt]:
+        attempt_started = time.perf_counter()
+        pages = []
+        chars = 0
+        first_page_at = None
+        try:
+            with stage(f"extract:{name}"):
+                for text in backend(path, start, stop):
+                    if first_page_at is None:
+                        first_page_at = time.time()
+                    peak_rss = max(peak_rss, _current_rss())
+                    if text:
+                        pages.append(text)
+                        chars += len(text)
+                        if chars >= max_chars:
+                            break
+        except Exception as e:
+            attempts.append((name, time.perf_counter() - attempt_started, False))
+            first_error = first_error or f"{name}: {str(e)[:100]}"
+            continue
+
+        attempts.append((name, time.perf_counter() - attempt_started, True))
+        if best is None or chars > best["chars"]:
+            best = {"pages": pages, "chars": chars, "backend": name, "first_page_at": first_page_at}
+        if fmt != "pdf" or chars >= EXTRACT_PDF_MIN_CHARS_PER_PAGE * (stop - start):
+            break
+
+    if best is None:
+        return {"error": first_error, "attempts": attempts}
+    return {
+        "pages": best["pages"],
+        "backend": best["backend"],
+        "first_page_at": best["first_page_at"],
+        "peak_rss_bytes": peak_rss,
+        "attempts": attempts,
+    }
+
+
+# ========== PARSER WARM-UP ==========
+# "eager" loads the parser libraries and starts the parse pool before the
+# server takes requests, "background" right after it starts (it reports not
+# ready until done), "lazy" leaves both to the first upload
+EXTRACT_PRELOAD = os.environ.get("EXTRACT_PRELOAD", "background")
+PRELOAD_MODES = ("eager", "background", "lazy")
+
+# Libraries the backends import on first use, by backend name
+PARSER_MODULES = {"PyPDF2": "PyPDF2", "pdfplumber": "pdfplumber", "python-docx": "docx"}
+
+
+def load_parsers():
+    """Import every parser library; returns {backend: import ms}, None for one not installed.
+
+    A library already imported costs nothing, so this is also run in each
+    pool worker to load what the worker did not inherit.
+    """
+    imports_ms = {}
+    for name, module in PARSER_MODULES.items():
+        started = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            imports_ms[name] = None
+            continue
+        imports_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+    return imports_ms
+
+
+class ParserWarmup:
+    """Loads the parser libraries and parse pool workers ahead of the first upload.
+
+    Without it the first PDF or DOCX a worker sees pays for starting the
+    pool and importing pdfplumber/pdfminer, PyPDF2 and python-docx. ready
+    is what /api/ready reports, so a load balancer can hold uploads back
+    from a worker that is still warming up. A failed warm-up is logged
+    and the worker still reports ready; uploads then load what they need.
+    """
+
+    def __init__(self, pool, mode=EXTRACT_PRELOAD):
+        if mode not in PRELOAD_MODES:
+            raise ValueError(f"EXTRACT_PRELOAD must be one of {', '.join(PRELOAD_MODES)}, not {mode!r}")
+        self.pool = pool
+        self.mode = mode
+        self.ready = mode == "lazy"
+        self.imports_ms = {}
+        self.duration_ms = None
+        self.error = None
+        self._task = None
+
+    def preload(self):
+        """Import the libraries in this process now, e.g. once before forking the server workers"""
+        if self.mode != "lazy":
+            self.imports_ms = load_parsers()
+        return self.imports_ms
+
+    async def warm_up(self):
+        started = time.perf_counter()
+        try:
+            # Off the event loop, so requests are still served during a background warm-up
+            self.imports_ms = await asyncio.get_running_loop().run_in_executor(None, load_parsers)
+            # Pool workers started now are forked with the libraries already loaded
+            await self.pool.start(load_parsers)
+        except Exception as e:
+            self.error = str(e)[:200]
+        self.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.ready = True
+        log_request(
+            "parsers_ready",
+            level=logging.WARNING if self.error else logging.INFO,
+            mode=self.mode,
+            duration_ms=self.duration_ms,
+            imports_ms=self.imports_ms,
+            pool=self.pool.kind,
+            pool_workers=self.pool.workers,
+            error=self.error
+        )
+
+    async def start(self):
+        """Run the warm-up as the mode says; call on server startup"""
+        if self.mode == "eager":
+            await self.warm_up()
+        elif self.mode == "background":
+            self._task = asyncio.create_task(self.warm_up())
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def wait(self):
+        """Return once a running warm-up is done; uploads wait here before using the pool"""
+        if self._task is not None and not self._task.done():
+            # Shielded: a cancelled upload must not cancel the warm-up
+            await asyncio.shield(self._task)
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "ready": self.ready,
+            "duration_ms": self.duration_ms,
+            "imports_ms": self.imports_ms,
+            "error": self.error,
+        }
+
+
+# ========== DOCUMENT EXTRACTION ==========
+def _extraction_failed(fmt, error):
+    EXTRACT_FAILURES.inc("backend_error")
+    backends = " and ".join(name for name, _ in EXTRACTORS[fmt])
+    return {
+        "success": False,
+        "error": f"{fmt.upper()} extraction failed. Tried {backends}. Errors: {error}",
+        "extracted_text": ""
+    }
+
+
+def _submit(slot, func, *args):
+    """Run func on the document's pool slot, or on a thread (slot None) for formats cheap enough to inline"""
+    if slot is None:
+        # Even a text file is read from disk, which must not stall the event loop
+        return asyncio.ensure_future(asyncio.to_thread(func, *args))
+    return slot.submit(func, *args)
+
+
+async def extract_document(pool, path, fmt, max_pages=EXTRACT_MAX_PAGES, max_chars=EXTRACT_MAX_CHARS,
+                           pages_per_chunk=EXTRACT_PAGES_PER_CHUNK):
+    """Extract a sniffed document in parallel page chunks on the parse pool.
+
+    Only the first max_pages pages are considered, and chunks still queued
+    once max_chars of text have been collected are cancelled. The response
+    carries metadata on pages parsed, truncation, backend, time to first
+    page and the peak worker RSS. The document takes one pool slot
+    (PoolSaturated if none is free), held until its last task returns.
+    """
+    slot = None if fmt in INLINE_FORMATS else pool.admit()
+    try:
+        return await _extract_admitted(slot, path, fmt, max_pages, max_chars, pages_per_chunk)
+    finally:
+        if slot is not None:
+            slot.close()
+
+
+async def _extract_admitted(slot, path, fmt, max_pages, max_chars, pages_per_chunk):
+    # A profiled request has its parse tasks profiled where they run, and merges them back in
+    profile = current_profile()
+
+    def submit(func, *args):
+        if profile is None:
+            return _submit(slot, func, *args)
+        return _submit(slot, profiled_call, profile.mode, func, *args)
+
+    collect = profile.merge if profile is not None else (lambda result: result)
+
+    started = time.time()
+    try:
+        total_pages = collect(await submit(page_count, fmt, path))
+    except Exception as e:
+        return _extraction_failed(fmt, str(e)[:100])
+    pages_to_parse = min(total_pages, max_pages)
+
+    chunks = [
+        submit(extract_pages, fmt, path, first, min(first + pages_per_chunk, pages_to_parse), max_chars)
+        for first in range(0, pages_to_parse, pages_per_chunk)
+    ]
+
+    page_texts = []
+    chars = 0
+    pages_parsed = 0
+    backends = set()
+    first_page_at = None
+    peak_rss = 0
+    truncated = total_pages > pages_to_parse
+    try:
+        for first, chunk in zip(range(0, pages_to_parse, pages_per_chunk), chunks):
+            result = collect(await chunk)
+            record_attempts(fmt, result["attempts"])
+            if "error" in result:
+                return _extraction_failed(fmt, result["error"])
+            backends.add(result["backend"])
+            peak_rss = max(peak_rss, result["peak_rss_bytes"])
+            if result["first_page_at"] is not None:
+                first_page_at = min(first_page_at or result["first_page_at"], result["first_page_at"])
+            pages_parsed = min(first + pages_per_chunk, pages_to_parse)
+            for text in result["pages"]:
+                page_texts.append(text)
+                chars += len(text) + 1
+            if chars >= max_chars:
+                truncated = True
+                break
+    finally:
+        for chunk in chunks:
+            chunk.cancel()
+
+    extracted_text = "\n".join(page_texts)[:max_chars]
+    if not extracted_text.strip():
+        EXTRACT_FAILURES.inc("no_text")
+        return {
+            "success": False,
+            "error": "No text could be extracted from the file. File may be corrupted or encrypted.",
+            "extracted_text": ""
+        }
+
+    return {
+        "success": True,
+        "extracted_text": extracted_text.strip(),
+        "metadata": {
+            "format": fmt,
+            "pages_total": total_pages,
+            "pages_parsed": pages_parsed,
+            "truncated": truncated,
+            "backend": "+".join(sorted(backends)),
+            "time_to_first_page_ms": round((first_page_at - started) * 1000, 1) if first_page_at else None,
+            "peak_rss_bytes": peak_rss,
+        }
+    }
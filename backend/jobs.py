@@ -0,0 +1,374 @@
+import asyncio
+import ipaddress
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import urllib.parse
+import urllib.request
+import uuid
+
+from metrics import JOB_SECONDS, JOBS_TOTAL
+
+# ========== JOB QUEUE SETTINGS ==========
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+# Jobs allowed to wait for a worker before new submissions are refused
+JOB_MAX_QUEUE = int(os.environ.get("JOB_MAX_QUEUE", "100"))
+# How long finished jobs (and their results) can still be polled
+JOB_TTL_SECONDS = float(os.environ.get("JOB_TTL_SECONDS", "3600"))
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+# Shared by all server processes (WEB_WORKERS), so any of them can answer for a job
+JOB_DB_PATH = os.environ.get("JOB_DB_PATH", os.path.join(DATA_DIR, "jobs.db"))
+JOB_CALLBACK_TIMEOUT_SECONDS = float(os.environ.get("JOB_CALLBACK_TIMEOUT_SECONDS", "10"))
+# Hosts callbacks may go to; when unset, any host resolving only to public addresses
+JOB_CALLBACK_HOSTS = {host.strip().lower() for host in os.environ.get("JOB_CALLBACK_HOSTS", "").split(",") if host.strip()}
+
+
+class QueueFull(Exception):
+    """Raised when JOB_MAX_QUEUE jobs are already waiting"""
+
+
+class CallbackRejected(ValueError):
+    """Raised for a callback_url the server will not POST to"""
+
+
+def check_callback_url(url):
+    """Raise CallbackRejected unless url may receive a job's result.
+
+    Without JOB_CALLBACK_HOSTS, the host is resolved and refused if any of
+    its addresses is loopback, private, link-local or otherwise not public,
+    so a callback cannot reach the server's own network. Blocking (DNS).
+    """
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise CallbackRejected("callback_url must be an http(s) URL")
+    host = parsed.hostname
+    if JOB_CALLBACK_HOSTS:
+        if host not in JOB_CALLBACK_HOSTS:
+            raise CallbackRejected(f"callback_url host {host} is not in JOB_CALLBACK_HOSTS")
+        return
+    try:
+        infos = socket.getaddrinfo(host, parsed.port or 80, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError, ValueError):
+        raise CallbackRejected(f"callback_url host {host} does not resolve")
+    for info in infos:
+        # Drop an IPv6 scope id ("fe80::1%eth0")
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if not address.is_global:
+            raise CallbackRejected(f"callback_url host {host} resolves to a non-public address")
+
+
+class Job:
+    def __init__(self, key, run):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.run = run
+        self.status = "queued"
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+
+
+class JobStore:
+    """Job records and their callbacks in SQLite (WAL), shared by all server processes.
+
+    Only the process that accepted a job runs it; the others read its
+    record, so GET /api/jobs/{id} and deduplication work whichever worker
+    a request lands on. Results are kept as JSON until JOB_TTL_SECONDS
+    after the job finished.
+    """
+
+    def __init__(self, path=JOB_DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        # Another process may hold the write lock for a moment
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, key TEXT NOT NULL, status TEXT NOT NULL, created REAL NOT NULL,"
+            "started REAL, finished REAL, result TEXT, error TEXT);"
+            "CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key);"
+            "CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished);"
+            # `status` is the callback's HTTP status or failure, NULL until posted
+            "CREATE TABLE IF NOT EXISTS job_callbacks ("
+            "job_id TEXT NOT NULL, url TEXT NOT NULL, status, added REAL NOT NULL,"
+            "PRIMARY KEY (job_id, url)) WITHOUT ROWID;"
+        )
+        self._db.commit()
+
+    def submit(self, job, callback_url=None, cutoff=0, room=True):
+        """Store job unless a live one has its key; returns (job id, deduplicated).
+
+        The existing job (not failed, not finished before cutoff) wins and
+        callback_url is attached to it while it is unfinished. Returns
+        (None, False) when there is no such job and no room to queue one.
+        """
+        with self._lock:
+            # One write transaction, so two processes cannot both insert the key
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id FROM jobs WHERE key = ? AND status != 'failed' AND (finished IS NULL OR finished > ?)"
+                    " ORDER BY created DESC LIMIT 1",
+                    (job.key, cutoff)
+                ).fetchone()
+                if row is not None:
+                    job_id, deduplicated = row[0], True
+                elif room:
+                    self._db.execute(
+                        "INSERT INTO jobs (id, key, status, created) VALUES (?, ?, ?, ?)",
+                        (job.id, job.key, job.status, job.created)
+                    )
+                    job_id, deduplicated = job.id, False
+                else:
+                    job_id, deduplicated = None, False
+                if job_id is not None and callback_url:
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO job_callbacks (job_id, url, added)"
+                        " SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM jobs WHERE id = ? AND finished IS NULL)",
+                        (job_id, callback_url, time.time(), job_id)
+                    )
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+        return job_id, deduplicated
+
+    def update(self, job):
+        """Write the job's status, timings and result"""
+        result = json.dumps(job.result, default=str) if job.result is not None else None
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, started = ?, finished = ?, result = ?, error = ? WHERE id = ?",
+                (job.status, job.started, job.finished, result, job.error, job.id)
+            )
+            self._db.commit()
+
+    def callbacks(self, job_id):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url FROM job_callbacks WHERE job_id = ? ORDER BY added", (job_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def set_callback_status(self, job_id, url, status):
+        with self._lock:
+            self._db.execute("UPDATE job_callbacks SET status = ? WHERE job_id = ? AND url = ?", (status, job_id, url))
+            self._db.commit()
+
+    def view(self, job_id, cutoff=0):
+        """The job as returned by GET /api/jobs/{id}; None if unknown or expired"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, created, started, finished, result, error FROM jobs"
+                " WHERE id = ? AND (finished IS NULL OR finished > ?)",
+                (job_id, cutoff)
+            ).fetchone()
+            if row is None:
+                return None
+            callbacks = self._db.execute(
+                "SELECT url, status FROM job_callbacks WHERE job_id = ? ORDER BY added", (job_id,)
+            ).fetchall()
+        status, created, started, finished, result, error = row
+        view = {
+            "job_id": job_id,
+            "status": status,
+            "created_at": round(created, 3),
+        }
+        if started is not None:
+            view["wait_ms"] = round((started - created) * 1000, 1)
+        if finished is not None:
+            view["run_ms"] = round((finished - started) * 1000, 1)
+        if status == "done":
+            view["result"] = json.loads(result)
+        if error is not None:
+            view["error"] = error
+        if callbacks:
+            # callback_url -> HTTP status or failure, None until posted
+            view["callback_status"] = dict(callbacks)
+        return view
+
+    def expire(self, cutoff):
+        """Delete jobs that finished before cutoff"""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM job_callbacks WHERE job_id IN (SELECT id FROM jobs WHERE finished <= ?)", (cutoff,)
+            )
+            self._db.execute("DELETE FROM jobs WHERE finished <= ?", (cutoff,))
+            self._db.commit()
+
+    def abandon_unfinished(self):
+        """Fail jobs left queued or running by a previous server; call before serving"""
+        with self._lock:
+            count = self._db.execute(
+                "UPDATE jobs SET status = 'failed', finished = ?, error = ? WHERE finished IS NULL",
+                (time.time(), "Server restarted before the job finished")
+            ).rowcount
+            self._db.commit()
+        return count
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class _NoRedirects(urllib.request.HTTPRedirectHandler):
+    # A redirect could point the POST at an address check_callback_url refuses
+    def redirect_request(self, *args):
+        return None
+
+
+_callback_opener = urllib.request.build_opener(_NoRedirects)
+
+
+def _post_json(url, payload):
+    # Checked again at send time: the host may resolve elsewhere by now
+    check_callback_url(url)
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    with _callback_opener.open(request, timeout=JOB_CALLBACK_TIMEOUT_SECONDS) as response:
+        return response.status
+
+
+class JobQueue:
+    """Job queue drained by a few asyncio worker tasks per server process.
+
+    No broker is involved: a job runs in the process that accepted it,
+    and is lost (marked failed by abandon_unfinished) if that process
+    stops first. Job records live in a JobStore shared by all processes.
+    Submissions carry a content key and a retry of the same work (same
+    file, same options) gets the existing job back instead of a new one,
+    unless that job failed. Each job's `run` is a coroutine function; CPU
+    heavy parts are expected to go to the parse pool or a thread.
+    """
+
+    def __init__(self, store=None, workers=JOB_WORKERS, max_queue=JOB_MAX_QUEUE, ttl=JOB_TTL_SECONDS):
+        self.store = store or JobStore()
+        self.workers = workers
+        self.max_queue = max_queue
+        self.ttl = ttl
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.deduplicated = 0
+        self._queue = None
+        self._tasks = []
+        self._loop = None
+
+    @property
+    def depth(self):
+        """Jobs waiting for a worker in this process"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _start_workers(self):
+        # Workers belong to the event loop serving requests; start them on first use
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    def _submit(self, job, callback_url, room):
+        cutoff = time.time() - self.ttl
+        self.store.expire(cutoff)
+        job_id, deduplicated = self.store.submit(job, callback_url, cutoff, room)
+        if job_id is None:
+            return None, False
+        return self.store.view(job_id), deduplicated
+
+    async def submit(self, key, run, callback_url=None):
+        """Queue run() under key; returns (job view, deduplicated).
+
+        A deduplicated submission's callback_url is attached to the existing
+        job if it is still unfinished; the view's callback_status lists the
+        callbacks that will be posted.
+        """
+        self._start_workers()
+        job = Job(json.dumps(key), run)
+        view, deduplicated = await asyncio.to_thread(self._submit, job, callback_url, self.depth < self.max_queue)
+        if view is None:
+            raise QueueFull(f"{self.depth} jobs already waiting")
+        if deduplicated:
+            self.deduplicated += 1
+            JOBS_TOTAL.inc("deduplicated")
+        else:
+            self._queue.put_nowait(job)
+        return view, deduplicated
+
+    def get(self, job_id):
+        """The view of a job accepted by any server process, or None"""
+        return self.store.view(job_id, time.time() - self.ttl)
+
+    async def _work(self):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started = time.time()
+            self.running += 1
+            JOB_SECONDS.observe(job.started - job.created, "wait")
+            try:
+                await asyncio.to_thread(self.store.update, job)
+                job.result = await job.run()
+                job.status = "done"
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"Error: {str(e)[:100]}"
+                self.failed += 1
+            finally:
+                job.finished = time.time()
+                job.run = None
+                self.running -= 1
+                self._queue.task_done()
+            JOB_SECONDS.observe(job.finished - job.started, "run")
+            JOBS_TOTAL.inc(job.status)
+
+            try:
+                # Finished first: no callback can be attached after this point
+                await asyncio.to_thread(self.store.update, job)
+                callback_urls = await asyncio.to_thread(self.store.callbacks, job.id)
+                payload = await asyncio.to_thread(self.store.view, job.id) if callback_urls else None
+            except sqlite3.Error:
+                continue
+            for callback_url in callback_urls:
+                try:
+                    status = await asyncio.to_thread(_post_json, callback_url, payload)
+                except Exception as e:
+                    status = f"failed: {str(e)[:100]}"
+                await asyncio.to_thread(self.store.set_callback_status, job.id, callback_url, status)
+
+    def stats(self):
+        return {
+            "queued": self.depth,
+            "running": self.running,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "failed": self.failed,
+            "deduplicated": self.deduplicated,
+            "retained": self.store.count(),
+        }
+
+    async def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
@@ -0,0 +1,112 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+# ========== LOGGING SETTINGS ==========
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# Fraction of successful requests that get a request record (errors are always kept)
+LOG_SAMPLE_RATE = float(os.environ.get("LOG_SAMPLE_RATE", "1.0"))
+# "json" for one JSON object per line, "text" for a readable console format
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")
+
+logger = logging.getLogger("career_navigator")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; structured fields come from extra={"fields": {...}}"""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        fields = " ".join(f"{key}={value}" for key, value in getattr(record, "fields", {}).items())
+        return f"{self.formatTime(record)} {record.levelname:<7} {record.getMessage()} {fields}".rstrip()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread.
+
+    The stock prepare() formats the record in the calling thread. Records
+    never leave this process, so the request path can hand the raw record
+    over and return.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+_listener = None
+_queue_handler = None
+
+
+def setup_logging():
+    """Route the app logger through a queue drained by a background thread"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return logger
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(log_queue)
+    logger.addHandler(_queue_handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    return logger
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread; setup_logging() may be called again"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        logger.removeHandler(_queue_handler)
+        _listener.stop()
+        _listener = None
+        _queue_handler = None
+
+
+def _forget_inherited_listener():
+    # A forked child gets the parent's handler but not its listener thread:
+    # records would pile up in a queue nobody drains, and setup_logging()
+    # would think logging is already set up
+    global _listener, _queue_handler
+    if _listener is not None:
+        logger.removeHandler(_queue_handler)
+        _listener = None
+        _queue_handler = None
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_inherited_listener)
+
+
+def sample_request():
+    """Decide once per request whether its INFO record is emitted"""
+    return LOG_SAMPLE_RATE >= 1.0 or random.random() < LOG_SAMPLE_RATE
+
+
+def log_request(event, sampled=True, level=logging.INFO, **fields):
+    """Emit the single structured record for a request"""
+    if (sampled or level >= logging.WARNING) and logger.isEnabledFor(level):
+        logger.log(level, event, extra={"fields": fields})
@@ -0,0 +1,206 @@
+"""Production server for the Career Navigator API.
+
+The app is imported and warmed up once in this process, then WEB_WORKERS
+worker processes are forked from it, all accepting on one listening
+socket. Because the fork happens after the catalog, skill index and
+compiled matcher are built, the workers share those pages copy-on-write
+instead of each building its own. uvloop and httptools are used when
+installed. SIGTERM or CTRL+C shuts the workers down gracefully: they stop
+accepting, finish in-flight requests for up to WEB_GRACEFUL_TIMEOUT_SECONDS
+and run the app's shutdown.
+
+Resume job records and analysis sessions are kept in SQLite files shared
+by the workers, so a follow-up request may land on any of them. Metrics
+and the job queue depth are per worker: /metrics reports the worker that
+answered it. One server per JOB_DB_PATH, as startup fails the jobs left
+unfinished there.
+
+Run from the backend folder:
+    python main.py
+"""
+import gc
+import importlib.util
+import logging
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+# ========== SERVER SETTINGS ==========
+HOST = os.environ.get("HOST", "127.0.0.1")
+# The frontend calls the API on this port
+PORT = int(os.environ.get("PORT", "8888"))
+WEB_WORKERS = int(os.environ.get("WEB_WORKERS", str(os.cpu_count() or 1)))
+# Pending connections the kernel queues while every worker is busy
+WEB_BACKLOG = int(os.environ.get("WEB_BACKLOG", "2048"))
+WEB_KEEPALIVE_SECONDS = float(os.environ.get("WEB_KEEPALIVE_SECONDS", "5"))
+WEB_GRACEFUL_TIMEOUT_SECONDS = float(os.environ.get("WEB_GRACEFUL_TIMEOUT_SECONDS", "30"))
+
+LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+HTTP = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def memory_usage(pid="self"):
+    """(rss, pss, shared) in MB for a process, from /proc; None where unavailable"""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            fields = {line.split(":")[0]: int(line.split()[1]) for line in f if line.split()[-1] == "kB"}
+    except OSError:
+        return None
+    shared = fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+    return tuple(round(kb / 1024, 1) for kb in (fields.get("Rss", 0), fields.get("Pss", 0), shared))
+
+
+def listen():
+    sock = socket.socket(socket.AF_INET6 if ":" in HOST else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((HOST, PORT))
+    sock.listen(WEB_BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+def server_config(app):
+    return uvicorn.Config(
+        app,
+        loop=LOOP,
+        http=HTTP,
+        backlog=WEB_BACKLOG,
+        timeout_keep_alive=WEB_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=WEB_GRACEFUL_TIMEOUT_SECONDS,
+        # Request logging is the app's own (logging_setup.py)
+        access_log=False,
+        log_level="warning",
+    )
+
+
+class WorkerServer(uvicorn.Server):
+    """uvicorn server that reports its memory once it is accepting requests"""
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets)
+        from logging_setup import log_request
+
+        rss, pss, shared = memory_usage() or (None, None, None)
+        log_request("worker_ready", pid=os.getpid(), rss_mb=rss, pss_mb=pss, shared_mb=shared)
+
+
+def run_worker(app_module, sock):
+    """Body of a forked worker; never returns"""
+    # Out of the terminal's process group: CTRL+C reaches the parent, which
+    # then stops each worker exactly once (a second signal makes uvicorn exit at once)
+    os.setpgid(0, 0)
+    # uvicorn installs its own handlers once serving; until then, the defaults
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    status = 0
+    try:
+        app_module.after_fork()
+        WorkerServer(server_config(app_module.app)).run(sockets=[sock])
+    except BaseException:
+        app_module.logger.exception("worker %d crashed", os.getpid())
+        status = 1
+    finally:
+        app_module.shutdown_logging()
+        os._exit(status)
+
+
+def spawn(app_module, sock):
+    pid = os.fork()
+    if pid == 0:
+        run_worker(app_module, sock)
+    return pid
+
+
+def supervise(app_module, sock, workers):
+    """Keep `workers` children running until SIGTERM/SIGINT, then stop them gracefully"""
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        if not stopping:
+            stopping = True
+            app_module.log_request("server_stopping", workers=len(workers), signal=signum)
+            for pid in workers:
+                os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    deadline = None
+    while workers:
+        if stopping and deadline is None:
+            deadline = time.monotonic() + WEB_GRACEFUL_TIMEOUT_SECONDS + 5
+        if deadline is not None and time.monotonic() > deadline:
+            for pid in workers:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid == 0:
+            time.sleep(0.2)
+            continue
+        workers.discard(pid)
+        if not stopping:
+            app_module.log_request(
+                "worker_exited", level=logging.WARNING, pid=pid, status=os.waitstatus_to_exitcode(status)
+            )
+            time.sleep(1)
+            workers.add(spawn(app_module, sock))
+
+
+def main():
+    started = time.perf_counter()
+    import app as app_module
+
+    app_module.warm_up()
+    # Jobs a previous server was running are gone with it
+    abandoned_jobs = app_module.job_queue.store.abandon_unfinished()
+    catalog = app_module.catalog_store.current
+    rss = (memory_usage() or (None,))[0]
+    app_module.log_request(
+        "server_preloaded",
+        duration_s=round(time.perf_counter() - started, 3),
+        catalog_version=catalog.version,
+        roles=len(catalog.job_requirements),
+        skills=len(catalog.all_skills),
+        rss_mb=rss,
+        abandoned_jobs=abandoned_jobs
+    )
+    settings = {"url": f"http://{HOST}:{PORT}", "loop": LOOP, "http": HTTP,
+                "backlog": WEB_BACKLOG, "keepalive_s": WEB_KEEPALIVE_SECONDS}
+
+    if WEB_WORKERS <= 1 or not hasattr(os, "fork"):
+        app_module.log_request("server_ready", workers=1, **settings)
+        config = server_config(app_module.app)
+        config.host, config.port = HOST, PORT
+        WorkerServer(config).run()
+        return
+
+    sock = listen()
+    # Parser libraries imported here are shared by every worker (unless EXTRACT_PRELOAD=lazy)
+    imports_ms = app_module.parser_warmup.preload()
+    if imports_ms:
+        app_module.log_request("parsers_preloaded", imports_ms=imports_ms)
+    app_module.before_fork()
+    # Keep the collector from touching (and so copying) the preloaded objects in every worker
+    gc.collect()
+    gc.freeze()
+    workers = {spawn(app_module, sock) for _ in range(WEB_WORKERS)}
+    app_module.setup_logging()
+    app_module.log_request(
+        "server_ready", workers=WEB_WORKERS, startup_s=round(time.perf_counter() - started, 3), **settings
+    )
+    supervise(app_module, sock, workers)
+    app_module.log_request("server_stopped")
+    app_module.shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
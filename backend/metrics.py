@@ -0,0 +1,242 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# ========== METRICS SETTINGS ==========
+# Set to 0 to turn every histogram and counter into a no-op
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+
+# Upper bounds in seconds; stages range from microseconds (gap analysis)
+# to tens of seconds (a large PDF)
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+REGISTRY = []
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values"""
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, *labels, amount=1):
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations in seconds, optionally split by label values.
+
+    Every thread records into its own shard, so observe() takes no lock
+    and costs about as much as the perf_counter() calls around it. Shards
+    are merged, and buckets made cumulative, only when rendered.
+    """
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _new_shard(self):
+        shard = self._local.series = {}
+        with self._lock:
+            self._shards.append(shard)
+        return shard
+
+    def observe(self, value, *labels):
+        if not METRICS_ENABLED:
+            return
+        try:
+            shard = self._local.series
+        except AttributeError:
+            shard = self._new_shard()
+        series = shard.get(labels)
+        if series is None:
+            # [per-bucket counts..., +Inf count, sum]
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def _merged(self):
+        merged = {}
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for labels, series in list(shard.items()):
+                total = merged.setdefault(labels, [0] * len(series))
+                for i, value in enumerate(list(series)):
+                    total[i] += value
+        return merged
+
+    def count(self, *labels):
+        series = self._merged().get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def timed(self, *labels):
+        """Decorator recording how long each call to the function takes"""
+        def decorate(func):
+            if not METRICS_ENABLED:
+                return func
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - started, *labels)
+            return wrapper
+        return decorate
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._merged().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Value read from a callback when /metrics is scraped"""
+
+    def __init__(self, name, help, read):
+        self.name = name
+        self.help = help
+        self.read = read
+        REGISTRY.append(self)
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge",
+                f"{self.name} {_format_value(self.read())}"]
+
+
+def render_metrics():
+    """Every registered metric in the Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ========== APP METRICS ==========
+REQUEST_SECONDS = Histogram(
+    "career_navigator_request_duration_seconds",
+    "HTTP request latency by route, method and status",
+    ("route", "method", "status")
+)
+STAGE_SECONDS = Histogram(
+    "career_navigator_stage_duration_seconds",
+    "Time spent in each analysis stage (roadmap_build includes skill_match and gap_analysis)",
+    ("stage",)
+)
+EXTRACT_BACKEND_SECONDS = Histogram(
+    "career_navigator_extract_backend_duration_seconds",
+    "Time one extraction backend spent on a chunk of pages",
+    ("backend",)
+)
+EXTRACT_BACKEND_FAILURES = Counter(
+    "career_navigator_extract_backend_failures_total",
+    "Extraction backend attempts that raised",
+    ("backend",)
+)
+EXTRACT_FALLBACKS = Counter(
+    "career_navigator_extract_fallbacks_total",
+    "Page chunks that needed more than one backend (error or sparse text)",
+    ("format",)
+)
+EXTRACT_FAILURES = Counter(
+    "career_navigator_extract_failures_total",
+    "Resume uploads that produced no text, by reason",
+    ("reason",)
+)
+ROADMAP_REQUESTS = Counter(
+    "career_navigator_roadmap_requests_total",
+    "Roadmap requests by outcome: built, shared with an identical request in flight, or not_modified (304)",
+    ("outcome",)
+)
+
+JOB_SECONDS = Histogram(
+    "career_navigator_job_duration_seconds",
+    "Background job latency: time waiting for a worker and time running",
+    ("phase",)
+)
+JOBS_TOTAL = Counter(
+    "career_navigator_jobs_total",
+    "Background jobs by outcome (done, failed, or deduplicated onto an existing job)",
+    ("outcome",)
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by its route template.
+
+    The label is the matched route's path (e.g. /api/roadmap), never the
+    raw URL, so unknown paths all share one series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                getattr(route, "path", "unmatched"), scope["method"], status
+            )
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# ========== PARSER POOL SETTINGS ==========
+# "process" keeps pdfplumber/PyPDF2/python-docx off the event loop and the GIL,
+# "thread" is lighter for small deployments
+EXTRACT_EXECUTOR = os.environ.get("EXTRACT_EXECUTOR", "process")
+EXTRACT_WORKERS = int(os.environ.get("EXTRACT_WORKERS", "2"))
+EXTRACT_MAX_QUEUE = int(os.environ.get("EXTRACT_MAX_QUEUE", "8"))
+EXTRACT_TIMEOUT_SECONDS = float(os.environ.get("EXTRACT_TIMEOUT_SECONDS", "30"))
+
+
+class PoolSaturated(Exception):
+    """Raised when every worker is busy and the waiting queue is full"""
+
+
+class DocumentSlot:
+    """One admitted document's hold on the parse pool.
+
+    A document may be split into several tasks. The slot is given back once
+    the document is closed and every task it submitted has finished in its
+    worker. A task cancelled before it started counts as finished. A task a
+    timed-out caller gave up on keeps the slot until the worker returns.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._pending = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        """Schedule func(*args) in the pool and return an awaitable future.
+
+        Cancelling the awaitable cancels the task if it has not started yet.
+        """
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self.pool._submit(func, *args)
+        except BaseException:
+            self._task_done(None)
+            raise
+        # The executor's own future, not the asyncio wrapper: it only
+        # finishes once the worker is done with the task
+        future.add_done_callback(self._task_done)
+        return asyncio.wrap_future(future)
+
+    def _task_done(self, future):
+        with self._lock:
+            self._pending -= 1
+            release = self._closed and not self._pending
+        if release:
+            self.pool._release()
+
+    def close(self):
+        """No more tasks will be submitted; the slot is released once the running ones return"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            release = not self._pending
+        if release:
+            self.pool._release()
+
+
+class ParsePool:
+    """Runs blocking document parsers off the event loop with admission control.
+
+    At most `workers` documents are parsed at once and at most `max_queue`
+    more may wait for a worker; anything beyond that is rejected straight
+    away with PoolSaturated so the caller can answer 503 instead of piling
+    up work. Admission is per document however many page chunks it is
+    split into (see DocumentSlot). A document that is still parsing after
+    `timeout` seconds is abandoned by the caller, but its slot is only
+    released once the parser actually returns.
+    """
+
+    def __init__(self, kind=EXTRACT_EXECUTOR, workers=EXTRACT_WORKERS,
+                 max_queue=EXTRACT_MAX_QUEUE, timeout=EXTRACT_TIMEOUT_SECONDS):
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        # Documents admitted and not yet released
+        self.in_flight = 0
+        self._executor = None
+        # Slots are released from the executor's callback threads
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parse")
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _submit(self, func, *args):
+        try:
+            return self._get_executor().submit(func, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. a parser segfaulted); start a fresh pool
+            self.shutdown()
+            return self._get_executor().submit(func, *args)
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def admit(self):
+        """Reserve a slot for one document, or raise PoolSaturated; close the returned DocumentSlot when done"""
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                raise PoolSaturated(f"{self.in_flight} documents already queued or parsing")
+            self.in_flight += 1
+        return DocumentSlot(self)
+
+    async def start(self, func, *args):
+        """Start the workers now instead of on the first document, running func(*args) once per worker.
+
+        A process pool forks all its workers on first use, so they inherit
+        every module this process has imported by then. func is spread over
+        the workers on a best-effort basis; results are returned in a list.
+        No slots are taken: this runs before the server takes uploads.
+        """
+        return await asyncio.gather(*(asyncio.wrap_future(self._submit(func, *args)) for _ in range(self.workers)))
+
+    def shutdown(self):
+        if self._executor is not None:
+            # Tasks still queued are cancelled, which releases their slots
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
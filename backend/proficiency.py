@@ -0,0 +1,109 @@
+import re
+
+# ========== EXPERIENCE CUES ==========
+# The phrase after a cue that may name skills: one line, up to 80 characters,
+# cut at the end of the sentence or at the next cue
+_PHRASE = r"[a-z0-9][a-z0-9 \t+#./&,-]{0,80}"
+_SENTENCE_END = re.compile(r"\.(?:\s|$)|[;!?]")
+
+# (level, cue) in the order they are tried at a position; a "years" cue's
+# first group is the number
+EXPERIENCE_PATTERNS = [
+    ("years", r"(\d{1,2}(?:\.\d)?)\+?\s*(?:years?|yrs?)\b(?:\s+of)?(?:\s+(?:professional|hands-on|industry))?"
+              r"(?:\s+experience)?(?:\s+(?:with|in|using|of))?[\s:]+"),
+    ("expert", r"expertise\s+(?:in|with)\s+"),
+    ("proficient", r"proficien(?:t|cy)\s+(?:in|with)\s+"),
+    ("proficient", r"skilled\s+(?:in|with)\s+"),
+    ("hands-on", r"(?:built|developed|created|designed|implemented)\s+(?:[a-z0-9-]+\s+){0,6}?(?:with|using|in)\s+"),
+]
+# Where a cue can start; searching for these words first is several times
+# faster than trying every cue at every position of the text
+_CUE_START = re.compile(
+    r"(?<![a-z0-9])(?:\d{1,2}(?:\.\d)?\+?\s*(?:years?|yrs?)\b"
+    r"|expertise|proficien|skilled|built|developed|created|designed|implemented)"
+)
+
+# How much a cue says about working knowledge of a skill, from 0 to 1
+LEVEL_CONFIDENCE = {"expert": 0.9, "proficient": 0.8, "hands-on": 0.7, "mentioned": 0.4}
+YEARS_FOR_FULL_CONFIDENCE = 4
+
+
+def _compile_cues(patterns):
+    """All cues as one regex, each followed by a phrase group; returns (regex, [(level, years group, phrase group)])"""
+    sources = []
+    groups = []
+    offset = 0
+    for level, pattern in patterns:
+        count = re.compile(pattern).groups
+        # The phrase is only looked at, not consumed
+        sources.append(f"(?:{pattern}(?=({_PHRASE})))")
+        groups.append((level, offset + 1 if level == "years" else None, offset + count + 1))
+        offset += count + 1
+    return re.compile("|".join(sources)), groups
+
+
+_CUES, _CUE_GROUPS = _compile_cues(EXPERIENCE_PATTERNS)
+
+
+def find_cues(text):
+    """(level, years or None, phrase start, phrase end) of every experience cue in lowercased text"""
+    matches = [_CUES.match(text, start.start()) for start in _CUE_START.finditer(text)]
+    matches = [match for match in matches if match is not None]
+    cues = []
+    for position, match in enumerate(matches):
+        for level, years_group, phrase_group in _CUE_GROUPS:
+            start, end = match.span(phrase_group)
+            if start == -1:
+                continue
+            if position + 1 < len(matches):
+                end = min(end, matches[position + 1].start())
+            sentence_end = _SENTENCE_END.search(text, start, end)
+            if sentence_end is not None:
+                end = sentence_end.start()
+            years = float(match.group(years_group)) if years_group else None
+            cues.append((level, years, start, end))
+            break
+    return cues
+
+
+def _confidence(level, years, mentions):
+    score = LEVEL_CONFIDENCE[level]
+    if years is not None:
+        score = max(score, 0.5 + 0.5 * min(years, YEARS_FOR_FULL_CONFIDENCE) / YEARS_FOR_FULL_CONFIDENCE)
+    # Each further mention is a little more evidence
+    return round(min(1.0, score + 0.05 * min(mentions - 1, 4)), 2)
+
+
+def skill_evidence(matcher, text):
+    """Skills mentioned in text with what the text says about each.
+
+    Returns {skill: {"mentions", "years", "level", "confidence"}}, sorted
+    by skill. One pass of the compiled skill matcher counts the skills and
+    one pass finds the experience cues ("5 years of", "proficient in",
+    "built ... with"); the matcher then runs over just the short phrase
+    after each cue, and the skills it names get that cue. years is the most any cue gives,
+    level the strongest cue ("mentioned" if none) and confidence a 0-1
+    score of working knowledge from both and the number of mentions.
+    """
+    lowered = text.lower()
+    evidence = {
+        skill: {"mentions": mentions, "years": None, "level": "mentioned"}
+        for skill, mentions in sorted(matcher.count(lowered).items())
+    }
+
+    for level, years, phrase_start, phrase_end in find_cues(lowered):
+        for skill in matcher.count(lowered, phrase_start, phrase_end):
+            found = evidence.get(skill)
+            if found is None:
+                # Only where the phrase cut an alias short ("java" of "javascript")
+                continue
+            if years is not None:
+                found["years"] = max(found["years"] or 0, years)
+            elif LEVEL_CONFIDENCE[level] > LEVEL_CONFIDENCE[found["level"]]:
+                found["level"] = level
+
+    for found in evidence.values():
+        if found["years"] is not None and found["years"].is_integer():
+            found["years"] = int(found["years"])
+        found["confidence"] = _confidence(found["level"], found["years"], found["mentions"])
+    return evidence
@@ -0,0 +1,455 @@
+import asyncio
+import cProfile
+import functools
+import hashlib
+import hmac
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from logging_setup import log_request
+
+# ========== PROFILING SETTINGS ==========
+# Requests sending this value in the X-Profile-Token header are profiled;
+# unset, the header is ignored (reading profiles back needs ADMIN_TOKEN)
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+# Fraction of requests to PROFILE_ROUTES profiled without the header; only
+# those routes are profiled, with the header too
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_ROUTES = os.environ.get(
+    "PROFILE_ROUTES", "/api/roadmap,/api/extract-resume,/api/extract-resume-raw,/api/extract-resume-base64"
+).split(",")
+# "cprofile" records every call; "sample" snapshots the stack every PROFILE_SAMPLE_INTERVAL_MS
+PROFILE_MODE = os.environ.get("PROFILE_MODE", "cprofile")
+PROFILE_SAMPLE_INTERVAL_MS = float(os.environ.get("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.environ.get(
+    "PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "profiles")
+)
+# Profiles kept on disk; the oldest are deleted past this
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "50"))
+
+PROFILE_MODES = ("cprofile", "sample")
+PROFILE_HEADER = b"x-profile-token"
+# Functions or stacks listed in a profile's summary
+PROFILE_TOP = 25
+
+# Profile of the request being handled, if it is profiled. Sync handlers run
+# in a copy of the request's context, so stages there find it too.
+_active = ContextVar("request_profile", default=None)
+
+
+def current_profile():
+    """The RequestProfile of the request being handled, or None"""
+    return _active.get()
+
+
+def set_fingerprint(fingerprint):
+    """Record what identifies this request's input (profile key, file digest) in its profile"""
+    profile = _active.get()
+    if profile is not None:
+        profile.fingerprint = fingerprint
+
+
+# ========== STAGE ANNOTATIONS ==========
+@contextmanager
+def stage(name):
+    """Mark a block as a stage of the request being profiled; does nothing otherwise"""
+    profile = _active.get()
+    if profile is None:
+        yield
+        return
+    entered = profile.enter(name)
+    try:
+        yield
+    finally:
+        profile.exit(entered)
+
+
+def staged(name):
+    """Decorator marking each call of the function as a stage (see stage)"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _active.get()
+            if profile is None:
+                return func(*args, **kwargs)
+            entered = profile.enter(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.exit(entered)
+        return wrapper
+    return decorate
+
+
+class _Collected:
+    """Stats taken from a profiler, in the shape pstats.Stats loads"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class RequestProfile:
+    """Stage timings and a profile of the threads running the stages of one request.
+
+    Only code inside a stage is profiled: each thread's profiler (or the
+    stack sampler) is on from the moment the thread enters its outermost
+    stage until it leaves it. Work the request hands to the parse pool is
+    profiled where it runs and merged back in (see profiled_call).
+    """
+
+    def __init__(self, mode=PROFILE_MODE, interval_ms=PROFILE_SAMPLE_INTERVAL_MS, method="", path="", reason=""):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"PROFILE_MODE must be one of {', '.join(PROFILE_MODES)}, not {mode!r}")
+        self.id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%f") + "-" + uuid.uuid4().hex[:8]
+        self.mode = mode
+        self.interval = interval_ms / 1000
+        self.method = method
+        self.path = path
+        self.reason = reason
+        self.fingerprint = None
+        self.status = None
+        self.started_at = time.time()
+        self.duration_ms = None
+        self.stages = []
+        self.stats = []
+        self.samples = Counter()
+        self.errors = []
+        self._started = time.perf_counter()
+        self._depth = {}
+        self._profilers = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        if self.mode == "sample":
+            self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+            self._sampler.start()
+        return self
+
+    def enter(self, name):
+        thread = threading.get_ident()
+        with self._lock:
+            depth = self._depth.get(thread, 0)
+            self._depth[thread] = depth + 1
+        if depth == 0 and self.mode == "cprofile":
+            profiler = self._profilers.get(thread)
+            if profiler is None:
+                profiler = self._profilers[thread] = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:
+                # Another profiler already owns this thread
+                self.errors.append(str(e)[:100])
+        return name, thread, depth, time.perf_counter()
+
+    def exit(self, entered):
+        name, thread, depth, started = entered
+        ended = time.perf_counter()
+        if depth == 0 and self.mode == "cprofile":
+            self._profilers[thread].disable()
+        with self._lock:
+            self._depth[thread] = depth
+            self.stages.append({
+                "stage": name,
+                "start_ms": round((started - self._started) * 1000, 3),
+                "duration_ms": round((ended - started) * 1000, 3),
+                "depth": depth,
+                "thread": f"{os.getpid()}/{threading.current_thread().name}",
+            })
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = [thread for thread, depth in self._depth.items() if depth]
+            for thread in threads:
+                frame = frames.get(thread)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                if stack:
+                    self.samples[";".join(reversed(stack))] += 1
+
+    def finish(self, status=None):
+        self.status = status
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        for profiler in self._profilers.values():
+            profiler.create_stats()
+            if profiler.stats:
+                self.stats.append(profiler.stats)
+        self._profilers.clear()
+        return self
+
+    def payload(self):
+        """What a pool worker sends back to be merged into the request's profile"""
+        return {"started_at": self.started_at, "stages": self.stages, "stats": self.stats,
+                "samples": dict(self.samples), "errors": self.errors}
+
+    def merge(self, outcome):
+        """Absorb a (result, payload) pair from profiled_call and return the result"""
+        result, payload = outcome
+        offset_ms = (payload["started_at"] - self.started_at) * 1000
+        with self._lock:
+            for entry in payload["stages"]:
+                self.stages.append({**entry, "start_ms": round(entry["start_ms"] + offset_ms, 3)})
+            self.stats.extend(payload["stats"])
+            self.samples.update(payload["samples"])
+            self.errors.extend(payload["errors"])
+        return result
+
+    def pstats(self):
+        """Every collected cProfile, merged"""
+        merged = pstats.Stats()
+        for stats in self.stats:
+            merged.add(_Collected(stats))
+        return merged
+
+    def summary(self):
+        """JSON-ready description with the stages and the hottest functions or stacks"""
+        summary = {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "reason": self.reason,
+            "mode": self.mode,
+            "fingerprint": self.fingerprint,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "stages": sorted(self.stages, key=lambda entry: entry["start_ms"]),
+            "errors": self.errors,
+        }
+        if self.mode == "cprofile":
+            merged = self.pstats().sort_stats("cumulative")
+            summary["top"] = [
+                {"function": pstats.func_std_string(function), "calls": calls, "total_ms": round(total * 1000, 3),
+                 "cumulative_ms": round(cumulative * 1000, 3)}
+                for function in merged.fcn_list[:PROFILE_TOP]
+                for _, calls, total, cumulative, _ in [merged.stats[function]]
+            ]
+        else:
+            leaves = Counter()
+            for stack, count in self.samples.items():
+                leaves[stack.rsplit(";", 1)[-1]] += count
+            summary["samples"] = sum(self.samples.values())
+            summary["top"] = [{"frame": frame, "samples": count} for frame, count in leaves.most_common(PROFILE_TOP)]
+        return summary
+
+
+def profiled_call(mode, func, *args):
+    """Run func(*args) profiled, e.g. in a pool worker; returns (result, payload) for RequestProfile.merge"""
+    profile = RequestProfile(mode).start()
+    token = _active.set(profile)
+    try:
+        with stage(f"parse:{func.__name__}"):
+            result = func(*args)
+    finally:
+        _active.reset(token)
+        profile.finish()
+    return result, profile.payload()
+
+
+# ========== PROFILE STORE ==========
+PROFILE_ID = re.compile(r"^\d{8}T\d{6}\.\d{6}-[0-9a-f]{8}$")
+PROFILE_SUFFIXES = {"cprofile": ".prof", "sample": ".folded"}
+
+
+class ProfileStore:
+    """Decides which requests are profiled and keeps their profiles on disk.
+
+    Each profile is a <id>.json summary next to the profile itself: a
+    pstats dump (<id>.prof, for python -m pstats or snakeviz) or collapsed
+    stacks (<id>.folded, for flamegraph.pl or speedscope). Ids start with
+    the UTC time, so the directory sorts oldest first; the oldest are
+    deleted once more than `keep` are stored.
+    """
+
+    def __init__(self, directory=PROFILE_DIR, keep=PROFILE_KEEP, token=PROFILE_TOKEN,
+                 sample_rate=PROFILE_SAMPLE_RATE, routes=PROFILE_ROUTES, mode=PROFILE_MODE):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"PROFILE_MODE must be one of {', '.join(PROFILE_MODES)}, not {mode!r}")
+        self.directory = directory
+        self.keep = keep
+        self.token = token
+        self.sample_rate = sample_rate
+        self.routes = set(routes)
+        self.mode = mode
+        self.saved = 0
+
+    @property
+    def enabled(self):
+        return bool(self.token) or self.sample_rate > 0
+
+    def authorized(self, value):
+        """Whether a header value is the profiling token"""
+        if not self.token or not value:
+            return False
+        if isinstance(value, str):
+            value = value.encode()
+        return hmac.compare_digest(value, self.token.encode())
+
+    def reason(self, scope):
+        """"header" or "sampled" if the request should be profiled, else None.
+
+        Only requests to `routes` are profiled, with or without the header,
+        so reading profiles back never stores (and prunes) new ones.
+        """
+        if scope["path"] not in self.routes:
+            return None
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    if self.authorized(value):
+                        return "header"
+                    break
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def _path(self, profile_id, suffix):
+        return os.path.join(self.directory, profile_id + suffix)
+
+    def save(self, profile):
+        """Write a finished profile and drop the oldest past `keep`"""
+        os.makedirs(self.directory, exist_ok=True)
+        if profile.mode == "cprofile":
+            profile.pstats().dump_stats(self._path(profile.id, ".prof"))
+        else:
+            with open(self._path(profile.id, ".folded"), "w") as folded:
+                for stack, count in sorted(profile.samples.items()):
+                    folded.write(f"{stack} {count}\n")
+        with open(self._path(profile.id, ".json"), "w") as summary:
+            json.dump(profile.summary(), summary)
+        self.saved += 1
+        self._prune()
+
+    def _prune(self):
+        stored = self.ids()
+        for profile_id in stored[:max(0, len(stored) - self.keep)]:
+            for suffix in (".json", *PROFILE_SUFFIXES.values()):
+                try:
+                    os.unlink(self._path(profile_id, suffix))
+                except FileNotFoundError:
+                    pass
+
+    def ids(self):
+        """Ids of the stored profiles, oldest first"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith(".json") and PROFILE_ID.match(name[:-5]))
+
+    def summary(self, profile_id):
+        """The stored summary of a profile, or None"""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id, ".json")) as summary:
+                return json.load(summary)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def recent(self, limit=20):
+        """Summaries of the newest profiles, newest first, without their stages and top lists"""
+        listed = []
+        for profile_id in reversed(self.ids()):
+            summary = self.summary(profile_id)
+            if summary is not None:
+                listed.append({key: value for key, value in summary.items() if key not in ("stages", "top")})
+            if len(listed) >= limit:
+                break
+        return listed
+
+    def data_path(self, profile_id):
+        """(path, mode) of a stored profile's pstats dump or folded stacks, or None"""
+        summary = self.summary(profile_id)
+        if summary is None:
+            return None
+        path = self._path(profile_id, PROFILE_SUFFIXES[summary["mode"]])
+        return (path, summary["mode"]) if os.path.exists(path) else None
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "header": bool(self.token),
+            "sample_rate": self.sample_rate,
+            "mode": self.mode,
+            "saved": self.saved,
+            "stored": len(self.ids()),
+        }
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling the requests ProfileStore picks.
+
+    A profiled request gets an X-Profile-Id response header naming its
+    profile. With profiling off it costs one attribute check per request.
+    """
+
+    def __init__(self, app, store):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        if not self.store.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        reason = self.store.reason(scope)
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(self.store.mode, method=scope["method"], path=scope["path"], reason=reason)
+        # Replaced by handlers that know what the request's input is (set_fingerprint)
+        profile.fingerprint = hashlib.sha256(
+            scope["method"].encode() + b" " + scope["path"].encode() + b"?" + scope.get("query_string", b"")
+        ).hexdigest()
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile.id.encode())]}
+            await send(message)
+
+        token = _active.set(profile.start())
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _active.reset(token)
+            profile.finish(status)
+            await self._save(profile)
+
+    async def _save(self, profile):
+        try:
+            # The response is out; write the files off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self.store.save, profile)
+        except OSError as e:
+            log_request("request_profiled", level=logging.WARNING, id=profile.id, error=str(e)[:200])
+            return
+        log_request("request_profiled", id=profile.id, path=profile.path, reason=profile.reason, mode=profile.mode,
+                    fingerprint=profile.fingerprint, duration_ms=profile.duration_ms)
@@ -0,0 +1,140 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# ========== PROGRESS STORE SETTINGS ==========
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+PROGRESS_DB_PATH = os.environ.get("PROGRESS_DB_PATH", os.path.join(DATA_DIR, "progress.db"))
+# Length of roadmaps stored without any task
+ROADMAP_DAYS = 30
+DAY_SECONDS = 24 * 60 * 60
+
+
+class ProgressStore:
+    """Roadmaps handed out and the tasks completed on them, in SQLite (WAL).
+
+    A roadmap is stored as the list of its tasks (id, skill trained and
+    day), not as the full JSON sent to the browser; completions are one
+    row per (roadmap, task id) with the time they were reported. Clients
+    send only the tasks that changed and the adaptation is computed from
+    the stored history.
+
+    Roadmaps saved when a day held a single task are stored as [day, skill]
+    pairs and used the day as the task id; they are read the same way.
+    """
+
+    def __init__(self, path=PROGRESS_DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Losing the last few events on power loss is fine; an fsync per click is not
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS roadmaps ("
+            "id TEXT PRIMARY KEY, created REAL NOT NULL, role TEXT NOT NULL, tasks TEXT NOT NULL);"
+            # `day` holds the task id (see above)
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "roadmap_id TEXT NOT NULL, day INTEGER NOT NULL, completed_at REAL NOT NULL,"
+            "PRIMARY KEY (roadmap_id, day)) WITHOUT ROWID;"
+        )
+        self._db.commit()
+
+    def save_roadmap(self, roadmap, role, now=None):
+        """Remember the tasks of a roadmap and return its new id"""
+        roadmap_id = uuid.uuid4().hex
+        tasks = [[task["id"], task.get("skill"), task["day"]] for week in roadmap["weeks"] for task in week["tasks"]]
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO roadmaps (id, created, role, tasks) VALUES (?, ?, ?, ?)",
+                (roadmap_id, now or time.time(), role, json.dumps(tasks, separators=(",", ":")))
+            )
+            self._db.commit()
+        return roadmap_id
+
+    def record(self, roadmap_id, completed=(), uncompleted=(), now=None):
+        """Apply completion events by task id; ids not in the roadmap are ignored.
+
+        Returns False if the roadmap is unknown.
+        """
+        now = now or time.time()
+        with self._lock:
+            row = self._db.execute("SELECT tasks FROM roadmaps WHERE id = ?", (roadmap_id,)).fetchone()
+            if row is None:
+                return False
+            task_ids = {task[0] for task in json.loads(row[0])}
+            self._db.executemany(
+                "INSERT OR IGNORE INTO completions (roadmap_id, day, completed_at) VALUES (?, ?, ?)",
+                [(roadmap_id, task_id, now) for task_id in set(completed) & task_ids]
+            )
+            self._db.executemany(
+                "DELETE FROM completions WHERE roadmap_id = ? AND day = ?",
+                [(roadmap_id, task_id) for task_id in set(uncompleted)]
+            )
+            self._db.commit()
+        return True
+
+    def progress(self, roadmap_id, now=None):
+        """Completion history of a roadmap: pace over time and per-skill progress, or None"""
+        now = now or time.time()
+        with self._lock:
+            row = self._db.execute("SELECT created, role, tasks FROM roadmaps WHERE id = ?", (roadmap_id,)).fetchone()
+            if row is None:
+                return None
+            completions = self._db.execute(
+                "SELECT day, completed_at FROM completions WHERE roadmap_id = ? ORDER BY completed_at",
+                (roadmap_id,)
+            ).fetchall()
+
+        created, role, tasks = row[0], row[1], json.loads(row[2])
+        done = {task_id: at for task_id, at in completions}
+        total = len(tasks)
+        # Roadmaps run as long as their gaps need; the last task ends the plan
+        plan_days = max((task[2] if len(task) > 2 else task[0] for task in tasks), default=ROADMAP_DAYS)
+        days_elapsed = max(0.0, (now - created) / DAY_SECONDS)
+        planned_per_week = total / plan_days * 7
+
+        skills = {}
+        for task_id, skill, *_ in tasks:
+            if skill is None:
+                continue
+            counts = skills.setdefault(skill, {"completed": 0, "total": 0})
+            counts["total"] += 1
+            counts["completed"] += task_id in done
+
+        # Completions per elapsed week of the plan, oldest first
+        weekly = [0] * (min(int(days_elapsed // 7), plan_days // 7) + 1)
+        for at in done.values():
+            weekly[min(int(max(0.0, at - created) / DAY_SECONDS // 7), len(weekly) - 1)] += 1
+
+        return {
+            "roadmap_id": roadmap_id,
+            "role": role,
+            "total_tasks": total,
+            "completed": len(done),
+            "completed_tasks": sorted(done),
+            "days_elapsed": round(days_elapsed, 2),
+            "plan_days": plan_days,
+            "expected_completed": round(total * min(1.0, days_elapsed / plan_days), 2),
+            "pace": {
+                "planned_per_week": round(planned_per_week, 2),
+                "last_7_days": sum(1 for at in done.values() if now - at <= 7 * DAY_SECONDS),
+                "weekly": weekly,
+            },
+            "skills": skills,
+        }
+
+    def stats(self):
+        with self._lock:
+            roadmaps = self._db.execute("SELECT COUNT(*) FROM roadmaps").fetchone()[0]
+            completions = self._db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        return {"roadmaps": roadmaps, "completions": completions}
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,149 @@
+import gzip
+import json
+import os
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+
+# Both are in requirements.txt; without them responses fall back to the
+# standard json module and to gzip only
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# ========== RESPONSE SETTINGS ==========
+# Bodies smaller than this are sent as they are; compressing them saves little
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_GZIP_LEVEL = int(os.environ.get("COMPRESS_GZIP_LEVEL", "6"))
+COMPRESS_BROTLI_QUALITY = int(os.environ.get("COMPRESS_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript", "text/")
+
+
+def dumps(content):
+    """content as compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse serialized with orjson when installed.
+
+    Returning one from an endpoint also skips FastAPI's jsonable_encoder
+    pass, which walks the whole body in Python first; use it for bodies
+    that are plain dicts, lists, strings and numbers.
+    """
+
+    def render(self, content):
+        return dumps(content)
+
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match value names etag, compared weakly (W/ prefixes ignored)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _gzip(body):
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(body, COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+def _brotli(body):
+    return brotli.compress(body, mode=brotli.MODE_TEXT, quality=COMPRESS_BROTLI_QUALITY)
+
+
+# In order of preference
+COMPRESSORS = {"br": _brotli, "gzip": _gzip} if brotli is not None else {"gzip": _gzip}
+
+
+def precompress(body):
+    """body in every encoding of COMPRESSORS (None: as is), at the highest levels.
+
+    For bodies built once and served many times, where the slower levels pay off.
+    """
+    variants = {None: body, "gzip": gzip.compress(body, 9, mtime=0)}
+    if "br" in COMPRESSORS:
+        variants["br"] = brotli.compress(body, mode=brotli.MODE_TEXT, quality=11)
+    return variants
+
+
+def negotiate_encoding(accept_encoding):
+    """The preferred encoding the client accepts (q > 0) from an Accept-Encoding value, or None"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in COMPRESSORS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """Compresses response bodies with brotli or gzip, as negotiated with Accept-Encoding.
+
+    Only whole bodies of at least minimum_size bytes with a text or JSON
+    content type are compressed. Streamed responses (NDJSON batches) are
+    passed through as they are, so each line still reaches the client as
+    soon as it is built.
+    """
+
+    def __init__(self, app, minimum_size=COMPRESS_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Held back until the body shows whether to compress
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+            first, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=first["headers"])
+            if "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            if (message.get("more_body") or len(body) < self.minimum_size or "content-encoding" in headers
+                    or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)):
+                await send(first)
+                await send(message)
+                return
+            body = COMPRESSORS[encoding](body)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            await send(first)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
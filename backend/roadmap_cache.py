@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# ========== ROADMAP CACHE SETTINGS ==========
+ROADMAP_CACHE_SIZE = int(os.environ.get("ROADMAP_CACHE_SIZE", "2048"))
+# Entries older than this are rebuilt, e.g. to pick up catalog changes
+ROADMAP_CACHE_TTL_SECONDS = float(os.environ.get("ROADMAP_CACHE_TTL_SECONDS", "3600"))
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries also expire `ttl` seconds after insertion.
+
+    Safe to share between the threads FastAPI runs sync endpoints on.
+    Values are returned as stored, so callers must not mutate them.
+    """
+
+    def __init__(self, max_entries=ROADMAP_CACHE_SIZE, ttl=ROADMAP_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the live value for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs concurrent calls with the same key once and gives every caller the result.
+
+    A call that arrives while one with its key is running waits for it
+    instead of repeating the work, and gets its exception if it raised.
+    Nothing is kept once the call returns; repeats after that are for a
+    cache such as TTLCache to serve.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args):
+        """Return (func(*args), whether the result came from a call already running)"""
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            shared = flight is not None
+            if shared:
+                self.shared += 1
+            else:
+                flight = self._flights[key] = _Flight()
+
+        if shared:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = func(*args)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "in_flight": len(self._flights),
+            "shared_rate": round(self.shared / self.calls, 4) if self.calls else 0.0,
+        }
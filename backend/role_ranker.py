@@ -0,0 +1,97 @@
+import heapq
+import sys
+from array import array
+from operator import truediv
+
+# A required skill the user has counts twice as much as a preferred one
+REQUIRED_WEIGHT = 2
+PREFERRED_WEIGHT = 1
+LANE_BYTES = 2
+
+
+class RoleRanker:
+    """Scores a user's skills against every role of a catalog at once.
+
+    The role x skill weight matrix is stored by skill: for each skill, the
+    roles that ask for it and the weight it carries there. Skills asked
+    for by many roles are packed into one big int with a 16-bit lane per
+    role, so summing the user's columns adds all roles in a single integer
+    addition; rare skills are added from their short role lists. The sum
+    is the weighted overlap of every role, which is divided by the role's
+    total weight to give its fit.
+    """
+
+    def __init__(self, roles):
+        """roles: iterable of (role, required skills, preferred skills)"""
+        self.roles = []
+        self.required = []
+        self.preferred = []
+        columns = {}
+        for position, (role, required, preferred) in enumerate(roles):
+            required = list(dict.fromkeys(required))
+            preferred = [skill for skill in dict.fromkeys(preferred) if skill not in required]
+            self.roles.append(role)
+            self.required.append(required)
+            self.preferred.append(preferred)
+            for skill in required:
+                columns.setdefault(skill, []).append((position, REQUIRED_WEIGHT))
+            for skill in preferred:
+                columns.setdefault(skill, []).append((position, PREFERRED_WEIGHT))
+
+        count = len(self.roles)
+        # Roles without skills keep a score of 0 instead of dividing by zero
+        self.totals = [
+            REQUIRED_WEIGHT * len(required) + PREFERRED_WEIGHT * len(preferred) or 1
+            for required, preferred in zip(self.required, self.preferred)
+        ]
+
+        # A packed column costs 2 bytes per role whatever its density, so only
+        # skills used by at least 1 role in 64 get one
+        dense_after = max(1, count // 64)
+        self.packed = {}
+        self.sparse = {}
+        for skill, entries in columns.items():
+            if len(entries) >= dense_after:
+                lanes = array("H", bytes(LANE_BYTES * count))
+                for position, weight in entries:
+                    lanes[position] = weight
+                self.packed[skill] = int.from_bytes(lanes.tobytes(), sys.byteorder)
+            else:
+                self.sparse[skill] = entries
+
+    def overlap(self, covered):
+        """Weighted overlap of every role with the covered skill set, in role order"""
+        count = len(self.roles)
+        packed = sum(self.packed[skill] for skill in covered if skill in self.packed)
+        overlap = array("H", packed.to_bytes(LANE_BYTES * count, sys.byteorder))
+        for skill in covered:
+            for position, weight in self.sparse.get(skill, ()):
+                overlap[position] += weight
+        return overlap
+
+    def rank(self, covered, top_k=10):
+        """The top_k best fitting roles for canonical skills `covered`, best first, with their gaps"""
+        scores = list(map(truediv, self.overlap(covered), self.totals))
+        # nlargest is stable, so ties keep catalog order
+        best = heapq.nlargest(top_k, range(len(self.roles)), key=scores.__getitem__)
+
+        ranked = []
+        for position in best:
+            required = self.required[position]
+            missing_required = [skill for skill in required if skill not in covered]
+            ranked.append({
+                "role": self.roles[position],
+                "score": round(scores[position], 3),
+                "required_matched": len(required) - len(missing_required),
+                "required_total": len(required),
+                "missing_required": missing_required,
+                "missing_preferred": [skill for skill in self.preferred[position] if skill not in covered],
+            })
+        return ranked
+
+    def stats(self):
+        return {
+            "roles": len(self.roles),
+            "packed_skills": len(self.packed),
+            "sparse_skills": len(self.sparse),
+        }
@@ -0,0 +1,143 @@
+import os
+
+# ========== SCHEDULE SETTINGS ==========
+# Days of each week with a study session; the rest are left free
+SCHEDULE_STUDY_DAYS = int(os.environ.get("SCHEDULE_STUDY_DAYS", "5"))
+# Effort of a skill the catalog gives no estimate for
+DEFAULT_SKILL_HOURS = float(os.environ.get("DEFAULT_SKILL_HOURS", "8"))
+
+
+class PrerequisiteCycle(ValueError):
+    """Raised when the prerequisite graph loops back on itself"""
+
+
+class SkillGraph:
+    """The catalog's skill prerequisites and effort estimates, for ordering a plan.
+
+    Skills are numbered once, so a plan walks integer adjacency lists
+    rather than dicts of names. Only the part of the graph a learner
+    still needs is visited: the goals and, transitively, their prerequisites
+    that are not covered yet.
+    """
+
+    def __init__(self, prerequisites, hours, default_hours=DEFAULT_SKILL_HOURS):
+        """prerequisites: skill -> skills to learn first; hours: skill -> estimated hours"""
+        self.names = []
+        self.ids = {}
+        for skill, before in prerequisites.items():
+            for name in [skill, *before]:
+                if name not in self.ids:
+                    self.ids[name] = len(self.names)
+                    self.names.append(name)
+        self.prerequisites = [()] * len(self.names)
+        for skill, before in prerequisites.items():
+            self.prerequisites[self.ids[skill]] = tuple(self.ids[name] for name in dict.fromkeys(before))
+        self.hours = dict(hours)
+        self.default_hours = default_hours
+
+    def effort(self, skill):
+        return self.hours.get(skill, self.default_hours)
+
+    def find_cycle(self):
+        """A list of skills that are each other's prerequisites in a loop, or None"""
+        state = [0] * len(self.names)  # 0 unseen, 1 on the current path, 2 done
+        for root in range(len(self.names)):
+            if state[root]:
+                continue
+            path = [root]
+            stack = [iter(self.prerequisites[root])]
+            state[root] = 1
+            while stack:
+                node = next(stack[-1], None)
+                if node is None:
+                    state[path.pop()] = 2
+                    stack.pop()
+                elif state[node] == 1:
+                    loop = path[path.index(node):] + [node]
+                    return [self.names[position] for position in loop]
+                elif not state[node]:
+                    state[node] = 1
+                    path.append(node)
+                    stack.append(iter(self.prerequisites[node]))
+        return None
+
+    def learning_order(self, goals, covered=()):
+        """Goals and their missing prerequisites, each after everything it depends on.
+
+        Returns [(skill, needed_for)] where needed_for is None for a goal and
+        else the skill that first pulled the prerequisite in. Goals keep their
+        given order as far as the prerequisites allow, and each one comes
+        right after its own missing prerequisites: the order is a post-order
+        depth-first walk, iterative so long chains do not hit the recursion
+        limit. Skills outside the graph have no prerequisites. Raises
+        PrerequisiteCycle if the needed part of the graph has a loop.
+        """
+        goals = list(dict.fromkeys(goals))
+        goal_set = set(goals)
+        covered = set(covered)
+        placed = set()
+        order = []
+        for goal in goals:
+            if goal in covered or goal in placed:
+                continue
+            root = self.ids.get(goal)
+            if root is None:
+                placed.add(goal)
+                order.append((goal, None))
+                continue
+            # Frames of (node, iterator over its prerequisites, who needed it)
+            on_path = {root}
+            stack = [(root, iter(self.prerequisites[root]), None)]
+            while stack:
+                node, pending, needed_for = stack[-1]
+                before = next(pending, None)
+                if before is None:
+                    stack.pop()
+                    on_path.discard(node)
+                    placed.add(self.names[node])
+                    order.append((self.names[node], needed_for))
+                    continue
+                name = self.names[before]
+                if name in covered or name in placed:
+                    continue
+                if before in on_path:
+                    raise PrerequisiteCycle(f"{name} is its own prerequisite")
+                on_path.add(before)
+                stack.append((before, iter(self.prerequisites[before]), None if name in goal_set else self.names[node]))
+        return order
+
+
+def study_day(session):
+    """Calendar day (from 1) of the session-th study session (from 0)"""
+    week, weekday = divmod(session, SCHEDULE_STUDY_DAYS)
+    return week * 7 + weekday + 1
+
+
+def pack_sessions(items, hours_per_week):
+    """Lay items of work out over study days within a weekly hours budget.
+
+    items: [(hours, payload)] in the order they are to be done. Each study
+    day holds up to hours_per_week / SCHEDULE_STUDY_DAYS hours; an item
+    starts in whatever is left of the current day and continues on the
+    following study days, so a day can hold the end of one item and the
+    start of the next. Returns [(day, hours, payload, part, parts)], one
+    per item per study day it uses, with part counting from 1.
+    """
+    capacity = max(hours_per_week, 1) / SCHEDULE_STUDY_DAYS
+    sessions = []
+    session, left = 0, capacity
+    for hours, payload in items:
+        pieces = []
+        remaining = max(hours, 0)
+        while True:
+            if round(left, 6) <= 0:
+                session, left = session + 1, capacity
+            piece = min(left, remaining)
+            pieces.append((study_day(session), piece))
+            left -= piece
+            remaining -= piece
+            if round(remaining, 6) <= 0:
+                break
+        for part, (day, piece) in enumerate(pieces, 1):
+            sessions.append((day, piece, payload, part, len(pieces)))
+    return sessions
@@ -0,0 +1,126 @@
+import re
+from collections import Counter
+
+# Characters that make up a "word" when deciding whether an alias stands on its own.
+# "ts" must not fire inside "results", nor "ai" inside "maintain".
+_WORD_CHARS = "a-z0-9"
+_END = ""
+
+
+def _is_word_char(char):
+    return char.isascii() and char.isalnum()
+
+
+def _trie_to_regex(node):
+    """Render a character trie as a regex fragment.
+
+    Sibling branches are factored by their shared prefix so the regex engine
+    only follows the branch for the next character, and longer aliases are
+    tried before shorter ones ("python 3" before "python").
+    """
+    branches = []
+    singles = []
+    for char in sorted(key for key in node if key != _END):
+        child = node[char]
+        token = r"\s+" if char == " " else re.escape(char)
+        if list(child) == [_END] and char != " ":
+            singles.append(token)
+        else:
+            branches.append(token + _trie_to_regex(child))
+
+    if singles:
+        branches.append(singles[0] if len(singles) == 1 else "[" + "".join(singles) + "]")
+
+    if not branches:
+        return ""
+    if _END in node:
+        return "(?:" + "|".join(branches) + ")?"
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+def normalize_skill(name):
+    """Lowercase a skill name and collapse internal whitespace to single spaces"""
+    return " ".join(name.lower().split())
+
+
+def build_skill_index(skills, synonyms):
+    """Map every alias (skill name or synonym) to the canonical skills it covers.
+
+    A regex match consumes its text, so an alias nested inside a longer one
+    ("gitlab" inside "gitlab ci") would never be reported on its own. The
+    skills of every nested alias are folded into the longer alias instead,
+    which keeps the index and the matcher in agreement.
+    """
+    aliases = {}
+    for skill in dict.fromkeys(skills):
+        for name in [skill] + list(synonyms.get(skill, [])):
+            alias = normalize_skill(name)
+            if alias:
+                aliases.setdefault(alias, set()).add(skill)
+
+    index = {}
+    for alias in aliases:
+        covered = set()
+        for start in range(len(alias)):
+            if start and _is_word_char(alias[start - 1]):
+                continue
+            for stop in range(start + 1, len(alias) + 1):
+                if stop < len(alias) and _is_word_char(alias[stop]):
+                    continue
+                covered.update(aliases.get(alias[start:stop], ()))
+        index[alias] = frozenset(covered)
+    return index
+
+
+def matcher_pattern(index):
+    """Regex source matching every alias of a skill index on word boundaries"""
+    trie = {}
+    for alias in index:
+        node = trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        node[_END] = True
+    return f"(?<![{_WORD_CHARS}])(?:{_trie_to_regex(trie)})(?![{_WORD_CHARS}])"
+
+
+class SkillMatcher:
+    """Finds every catalog skill mentioned in a text in a single regex pass.
+
+    The matcher is compiled once from a skill index (see build_skill_index).
+    Every alias maps back to the canonical skills it stands for, so "k8s"
+    reports "kubernetes" and "typescript" reports both "typescript" and
+    "javascript". `pattern` may be passed in when it was already rendered
+    from the same index with matcher_pattern, e.g. by a compiled catalog.
+    """
+
+    def __init__(self, index, pattern=None):
+        self.aliases = index
+        self._pattern = re.compile(pattern or matcher_pattern(index))
+
+    @property
+    def pattern(self):
+        """The regex source; it also compiles as a JavaScript RegExp"""
+        return self._pattern.pattern
+
+    def find(self, text):
+        """Return the sorted list of canonical skills mentioned in text"""
+        found = set()
+        seen_aliases = set()
+        for match in self._pattern.finditer(text.lower()):
+            alias = match.group()
+            if alias in seen_aliases:
+                continue
+            seen_aliases.add(alias)
+            found.update(self.aliases[normalize_skill(alias)])
+        return sorted(found)
+
+    def count(self, text, start=0, end=None):
+        """Counter of canonical skill -> mentions in already lowercased text[start:end]"""
+        end = len(text) if end is None else end
+        counts = Counter()
+        for alias, mentions in Counter(self._pattern.findall(text, start, end)).items():
+            for skill in self.aliases[normalize_skill(alias)]:
+                counts[skill] += mentions
+        return counts
@@ -0,0 +1,62 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from analysis_session import IncrementalSkillScan
+from app import app, catalog_store
+
+client = TestClient(app)
+LINES = [
+    "Built data pipelines in Python and SQL.",
+    "Deployed services with Docker and Kubernetes on AWS.",
+    "Frontend work in React and TypeScript.",
+    "Wrote documentation and ran team meetings.",
+    "Trained models with PyTorch and scikit-learn.",
+    "Automated releases with Jenkins and bash scripts.",
+    "",
+]
+
+
+def per_line_skills(matcher, text):
+    return sorted({skill for line in text.split("\n") for skill in matcher.find(line)})
+
+
+def test_incremental_scan_matches_full_rescan():
+    rng = random.Random(3)
+    matcher = catalog_store.current.skill_matcher
+    lines = [rng.choice(LINES) for _ in range(200)]
+    scan = IncrementalSkillScan(matcher, "\n".join(lines))
+
+    for _ in range(50):
+        position = rng.randrange(len(lines))
+        edit = rng.choice(["replace", "insert", "delete"])
+        if edit == "replace":
+            lines[position] = rng.choice(LINES)
+        elif edit == "insert":
+            lines.insert(position, rng.choice(LINES))
+        elif len(lines) > 1:
+            del lines[position]
+        before = scan.skills
+        added, removed = scan.update("\n".join(lines))
+
+        assert scan.skills == per_line_skills(matcher, "\n".join(lines))
+        assert set(added) == set(scan.skills) - set(before)
+        assert set(removed) == set(before) - set(scan.skills)
+        assert scan.rescanned <= 1
+
+
+def test_analysis_endpoints_return_deltas():
+    resume = "\n".join(["Data analyst.", "Reporting in Excel.", "Team player."])
+    started = client.post("/api/analysis", json={"resume_text": resume, "dream_role": "data_scientist"}).json()
+    assert "python" in started["missing_required"]
+
+    edited = resume.replace("Team player.", "Built models in Python and pandas.")
+    update = client.post(f"/api/analysis/{started['session_id']}", json={
+        "resume_text": edited, "dream_role": "data_scientist"
+    }).json()
+    assert update["lines_rescanned"] == 1
+    assert {"python", "pandas"} <= set(update["skills"]["added"])
+    assert "python" in update["missing_required"]["removed"]
+    assert update["skills"]["removed"] == []
+
+    assert client.post("/api/analysis/unknown", json={"resume_text": ""}).status_code == 404
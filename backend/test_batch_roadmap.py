@@ -0,0 +1,89 @@
+import json
+import weakref
+
+from fastapi.testclient import TestClient
+
+import app as app_module
+from app import UserProfile, app
+
+client = TestClient(app)
+
+
+def post_batch(profiles):
+    return client.post("/api/roadmap/batch", json={"profiles": profiles})
+
+
+def lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_results_stream_back_in_input_order():
+    profiles = [
+        {"resume_text": "Python and Docker", "dream_role": "devops_engineer", "hours_per_week": 10},
+        {"resume_text": "React and CSS", "dream_role": "fullstack_developer", "hours_per_week": 5},
+        {"resume_text": "Python and Docker", "dream_role": "devops_engineer", "hours_per_week": 10},
+        {"resume_text": "SQL", "dream_role": "data_scientist", "hours_per_week": 20},
+    ]
+    response = post_batch(profiles)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    results = lines(response)
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert all(result["success"] for result in results)
+    for profile, result in zip(profiles, results):
+        single = client.post("/api/roadmap", json=profile).json()
+        assert result["roadmap"] == single["roadmap"]
+
+
+def test_a_failing_profile_gets_an_error_line_and_the_stream_goes_on(monkeypatch):
+    build_roadmap = app_module.build_roadmap
+
+    def failing_for_one_role(profile, *args):
+        if profile.dream_role == "broken_role":
+            raise ValueError("no such role")
+        return build_roadmap(profile, *args)
+
+    monkeypatch.setattr(app_module, "build_roadmap", failing_for_one_role)
+    results = lines(post_batch([
+        {"resume_text": "Python", "dream_role": "ml_engineer"},
+        {"resume_text": "Python", "dream_role": "broken_role"},
+        {"resume_text": "Go", "dream_role": "devops_engineer"},
+    ]))
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert [result["success"] for result in results] == [True, False, True]
+    assert "no such role" in results[1]["error"]
+
+
+def test_an_oversized_batch_is_refused(monkeypatch):
+    monkeypatch.setattr(app_module, "BATCH_MAX_PROFILES", 2)
+    response = post_batch([{"resume_text": "Python"}] * 3)
+    assert response.status_code == 413
+    assert not response.json()["success"]
+    assert "max 2" in response.json()["error"]
+
+
+def test_identical_profiles_are_built_once_and_not_kept_past_their_last_use(monkeypatch):
+    class Roadmap(dict):
+        pass  # unlike dict, can be weakly referenced
+
+    built = []
+
+    def counting_build(profile, evidence):
+        roadmap = Roadmap(success=True, role=profile.dream_role)
+        built.append(weakref.ref(roadmap))
+        return roadmap
+
+    monkeypatch.setattr(app_module, "build_roadmap", counting_build)
+    a, b = UserProfile(resume_text="Python", dream_role="ml_engineer"), UserProfile(resume_text="Go")
+    results = app_module.create_roadmaps([a, b, a, b.model_copy(update={"dream_role": "devops_engineer"})])
+
+    assert next(results)["role"] == "ml_engineer"
+    assert next(results)["role"] == b.dream_role
+    assert next(results)["role"] == "ml_engineer"
+    # The second profile is not repeated, so its roadmap was not held on to
+    assert built[1]() is None
+    assert next(results)["role"] == "devops_engineer"
+    # Nor is the first, once its last duplicate has been sent
+    assert built[0]() is None
+    assert len(built) == 3
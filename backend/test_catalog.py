@@ -0,0 +1,84 @@
+import json
+import os
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+from app import app, catalog_store, profile_store
+from catalog import CATALOG_SEED_PATH, Catalog, CatalogError, CatalogStore, compile_catalog
+
+SOURCE = {
+    "job_requirements": {
+        "backend_developer": {
+            "required": ["python", "sql"],
+            "preferred": ["docker"],
+            "projects": ["Build a REST API"]
+        }
+    },
+    "learning_resources": {"python": "https://docs.python.org/3/tutorial/"},
+    "skill_synonyms": {"python": ["python", "py"], "sql": ["sql", "postgresql"]}
+}
+
+
+def test_compiled_catalog_matches_seed(tmp_path):
+    with open(CATALOG_SEED_PATH, encoding="utf-8") as f:
+        seed = json.load(f)
+    path = str(tmp_path / "catalog.db")
+    compile_catalog(seed, path)
+    catalog = Catalog(path)
+
+    assert dict(catalog.job_requirements) == seed["job_requirements"]
+    assert dict(catalog.learning_resources) == seed["learning_resources"]
+    assert catalog.skill_synonyms == seed["skill_synonyms"]
+    assert catalog.skill_matcher.find("5 years of k8s and postgresql") == ["kubernetes", "sql"]
+
+
+def test_store_reloads_replaced_catalog(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    compile_catalog(SOURCE, path)
+    store = CatalogStore(path, seed_path=None, interval=0)
+    old = store.current
+    assert not store.changed()
+
+    updated = json.loads(json.dumps(SOURCE))
+    updated["job_requirements"]["data_engineer"] = {"required": ["spark"], "preferred": [], "projects": []}
+    compile_catalog(updated, path)
+    assert store.changed()
+
+    store.reload()
+    assert store.current.version != old.version
+    assert "data_engineer" in store.current.job_requirements
+    # Requests still holding the old catalog keep working
+    assert old.job_requirements["backend_developer"]["required"] == ["python", "sql"]
+
+
+def test_rejects_other_format_versions(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    compile_catalog(SOURCE, path)
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA user_version = 99")
+    db.commit()
+    db.close()
+
+    with pytest.raises(CatalogError):
+        Catalog(path)
+    with pytest.raises(CatalogError):
+        Catalog(os.path.join(str(tmp_path), "missing.db"))
+
+
+def test_reload_endpoint_needs_the_admin_token(monkeypatch):
+    client = TestClient(app)
+    # Without ADMIN_TOKEN set, no header is accepted
+    assert client.post("/api/catalog/reload", headers={"X-Admin-Token": ""}).status_code == 403
+
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", "admin-token")
+    monkeypatch.setattr(profile_store, "token", "profile-token")
+    assert client.post("/api/catalog/reload").status_code == 403
+    assert client.post("/api/catalog/reload", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.post("/api/catalog/reload", headers={"X-Profile-Token": "profile-token"}).status_code == 403
+    response = client.post("/api/catalog/reload", headers={"X-Admin-Token": "admin-token"})
+    assert response.status_code == 200
+    assert response.json()["version"] == catalog_store.current.version
+    assert profile_store.ids() == []
@@ -0,0 +1,99 @@
+import json
+import os
+import random
+import shutil
+import subprocess
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import UserProfile, app, catalog_store, collect_user_skills, find_skill_gaps
+
+client = TestClient(app)
+GAP_PREVIEW_JS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend", "gap_preview.js")
+
+# Reads {"bundle", "profiles"} on stdin and prints the preview of each profile
+NODE_RUNNER = """
+const {createGapPreview} = require(process.argv[1]);
+let input = '';
+process.stdin.on('data', chunk => input += chunk);
+process.stdin.on('end', () => {
+    const {bundle, profiles} = JSON.parse(input);
+    const gaps = createGapPreview(bundle);
+    console.log(JSON.stringify(profiles.map(profile => gaps.preview(profile))));
+});
+"""
+
+
+def fetch_bundle():
+    version = client.get("/api/catalog").json()["version"]
+    return client.get(f"/api/catalog/bundle/{version}").json()
+
+
+def server_preview(profile):
+    catalog = catalog_store.current
+    skills = collect_user_skills(UserProfile(**profile), catalog=catalog)
+    required, preferred = find_skill_gaps(catalog.job_requirements[profile["dream_role"]], skills, catalog)
+    return {"skills_found": skills, "skill_gaps": {"required": required, "preferred": preferred}}
+
+
+def make_profiles(count, seed=3):
+    """Profiles built from every catalog alias, odd spacing and case, and skills the catalog lacks"""
+    rng = random.Random(seed)
+    catalog = catalog_store.current
+    roles = list(catalog.job_requirements)
+    aliases = list(catalog.skill_index)
+    fillers = ["and", "with", "/", ",", "(", ")", "-", "built", "5 years of", "C++", "C#", ".NET", "node.js",
+               "cobol", "knitting", "java-script", "\n", "\t", "  "]
+    profiles = [
+        {"resume_text": alias, "dream_role": roles[index % len(roles)], "current_skills": [alias.upper()]}
+        for index, alias in enumerate(aliases)
+    ]
+    for _ in range(count):
+        words = rng.sample(aliases, rng.randint(0, 8)) + rng.sample(fillers, rng.randint(0, 6))
+        rng.shuffle(words)
+        text = " ".join(word.title() if rng.random() < 0.3 else word for word in words)
+        current = [rng.choice(aliases + fillers).replace(" ", rng.choice([" ", "  ", "\t"])) for _ in range(rng.randint(0, 4))]
+        profiles.append({"resume_text": text, "dream_role": rng.choice(roles), "current_skills": current + ["", " "]})
+    return profiles
+
+
+def test_bundle_is_versioned_and_cacheable():
+    version = client.get("/api/catalog").json()["version"]
+    response = client.get(f"/api/catalog/bundle/{version}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "immutable" in response.headers["cache-control"]
+    bundle = response.json()
+    assert bundle["version"] == version
+    assert bundle["roles"]["data_scientist"][0] == catalog_store.current.job_requirements["data_scientist"]["required"]
+
+    stale = client.get("/api/catalog/bundle/0000")
+    assert stale.status_code == 404 and stale.json()["version"] == version
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run frontend/gap_preview.js")
+def test_browser_gaps_match_the_server():
+    profiles = make_profiles(500)
+    result = subprocess.run(
+        ["node", "-e", NODE_RUNNER, GAP_PREVIEW_JS],
+        input=json.dumps({"bundle": fetch_bundle(), "profiles": profiles}),
+        capture_output=True, text=True, timeout=60, check=True
+    )
+    previews = json.loads(result.stdout)
+    assert len(previews) == len(profiles)
+    mismatches = [
+        (profile, browser) for profile, browser in zip(profiles, previews)
+        if browser != server_preview(profile)
+    ]
+    assert not mismatches, mismatches[:3]
+
+
+def test_server_preview_is_what_the_roadmap_reports():
+    profile = {"resume_text": "Python, pandas and SQL; some K8s", "dream_role": "data_scientist",
+               "current_skills": ["Tableau", "knitting"]}
+    roadmap = client.post("/api/roadmap", json=profile).json()["roadmap"]
+    preview = server_preview(profile)
+    assert preview["skills_found"] == roadmap["analysis"]["skills_found"]
+    assert preview["skill_gaps"]["required"] == roadmap["skill_gaps"]["required"]
+    # The roadmap lists the first three preferred gaps
+    assert preview["skill_gaps"]["preferred"][:3] == roadmap["skill_gaps"]["preferred"]
@@ -0,0 +1,215 @@
+import asyncio
+import http.server
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+import pytest
+
+import jobs
+from app import app, job_queue
+
+RESUME = b"Data analyst with Python, SQL and pandas experience."
+
+
+def run_with_client(scenario):
+    """Run scenario(client) on one event loop, which the queue's workers live on"""
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await scenario(client)
+        finally:
+            await job_queue.shutdown()
+    asyncio.run(main())
+
+
+async def wait_for(client, job_id, timeout=10):
+    for _ in range(int(timeout / 0.02)):
+        job = (await client.get(f"/api/jobs/{job_id}")).json()
+        if job["status"] in ("done", "failed"):
+            return job
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_resume_job_extracts_and_builds_roadmap():
+    async def scenario(client):
+        response = await client.post(
+            "/api/jobs/resume",
+            files={"file": ("resume.txt", RESUME, "text/plain")},
+            data={"dream_role": "data_scientist", "current_skills": "excel"}
+        )
+        assert response.status_code == 202
+        job = await wait_for(client, response.json()["job_id"])
+
+        assert job["status"] == "done"
+        assert "pandas" in job["result"]["extraction"]["extracted_text"]
+        roadmap = job["result"]["roadmap"]
+        assert roadmap["roadmap_id"]
+        assert roadmap["roadmap"]["analysis"]["total_skills"] > 0
+    run_with_client(scenario)
+
+
+def test_same_resume_and_options_reuse_the_job():
+    async def scenario(client):
+        upload = {"file": ("cv.txt", RESUME + b" Docker.", "text/plain")}
+        first = (await client.post("/api/jobs/resume", files=upload)).json()
+        again = (await client.post("/api/jobs/resume", files=upload)).json()
+        other = (await client.post("/api/jobs/resume", files=upload, data={"dream_role": "ml_engineer"})).json()
+
+        assert again["deduplicated"] and again["job_id"] == first["job_id"]
+        assert not other["deduplicated"] and other["job_id"] != first["job_id"]
+        assert "roadmap" not in (await wait_for(client, first["job_id"]))["result"]
+        assert (await client.get("/api/jobs")).json()["deduplicated"] >= 1
+    run_with_client(scenario)
+
+
+def test_unknown_job_and_bad_callback():
+    async def scenario(client):
+        assert (await client.get("/api/jobs/nope")).status_code == 404
+        response = await client.post(
+            "/api/jobs/resume",
+            files={"file": ("cv.txt", RESUME, "text/plain")},
+            data={"callback_url": "file:///etc/passwd"}
+        )
+        assert response.status_code == 400
+    run_with_client(scenario)
+
+
+def test_callbacks_to_internal_addresses_are_refused(monkeypatch):
+    async def scenario(client):
+        for url in ("http://127.0.0.1:8888/hook", "http://169.254.169.254/latest/meta-data",
+                    "http://10.0.0.7/hook", "http://[::1]/hook", "http://localhost/hook"):
+            response = await client.post(
+                "/api/jobs/resume",
+                files={"file": ("cv.txt", RESUME, "text/plain")},
+                data={"callback_url": url}
+            )
+            assert response.status_code == 400, url
+            assert "non-public" in response.json()["error"]
+
+        monkeypatch.setattr(jobs, "JOB_CALLBACK_HOSTS", {"hooks.example.com"})
+        with pytest.raises(jobs.CallbackRejected, match="not in JOB_CALLBACK_HOSTS"):
+            jobs.check_callback_url("https://other.example.com/hook")
+        jobs.check_callback_url("https://hooks.example.com/hook")
+    run_with_client(scenario)
+
+
+class Receiver(http.server.BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        Receiver.received.append((self.path, json.loads(body)))
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_deduplicated_submissions_get_their_callbacks(monkeypatch):
+    server = http.server.HTTPServer(("127.0.0.1", 0), Receiver)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    # Allowlisted hosts are trusted, even on loopback
+    monkeypatch.setattr(jobs, "JOB_CALLBACK_HOSTS", {"127.0.0.1"})
+
+    async def scenario(client):
+        upload = {"file": ("cv.txt", RESUME + b" Airflow.", "text/plain")}
+        first = (await client.post("/api/jobs/resume", files=upload, data={"callback_url": f"{base}/a"})).json()
+        again = (await client.post("/api/jobs/resume", files=upload, data={"callback_url": f"{base}/b"})).json()
+        assert again["deduplicated"] and again["callback_registered"]
+
+        await wait_for(client, first["job_id"])
+        for _ in range(250):
+            job = (await client.get(f"/api/jobs/{first['job_id']}")).json()
+            if None not in job["callback_status"].values():
+                break
+            await asyncio.sleep(0.02)
+        assert job["callback_status"] == {f"{base}/a": 204, f"{base}/b": 204}
+        assert sorted(path for path, _ in Receiver.received) == ["/a", "/b"]
+
+        # The job is finished: a late duplicate is told its callback will not come
+        late = (await client.post("/api/jobs/resume", files=upload, data={"callback_url": f"{base}/c"})).json()
+        assert late["deduplicated"] and not late["callback_registered"]
+    try:
+        run_with_client(scenario)
+    finally:
+        server.shutdown()
+
+
+def start_server(tmp_path, port):
+    """A `python main.py` server with one worker, its data files in tmp_path"""
+    env = dict(
+        os.environ,
+        WEB_WORKERS="1",
+        HOST="127.0.0.1",
+        PORT=str(port),
+        LOG_LEVEL="WARNING",
+        JOB_DB_PATH=str(tmp_path / "jobs.db"),
+        ANALYSIS_DB_PATH=str(tmp_path / "analysis.db"),
+        PROGRESS_DB_PATH=str(tmp_path / "progress.db"),
+        CATALOG_PATH=str(tmp_path / "catalog.db"),
+        PROFILE_DIR=str(tmp_path / "profiles"),
+    )
+    backend = os.path.dirname(os.path.abspath(__file__))
+    return subprocess.Popen([sys.executable, "main.py"], cwd=backend, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(base, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return httpx.get(f"{base}/api/jobs")
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise AssertionError(f"{base} did not start")
+
+
+def test_jobs_and_sessions_are_visible_from_another_worker(tmp_path):
+    ports = [free_port(), free_port()]
+    servers = [start_server(tmp_path, port) for port in ports]
+    first, second = [f"http://127.0.0.1:{port}" for port in ports]
+    try:
+        # Both are up before the first job: a starting server fails unfinished jobs
+        for base in (first, second):
+            wait_until_up(base)
+
+        submitted = httpx.post(f"{first}/api/jobs/resume", files={"file": ("cv.txt", RESUME, "text/plain")}).json()
+        for _ in range(500):
+            job = httpx.get(f"{second}/api/jobs/{submitted['job_id']}").json()
+            if job.get("status") in ("done", "failed"):
+                break
+            time.sleep(0.02)
+        assert job["status"] == "done"
+        assert "pandas" in job["result"]["extraction"]["extracted_text"]
+
+        # A retry landing on the other worker gets the same job back
+        again = httpx.post(f"{second}/api/jobs/resume", files={"file": ("cv.txt", RESUME, "text/plain")}).json()
+        assert again["deduplicated"] and again["job_id"] == submitted["job_id"]
+
+        profile = {"dream_role": "data_scientist", "resume_text": "Python\nSQL"}
+        session = httpx.post(f"{first}/api/analysis", json=profile).json()
+        profile["resume_text"] += "\npandas"
+        update = httpx.post(f"{second}/api/analysis/{session['session_id']}", json=profile).json()
+        assert update["success"]
+        assert update["skills"] == {"added": ["pandas"], "removed": []}
+        assert update["lines_rescanned"] == 3
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait(timeout=30)
@@ -0,0 +1,41 @@
+import json
+import os
+import sys
+
+import pytest
+
+import logging_setup
+from logging_setup import log_request, setup_logging, shutdown_logging
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_a_forked_child_sets_up_its_own_listener():
+    setup_logging()
+    parent_listener = logging_setup._listener
+    assert parent_listener is not None
+    read_end, write_end = os.pipe()
+
+    # The parent's listener is still running, as when the supervisor respawns a worker
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            sys.stderr = os.fdopen(write_end, "w")
+            inherited = logging_setup._listener
+            setup_logging()
+            log_request("child_ready", pid=os.getpid())
+            shutdown_logging()
+            status = 0 if inherited is None and logging_setup._listener is None else 2
+        finally:
+            os._exit(status)
+
+    os.close(write_end)
+    with os.fdopen(read_end) as child_stderr:
+        output = child_stderr.read()
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    records = [json.loads(line) for line in output.splitlines() if line.startswith("{")]
+    assert [record["event"] for record in records] == ["child_ready"]
+    assert records[0]["pid"] == pid
+    # The parent's logging is untouched
+    assert logging_setup._listener is parent_listener
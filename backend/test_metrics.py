@@ -0,0 +1,42 @@
+from fastapi.testclient import TestClient
+
+from app import app
+from metrics import Counter, Histogram, REGISTRY
+
+client = TestClient(app)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test histogram", ("stage",), buckets=(0.1, 1))
+    REGISTRY.remove(histogram)
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, "parse")
+
+    lines = histogram.render()
+    assert 'test_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="parse",le="1"} 2' in lines
+    assert 'test_seconds_bucket{stage="parse",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="parse"} 3' in lines
+    assert 'test_seconds_sum{stage="parse"} 5.55' in lines
+
+
+def test_counter_counts_per_label():
+    counter = Counter("test_total", "Test counter", ("reason",))
+    REGISTRY.remove(counter)
+    counter.inc("timeout")
+    counter.inc("timeout")
+    counter.inc("legacy_doc")
+    assert counter.value("timeout") == 2
+    assert 'test_total{reason="legacy_doc"} 1' in counter.render()
+
+
+def test_metrics_endpoint_reports_roadmap_stages():
+    client.post("/api/roadmap", json={"resume_text": "Python and Docker", "dream_role": "ml_engineer"})
+    client.post("/api/adapt", json={"completed_days": [1, 2, 3]})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for stage in ("skill_match", "gap_analysis", "roadmap_build", "adapt"):
+        assert f'career_navigator_stage_duration_seconds_count{{stage="{stage}"}}' in response.text
+    assert 'route="/api/roadmap",method="POST",status="200"' in response.text
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+import app as app_module
+from app import app
+from benchmarks.corpus import write_pdf
+from extraction import EXTRACTORS, extract_document
+from parse_pool import ParsePool
+
+client = TestClient(app)
+
+
+def test_a_document_takes_one_slot_however_many_chunks(tmp_path):
+    pdf = tmp_path / "long.pdf"
+    write_pdf("\n".join(f"Page line {line}: Python and Kubernetes" for line in range(400)), str(pdf), lines_per_page=10)
+    pool = ParsePool(kind="thread", workers=2, max_queue=0)
+
+    async def scenario():
+        extraction = asyncio.create_task(extract_document(pool, str(pdf), "pdf", pages_per_chunk=4))
+        seen = []
+        while not extraction.done():
+            seen.append(pool.in_flight)
+            await asyncio.sleep(0.001)
+        return await extraction, seen
+
+    result, seen = asyncio.run(scenario())
+    assert result["success"] and result["metadata"]["pages_parsed"] == 40
+    # Ten chunks of one document, one slot: a second upload still fits
+    assert max(seen) == 1
+    assert pool.in_flight == 0
+    pool.shutdown()
+
+
+def slow_pool(monkeypatch, workers=1, max_queue=0, timeout=30):
+    pool = ParsePool(kind="thread", workers=workers, max_queue=max_queue, timeout=timeout)
+    monkeypatch.setattr(app_module, "parse_pool", pool)
+    return pool
+
+
+def post_pdf(pdf):
+    return client.post("/api/extract-resume-raw?filename=cv.pdf", content=pdf.read_bytes(),
+                       headers={"Content-Type": "application/pdf"})
+
+
+def test_full_pool_answers_503(tmp_path, monkeypatch):
+    pool = slow_pool(monkeypatch, workers=1, max_queue=1)
+    pdf = tmp_path / "cv.pdf"
+    write_pdf("Python and SQL", str(pdf))
+    held = [pool.admit(), pool.admit()]
+
+    response = post_pdf(pdf)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+    assert not response.json()["success"]
+
+    held[0].close()
+    assert post_pdf(pdf).json()["success"]
+    held[1].close()
+    assert pool.in_flight == 0
+    pool.shutdown()
+
+
+def test_timed_out_parse_keeps_its_slot_until_the_worker_returns(tmp_path, monkeypatch):
+    pool = slow_pool(monkeypatch, timeout=0.1)
+    release = threading.Event()
+
+    def stuck_backend(path, start, stop):
+        release.wait(10)
+        yield "Python"
+
+    monkeypatch.setitem(EXTRACTORS, "pdf", [("stuck", stuck_backend)])
+    pdf = tmp_path / "cv.pdf"
+    # Not extracted before, so the extraction cache cannot answer
+    write_pdf("Go and Rust, never cached", str(pdf))
+
+    response = post_pdf(pdf)
+    assert "longer than" in response.json()["error"]
+    # The worker is still parsing: the slot is held and the next upload is turned away
+    assert pool.in_flight == 1
+    assert post_pdf(pdf).status_code == 503
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while pool.in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.in_flight == 0
+    pool.shutdown()
@@ -0,0 +1,46 @@
+from fastapi.testclient import TestClient
+
+from app import app, extract_skill_evidence, extract_skills_from_text
+
+client = TestClient(app)
+RESUME = (
+    "Backend engineer with 5 years of experience with Python and SQL, proficient in Docker.\n"
+    "Built an internal dashboard using React. Expertise in machine learning.\n"
+    "3+ yrs AWS. Used Git once for a class project."
+)
+
+
+def test_evidence_per_skill():
+    evidence = extract_skill_evidence(RESUME)
+    assert evidence["python"]["years"] == 5 and evidence["sql"]["years"] == 5
+    assert evidence["aws"]["years"] == 3
+    assert evidence["docker"]["level"] == "proficient"
+    assert evidence["react"]["level"] == "hands-on"
+    assert evidence["machine learning"]["level"] == "expert"
+    assert evidence["git"] == {"mentions": 1, "years": None, "level": "mentioned", "confidence": 0.4}
+    assert evidence["python"]["confidence"] > evidence["docker"]["confidence"] > evidence["git"]["confidence"]
+
+
+def test_evidence_covers_the_same_skills_as_the_matcher():
+    assert list(extract_skill_evidence(RESUME)) == extract_skills_from_text(RESUME)
+    assert extract_skill_evidence("") == {}
+
+
+def test_cue_does_not_run_past_its_sentence():
+    evidence = extract_skill_evidence("Proficient in Docker. Kubernetes for two weeks.")
+    assert evidence["docker"]["level"] == "proficient"
+    assert evidence["kubernetes"]["level"] == "mentioned"
+
+
+def test_mentions_fold_synonyms():
+    evidence = extract_skill_evidence("k8s and Kubernetes, then K8s again")
+    assert evidence["kubernetes"]["mentions"] == 3
+
+
+def test_roadmap_reports_proficiency():
+    profile = {"resume_text": RESUME, "dream_role": "devops_engineer", "hours_per_week": 10}
+    first = client.post("/api/roadmap", json=profile).json()["roadmap"]["analysis"]["proficiency"]
+    # The second request is served from the roadmap caches
+    second = client.post("/api/roadmap", json=profile).json()["roadmap"]["analysis"]["proficiency"]
+    assert first == second
+    assert first["python"]["years"] == 5
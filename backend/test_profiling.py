@@ -0,0 +1,115 @@
+import pstats
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+from app import UserProfile, app, catalog_store, profile_store, raw_profile_key
+from benchmarks.corpus import write_pdf
+
+client = TestClient(app)
+TOKEN = "test-profile-token"
+ADMIN = "test-admin-token"
+PROFILE = {"resume_text": "Python, Docker and some SQL", "dream_role": "devops_engineer", "hours_per_week": 11}
+
+
+@pytest.fixture
+def profiling(monkeypatch):
+    monkeypatch.setattr(profile_store, "token", TOKEN)
+    monkeypatch.setattr(profile_store, "mode", "cprofile")
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", ADMIN)
+    return profile_store
+
+
+def admin_get(path):
+    return client.get(path, headers={"X-Admin-Token": ADMIN})
+
+
+def test_requests_are_not_profiled_by_default():
+    response = client.post("/api/roadmap", json=PROFILE, headers={"X-Profile-Token": TOKEN})
+    assert "x-profile-id" not in response.headers
+    assert profile_store.ids() == []
+    assert client.get("/api/profiles", headers={"X-Admin-Token": ""}).status_code == 403
+
+
+def test_token_header_profiles_a_roadmap_request(profiling, tmp_path):
+    assert "x-profile-id" not in client.post("/api/roadmap", json=PROFILE, headers={"X-Profile-Token": "wrong"}).headers
+    # Not built before, so the profile covers every stage rather than a cache hit
+    fresh = {**PROFILE, "resume_text": PROFILE["resume_text"] + " and Terraform"}
+    response = client.post("/api/roadmap", json=fresh, headers={"X-Profile-Token": TOKEN})
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+
+    assert client.get("/api/profiles").status_code == 403
+    # The profiling token does not open the admin endpoints
+    assert client.get("/api/profiles", headers={"X-Profile-Token": TOKEN}).status_code == 403
+    listed = admin_get("/api/profiles").json()
+    assert [entry["id"] for entry in listed["profiles"]] == [profile_id]
+
+    summary = admin_get(f"/api/profiles/{profile_id}").json()
+    assert summary["reason"] == "header" and summary["status"] == 200
+    assert summary["fingerprint"] == raw_profile_key(UserProfile(**fresh), catalog_store.current)
+    stages = {entry["stage"] for entry in summary["stages"]}
+    assert {"roadmap_build", "skill_match", "gap_analysis"} <= stages
+    assert any("assemble_roadmap" in entry["function"] for entry in summary["top"])
+
+    download = admin_get(f"/api/profiles/{profile_id}/download")
+    assert download.status_code == 200
+    saved = tmp_path / "download.prof"
+    saved.write_bytes(download.content)
+    functions = {name for _, _, name in pstats.Stats(str(saved)).stats}
+    assert "find_skill_gaps" in functions
+
+    assert admin_get("/api/profiles/../../etc/passwd").status_code == 404
+    assert admin_get("/api/profiles/20260101T000000.000000-00000000").status_code == 404
+
+
+def test_pdf_backends_are_profiled_in_the_parse_pool(profiling, tmp_path):
+    pdf = tmp_path / "resume.pdf"
+    write_pdf("Senior engineer\n" + "Kubernetes, Terraform and Python on AWS.\n" * 200, str(pdf))
+    response = client.post(
+        "/api/extract-resume-raw?filename=resume.pdf",
+        content=pdf.read_bytes(),
+        headers={"Content-Type": "application/pdf", "X-Profile-Token": TOKEN}
+    )
+    assert response.json()["success"]
+    summary = admin_get(f"/api/profiles/{response.headers['x-profile-id']}").json()
+    stages = [entry["stage"] for entry in summary["stages"]]
+    assert "parse:page_count" in stages and "parse:extract_pages" in stages
+    assert any(stage.startswith("extract:") for stage in stages)
+    assert summary["top"]
+
+
+def test_sampled_requests_use_the_stack_sampler(profiling, monkeypatch):
+    monkeypatch.setattr(profile_store, "token", "")
+    monkeypatch.setattr(profile_store, "sample_rate", 1.0)
+    monkeypatch.setattr(profile_store, "mode", "sample")
+    monkeypatch.setattr(profile_store, "keep", 2)
+    assert "x-profile-id" not in client.get("/api/catalog").headers
+
+    ids = []
+    for hours in (5, 6, 7):
+        response = client.post("/api/roadmap", json={**PROFILE, "hours_per_week": hours})
+        ids.append(response.headers["x-profile-id"])
+    # Only the newest `keep` are stored
+    assert profile_store.ids() == ids[1:]
+
+    monkeypatch.setattr(profile_store, "token", TOKEN)
+    summary = admin_get(f"/api/profiles/{ids[-1]}").json()
+    assert summary["reason"] == "sampled" and summary["mode"] == "sample"
+    assert "roadmap_build" in {entry["stage"] for entry in summary["stages"]}
+    download = admin_get(f"/api/profiles/{ids[-1]}/download")
+    assert download.headers["content-type"].startswith("text/plain")
+
+
+def test_reading_profiles_does_not_store_more(profiling):
+    response = client.post("/api/roadmap", json={**PROFILE, "hours_per_week": 9}, headers={"X-Profile-Token": TOKEN})
+    profile_id = response.headers["x-profile-id"]
+
+    listed = admin_get("/api/profiles")
+    assert "x-profile-id" not in listed.headers
+    admin_get(f"/api/profiles/{profile_id}")
+    admin_get(f"/api/profiles/{profile_id}/download")
+    again = admin_get("/api/profiles").json()
+    assert len(again["profiles"]) == len(listed.json()["profiles"]) == 1
+    assert profiling.ids() == [profile_id]
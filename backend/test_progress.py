@@ -0,0 +1,72 @@
+from fastapi.testclient import TestClient
+
+from app import UserProfile, adapt_from_progress, app, build_roadmap
+from progress_store import DAY_SECONDS, ProgressStore
+
+client = TestClient(app)
+CREATED = 1_700_000_000.0
+
+
+def make_store():
+    store = ProgressStore(":memory:")
+    roadmap = build_roadmap(UserProfile(resume_text="python", dream_role="data_scientist"))["roadmap"]
+    return store, store.save_roadmap(roadmap, "data_scientist", now=CREATED), roadmap
+
+
+def test_records_completions_per_skill():
+    store, roadmap_id, roadmap = make_store()
+    first_skill = roadmap["weeks"][0]["tasks"][0]["skill"]
+    first_skill_tasks = sum(task.get("skill") == first_skill for week in roadmap["weeks"] for task in week["tasks"])
+
+    assert store.record(roadmap_id, completed=[1, 2, 99], now=CREATED + DAY_SECONDS)
+    progress = store.progress(roadmap_id, now=CREATED + 2 * DAY_SECONDS)
+    assert progress["completed_tasks"] == [1, 2]
+    assert progress["skills"][first_skill] == {"completed": 2, "total": first_skill_tasks}
+    assert progress["pace"]["weekly"] == [2]
+
+    store.record(roadmap_id, uncompleted=[2])
+    assert store.progress(roadmap_id)["completed_tasks"] == [1]
+    assert not store.record("missing", completed=[1])
+    assert store.progress("missing") is None
+
+
+def test_roadmaps_saved_with_one_task_per_day_are_still_read():
+    store = ProgressStore(":memory:")
+    # Stored as [day, skill], the day doubling as the task id
+    store._db.execute("INSERT INTO roadmaps (id, created, role, tasks) VALUES (?, ?, ?, ?)",
+                      ("old", CREATED, "data_scientist", '[[1,"sql"],[2,"sql"],[8,null]]'))
+    assert store.record("old", completed=[2, 3], now=CREATED + DAY_SECONDS)
+    progress = store.progress("old", now=CREATED + DAY_SECONDS)
+    assert progress["completed_tasks"] == [2]
+    assert progress["plan_days"] == 8
+    assert progress["skills"]["sql"] == {"completed": 1, "total": 2}
+
+
+def test_adaptation_follows_history():
+    store, roadmap_id, roadmap = make_store()
+    task_ids = [task["id"] for week in roadmap["weeks"] for task in week["tasks"]]
+
+    store.record(roadmap_id, completed=task_ids[:12], now=CREATED + DAY_SECONDS)
+    assert adapt_from_progress(store.progress(roadmap_id, now=CREATED + 2 * DAY_SECONDS))["action"] == "accelerate"
+    assert adapt_from_progress(store.progress(roadmap_id, now=CREATED + 12 * DAY_SECONDS))["action"] == "maintain"
+
+    store.record(roadmap_id, uncompleted=task_ids[1:12])
+    behind = adapt_from_progress(store.progress(roadmap_id, now=CREATED + 20 * DAY_SECONDS))
+    assert behind["action"] == "simplify"
+    assert behind["focus_skills"]
+
+
+def test_progress_endpoints(temp_progress_store):
+    result = client.post("/api/roadmap", json={"resume_text": "python sql"}).json()
+    roadmap_id = result["roadmap_id"]
+    assert temp_progress_store.progress(roadmap_id) is not None
+    task_ids = [task["id"] for week in result["roadmap"]["weeks"] for task in week["tasks"]]
+
+    response = client.post(f"/api/progress/{roadmap_id}", json={"completed": [1, 2, 3]})
+    assert response.json()["completed"] == 3
+    assert client.get(f"/api/progress/{roadmap_id}").json()["progress"]["completed_tasks"] == [1, 2, 3]
+    client.post(f"/api/progress/{roadmap_id}", json={"completed": task_ids[:len(task_ids) // 2]})
+    assert client.post("/api/adapt", json={"roadmap_id": roadmap_id}).json()["action"] == "accelerate"
+    assert client.get("/api/progress/nope").status_code == 404
+    # Clients that still send their full state get the old thresholds
+    assert client.post("/api/adapt", json={"completed_days": [1]}).json()["action"] == "simplify"
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from app import app
+from responses import COMPRESSORS, negotiate_encoding
+
+client = TestClient(app)
+PROFILE = {"resume_text": "Python, SQL and pandas", "dream_role": "data_scientist", "hours_per_week": 10}
+
+
+def test_negotiate_encoding():
+    preferred = next(iter(COMPRESSORS))
+    assert negotiate_encoding("gzip, deflate, br") == preferred
+    assert negotiate_encoding("gzip;q=0.5, identity") == "gzip"
+    assert negotiate_encoding("*") == preferred
+    assert negotiate_encoding("gzip;q=0, br;q=0") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("") is None
+
+
+def test_roadmap_is_compressed_when_accepted():
+    plain = client.post("/api/roadmap", json=PROFILE, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    for encoding in COMPRESSORS:
+        response = client.post("/api/roadmap", json=PROFILE, headers={"Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(plain.content)
+        # Same body once decoded, apart from the new roadmap id
+        assert response.json()["roadmap"] == plain.json()["roadmap"]
+
+
+def test_small_responses_are_not_compressed():
+    response = client.get("/api/jobs", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
@@ -0,0 +1,101 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app import UserProfile, app, build_roadmap, catalog_store, profile_keys, raw_profile_key, roadmap_cache
+from roadmap_cache import SingleFlight, TTLCache
+
+client = TestClient(app)
+
+
+def test_cached_roadmap_matches_fresh_build():
+    profile = UserProfile(resume_text="Python, SQL and Docker", dream_role="fullstack_developer", current_skills=["k8s"])
+    first = build_roadmap(profile)
+    cached = build_roadmap(profile)
+
+    roadmap_cache.clear()
+    profile_keys.clear()
+    fresh = build_roadmap(profile)
+
+    assert first == cached == fresh
+
+
+def test_profiles_with_same_canonical_skills_share_an_entry():
+    roadmap_cache.clear()
+    profile_keys.clear()
+    hits = roadmap_cache.hits
+    build_roadmap(UserProfile(resume_text="python and sql", dream_role="data_scientist"))
+    build_roadmap(UserProfile(resume_text="", current_skills=["SQL", "Python"], dream_role="data_scientist"))
+
+    assert roadmap_cache.stats()["entries"] == 1
+    assert roadmap_cache.hits == hits + 1
+
+
+def test_ttl_cache_expires_and_evicts():
+    cache = TTLCache(max_entries=2, ttl=0.05)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+    assert cache.get("a") is None
+    assert cache.evictions == 1
+
+    time.sleep(0.06)
+    assert cache.get("c") is None
+    assert cache.expirations == 1
+
+
+def test_single_flight_shares_a_running_call():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def build():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return {"built": len(calls)}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("key", build)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(flights.do("key", build))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    while flights.shared < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert all(result == {"built": 1} for result, _ in results)
+    assert flights.stats()["in_flight"] == 0
+    # Finished calls are not remembered
+    assert flights.do("key", build) == ({"built": 2}, False)
+
+
+def test_profile_key_ignores_case_whitespace_and_skill_order():
+    catalog = catalog_store.current
+    key = raw_profile_key(UserProfile(resume_text="Python and SQL", current_skills=["Docker", "k8s"]), catalog)
+    same = raw_profile_key(UserProfile(resume_text=" python and sql\n", current_skills=["k8s ", "docker"]), catalog)
+    other = raw_profile_key(UserProfile(resume_text="Python and SQL", current_skills=["Docker"]), catalog)
+    assert key == same != other
+
+
+def test_roadmap_revalidates_with_etag():
+    profile = {"resume_text": "Python, SQL and Docker", "dream_role": "data_scientist", "hours_per_week": 12}
+    first = client.post("/api/roadmap", json=profile)
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    unchanged = client.post("/api/roadmap", json=profile, headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b"" and unchanged.headers["etag"] == etag
+
+    changed = client.post("/api/roadmap", json={**profile, "hours_per_week": 20}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert changed.json()["roadmap_id"] != first.json()["roadmap_id"]
@@ -0,0 +1,59 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from app import app, canonical_skill_ids, catalog_store, find_skill_gaps
+from role_ranker import PREFERRED_WEIGHT, REQUIRED_WEIGHT, RoleRanker
+
+client = TestClient(app)
+
+
+def brute_force_scores(roles, covered):
+    scores = {}
+    for role, required, preferred in roles:
+        preferred = [skill for skill in preferred if skill not in required]
+        have = REQUIRED_WEIGHT * sum(skill in covered for skill in required)
+        have += PREFERRED_WEIGHT * sum(skill in covered for skill in preferred)
+        scores[role] = have / (REQUIRED_WEIGHT * len(required) + PREFERRED_WEIGHT * len(preferred))
+    return scores
+
+
+def test_packed_and_sparse_columns_score_the_same():
+    rng = random.Random(5)
+    skills = [f"skill {i}" for i in range(4000)]
+    # "skill 0".."skill 4" are in most roles (packed), the rest are rare (sparse)
+    roles = [
+        (f"role {i}", rng.sample(skills[:5], 2) + rng.sample(skills[5:], 3), rng.sample(skills[5:], 3))
+        for i in range(2000)
+    ]
+    ranker = RoleRanker(roles)
+    assert ranker.packed and ranker.sparse
+
+    for _ in range(20):
+        covered = set(skills[:3] + rng.sample(skills, 300))
+        expected = brute_force_scores(roles, covered)
+        ranked = ranker.rank(covered, top_k=5)
+        assert [entry["score"] for entry in ranked] == sorted(
+            (round(score, 3) for score in expected.values()), reverse=True)[:5]
+        for entry in ranked:
+            assert entry["score"] == round(expected[entry["role"]], 3)
+
+
+def test_gaps_match_find_skill_gaps():
+    catalog = catalog_store.current
+    user_skills = ["python", "sql", "docker", "js"]
+    ranked = catalog.role_ranker.rank(canonical_skill_ids(user_skills), top_k=len(catalog.job_requirements))
+
+    assert len(ranked) == len(catalog.job_requirements)
+    for entry in ranked:
+        missing_required, missing_preferred = find_skill_gaps(catalog.job_requirements[entry["role"]], user_skills)
+        assert entry["missing_required"] == missing_required
+        assert entry["missing_preferred"] == missing_preferred
+
+
+def test_rank_endpoint():
+    response = client.post("/api/roles/rank", json={"resume_text": "Python, pandas, SQL and statistics", "top_k": 2})
+    data = response.json()
+    assert data["success"]
+    assert [entry["role"] for entry in data["roles"]][0] == "data_scientist"
+    assert len(data["roles"]) == 2
@@ -0,0 +1,85 @@
+import pytest
+
+from app import UserProfile, assemble_roadmap, build_roadmap, catalog_store
+from catalog import CatalogError, compile_catalog
+from scheduler import SCHEDULE_STUDY_DAYS, PrerequisiteCycle, SkillGraph, pack_sessions
+
+GRAPH = SkillGraph(
+    {"machine learning": ["python", "pandas", "statistics"], "pandas": ["python", "numpy"], "numpy": ["python"]},
+    {"python": 20, "numpy": 6}
+)
+
+
+def test_prerequisites_come_first_and_goals_keep_their_order():
+    order = GRAPH.learning_order(["sql", "machine learning", "numpy"], covered={"python"})
+    assert order == [
+        ("sql", None),
+        ("numpy", None),
+        ("pandas", "machine learning"),
+        ("statistics", "machine learning"),
+        ("machine learning", None),
+    ]
+    assert GRAPH.learning_order(["machine learning"], covered={"machine learning"}) == []
+
+
+def test_cycles_are_found_and_rejected_by_the_catalog(tmp_path):
+    looped = SkillGraph({"a": ["b"], "b": ["c"], "c": ["a"]}, {})
+    assert looped.find_cycle() == ["a", "b", "c", "a"]
+    with pytest.raises(PrerequisiteCycle):
+        looped.learning_order(["a"])
+
+    source = {"job_requirements": {"dev": {"required": ["a"], "preferred": [], "projects": ["x"]}},
+              "skill_prerequisites": {"a": ["b"], "b": ["a"]}}
+    with pytest.raises(CatalogError, match="cycle"):
+        compile_catalog(source, str(tmp_path / "catalog.db"))
+
+
+def test_long_chains_do_not_recurse():
+    chain = SkillGraph({f"s{i}": [f"s{i - 1}"] for i in range(1, 10000)}, {})
+    order = chain.learning_order(["s9999"])
+    assert len(order) == 10000 and order[0] == ("s0", "s1") and order[-1] == ("s9999", None)
+
+
+def test_sessions_fill_study_days_within_the_weekly_budget():
+    sessions = pack_sessions([(7, "a"), (1, "b"), (0, "c"), (3, "d"), (3, "e")], hours_per_week=10)
+    # What is left of a day goes to the next item: "b" shares day 4 with the end of "a"
+    assert sessions == [
+        (1, 2, "a", 1, 4), (2, 2, "a", 2, 4), (3, 2, "a", 3, 4), (4, 1, "a", 4, 4), (4, 1, "b", 1, 1),
+        (5, 0, "c", 1, 1), (5, 2, "d", 1, 2), (8, 1, "d", 2, 2), (8, 1, "e", 1, 2), (9, 2, "e", 2, 2),
+    ]
+
+
+def test_roadmap_schedules_every_gap_in_prerequisite_order():
+    catalog = catalog_store.current
+    user_skills = ["python"]
+    roadmap = assemble_roadmap(user_skills, "ml_engineer", 10, catalog)
+    tasks = [task for week in roadmap["weeks"] for task in week["tasks"]]
+    first_day = {}
+    for task in tasks:
+        if "skill" in task:
+            first_day.setdefault(task["skill"], task["day"])
+
+    requirements = catalog.job_requirements["ml_engineer"]
+    # Nothing is cut off, however many gaps there are
+    assert set(requirements["required"] + requirements["preferred"]) - {"python"} <= set(first_day)
+    graph = catalog.skill_graph
+    for skill, day in first_day.items():
+        for index in graph.prerequisites[graph.ids[skill]] if skill in graph.ids else ():
+            before = graph.names[index]
+            if before in first_day:
+                assert first_day[before] < day, (before, skill)
+
+    assert [task["id"] for task in tasks] == list(range(1, len(tasks) + 1))
+    days = [task["day"] for task in tasks]
+    assert days == sorted(days)
+    assert all((day - 1) % 7 < SCHEDULE_STUDY_DAYS for day in days)
+    assert roadmap["total_days"] == days[-1]
+    # Skills end part way through a day and the next one starts there
+    assert len(set(days)) < len(days)
+
+
+def test_more_hours_make_a_shorter_plan():
+    slow = build_roadmap(UserProfile(resume_text="python", dream_role="devops_engineer", hours_per_week=5))["roadmap"]
+    fast = build_roadmap(UserProfile(resume_text="python", dream_role="devops_engineer", hours_per_week=20))["roadmap"]
+    assert fast["total_days"] < slow["total_days"]
+    assert fast["total_hours"] == slow["total_hours"]
@@ -0,0 +1,85 @@
+from app import catalog_store, find_skill_gaps
+
+job_requirements = catalog_store.current.job_requirements
+skill_synonyms = catalog_store.current.skill_synonyms
+
+
+def legacy_skill_matches(required_skill, user_skills_list):
+    """The per-request skill_matches closure create_roadmap used before the skill index"""
+    required_lower = required_skill.lower()
+    for user_skill in user_skills_list:
+        user_lower = user_skill.lower()
+        if required_lower == user_lower:
+            return True
+        if required_lower in user_lower or user_lower in required_lower:
+            return True
+        if required_skill in skill_synonyms:
+            for syn in skill_synonyms[required_skill]:
+                if syn.lower() in user_lower:
+                    return True
+        for skill_key, syns in skill_synonyms.items():
+            if user_lower in [s.lower() for s in syns] and skill_key.lower() == required_lower:
+                return True
+    return False
+
+
+def legacy_skill_gaps(requirements, user_skills):
+    missing_required = [s for s in requirements["required"] if not legacy_skill_matches(s, user_skills)]
+    missing_preferred = [
+        s for s in requirements["preferred"]
+        if not legacy_skill_matches(s, user_skills) and s not in missing_required
+    ]
+    return missing_required, missing_preferred
+
+
+# Skill lists as create_roadmap sees them after extraction
+GOLDEN_CORPUS = [
+    ("ml_engineer", []),
+    ("ml_engineer", ["python", "sql"]),
+    ("ml_engineer", ["python", "tensorflow", "machine learning", "docker", "aws"]),
+    ("ml_engineer", ["python", "pytorch", "tensorflow", "sql", "machine learning",
+                     "data structures", "algorithms", "docker", "aws", "kubernetes"]),
+    ("fullstack_developer", ["javascript", "typescript", "react", "html", "css", "git"]),
+    ("fullstack_developer", ["node.js", "mongodb", "rest api", "sql"]),
+    ("data_scientist", ["python", "pandas", "numpy", "statistics", "sql"]),
+    ("data_scientist", ["machine learning", "tensorflow", "aws", "tableau"]),
+    ("devops_engineer", ["linux", "bash", "docker", "kubernetes", "jenkins", "ci/cd"]),
+    ("devops_engineer", ["git", "python", "aws", "terraform", "prometheus", "grafana"]),
+    ("cybersecurity_analyst", ["networking", "linux", "python", "firewalls"]),
+    ("cybersecurity_analyst", ["encryption", "security", "cloud security", "siem"]),
+    ("product_manager", ["agile", "analytics", "communication", "jira"]),
+    ("product_manager", ["sql", "figma", "user research", "roadmapping", "product strategy"]),
+    ("product_manager", ["unknown skill", "basket weaving"]),
+]
+
+
+def test_index_matches_legacy_gaps_on_golden_corpus():
+    for role, user_skills in GOLDEN_CORPUS:
+        requirements = job_requirements[role]
+        assert find_skill_gaps(requirements, user_skills) == legacy_skill_gaps(requirements, user_skills), role
+
+
+def test_synonym_coverage():
+    requirements = job_requirements["devops_engineer"]
+    missing_required, _ = find_skill_gaps(requirements, ["k8s", "gitlab ci"])
+    assert "kubernetes" not in missing_required
+    assert "ci/cd" not in missing_required
+    assert "git" not in missing_required
+
+
+def test_substring_accidents_no_longer_cover_skills():
+    # The old closure matched "ml" inside "html" and "py" inside "pytorch"/"numpy"
+    missing_required, _ = find_skill_gaps(job_requirements["ml_engineer"], ["html", "pytorch", "numpy"])
+    assert "machine learning" in missing_required
+    assert "python" in missing_required
+
+
+def test_large_requirement_lists_match_skill_by_skill():
+    requirements = {
+        "required": [f"skill {i}" for i in range(500)],
+        "preferred": [f"extra {i}" for i in range(500)],
+    }
+    user_skills = [f"skill {i}" for i in range(0, 500, 2)]
+    missing_required, missing_preferred = find_skill_gaps(requirements, user_skills)
+    assert missing_required == [f"skill {i}" for i in range(1, 500, 2)]
+    assert len(missing_preferred) == 500
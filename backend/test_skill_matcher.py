@@ -0,0 +1,36 @@
+from app import catalog_store
+from skill_matcher import SkillMatcher, build_skill_index
+
+SYNONYMS = {
+    "javascript": ["javascript", "js", "typescript", "ts"],
+    "machine learning": ["machine learning", "ml", "ai"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "ci/cd": ["ci/cd", "gitlab ci"],
+    "git": ["git", "gitlab"],
+}
+MATCHER = SkillMatcher(build_skill_index(list(SYNONYMS), SYNONYMS))
+
+
+def test_aliases_do_not_match_inside_other_words():
+    assert MATCHER.find("Delivered results and helped maintain the platform") == []
+    assert MATCHER.find("Tsunami modelling, aims, jstor, digital") == []
+
+
+def test_aliases_match_at_punctuation_and_line_edges():
+    assert MATCHER.find("TS, Go and Rust") == ["javascript"]
+    assert MATCHER.find("Applied research (AI)") == ["machine learning"]
+    assert MATCHER.find("k8s\nships with gitlab") == ["git", "kubernetes"]
+    assert MATCHER.find("ts") == ["javascript"]
+
+
+def test_synonyms_report_their_canonical_skill():
+    assert MATCHER.find("Deployed with K8s") == ["kubernetes"]
+    # "gitlab ci" also stands for the "gitlab" nested inside it
+    assert MATCHER.find("Pipelines in GitLab CI") == ["ci/cd", "git"]
+    assert MATCHER.count("ml, ai and machine learning") == {"machine learning": 3}
+
+
+def test_catalog_matcher_keeps_word_boundaries():
+    matcher = catalog_store.current.skill_matcher
+    assert matcher.find("Results were maintained") == []
+    assert matcher.find("React with TS, (AI) and k8s") == ["javascript", "kubernetes", "machine learning", "react"]
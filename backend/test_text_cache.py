@@ -0,0 +1,56 @@
+import os
+import sys
+
+from text_cache import ExtractionCache, digest_key
+
+
+def test_memory_tier_evicts_least_recently_used_past_its_byte_cap():
+    text = "x" * 1000
+    cache = ExtractionCache(max_bytes=2 * sys.getsizeof(text), disk_path="")
+    cache.put("a", text)
+    cache.put("b", text)
+    assert cache.get("a") == text
+    cache.put("c", text)
+
+    # "b" was the least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == text and cache.get("c") == text
+    assert cache.evictions == 1
+    assert cache.size_bytes <= cache.max_bytes
+
+    cache.put("huge", "y" * 10000)
+    assert cache.get("huge") is None
+
+
+def test_disk_tier_answers_after_a_memory_miss(tmp_path):
+    path = str(tmp_path / "text.db")
+    key = digest_key("ab" * 32, "pdf")
+    cache = ExtractionCache(disk_path=path)
+    cache.put(key, "Python and SQL")
+    cache.close()
+
+    restarted = ExtractionCache(disk_path=path)
+    assert restarted.get(key) == "Python and SQL"
+    assert restarted.disk_hits == 1
+    # Promoted back into memory
+    assert restarted.get(key) == "Python and SQL"
+    assert restarted.disk_hits == 1 and restarted.hits == 2
+    restarted.close()
+
+
+def test_disk_tier_deletes_the_oldest_entries_past_its_byte_cap(tmp_path):
+    path = str(tmp_path / "text.db")
+    # Random text barely compresses, so each entry is about 3.5 KB on disk
+    texts = {f"key{index}": os.urandom(3000).hex() for index in range(5)}
+    cache = ExtractionCache(disk_path=path, disk_max_bytes=12000)
+    for key, text in texts.items():
+        cache.put(key, text)
+    assert cache.disk_bytes <= 12000
+    assert cache.disk_evictions == 2
+    cache.close()
+
+    restarted = ExtractionCache(disk_path=path, disk_max_bytes=12000)
+    assert restarted.disk_bytes <= 12000
+    assert restarted.get("key0") is None and restarted.get("key1") is None
+    assert restarted.get("key4") == texts["key4"]
+    restarted.close()
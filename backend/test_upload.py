@@ -0,0 +1,103 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import app as app_module
+from app import app
+from benchmarks.corpus import write_docx, write_pdf
+from extraction import EXTRACTORS, OLE_MAGIC, sniff_format
+
+client = TestClient(app)
+RESUME = b"Backend developer: Python, FastAPI, PostgreSQL and Docker."
+
+
+def test_raw_body_upload_is_extracted():
+    response = client.post(
+        "/api/extract-resume-raw?filename=CV.txt",
+        content=RESUME,
+        headers={"Content-Type": "application/octet-stream"}
+    )
+    data = response.json()
+    assert data["success"]
+    assert data["filename"] == "cv.txt"
+    assert "FastAPI" in data["extracted_text"]
+
+
+def test_raw_body_upload_size_limit(monkeypatch):
+    monkeypatch.setattr(app_module, "UPLOAD_MAX_BYTES", 16)
+
+    response = client.post("/api/extract-resume-raw", content=RESUME)
+    assert response.status_code == 413
+    assert not response.json()["success"]
+
+    # Without a Content-Length the limit is enforced on the streamed bytes
+    def chunks():
+        yield RESUME[:10]
+        yield RESUME[10:]
+    response = client.post("/api/extract-resume-raw", content=chunks())
+    assert response.status_code == 413
+
+
+def upload(filename, content):
+    return client.post(f"/api/extract-resume-raw?filename={filename}", content=content).json()
+
+
+def test_format_comes_from_the_bytes_not_the_name(tmp_path):
+    pdf, docx = tmp_path / "cv.pdf", tmp_path / "cv.docx"
+    write_pdf("Kotlin and GraphQL engineer", str(pdf))
+    write_docx("Swift and Figma designer", str(docx))
+
+    # A PDF renamed to .txt is still parsed as a PDF, not read as bytes
+    data = upload("cv.txt", pdf.read_bytes())
+    assert data["success"] and data["metadata"]["format"] == "pdf"
+    assert "Kotlin" in data["extracted_text"]
+
+    assert sniff_format(str(docx)) == "docx"
+    data = upload("cv.bin", docx.read_bytes())
+    assert data["success"] and "Figma" in data["extracted_text"]
+
+
+def test_legacy_doc_fails_fast():
+    doc = OLE_MAGIC + bytes(1024)
+    data = upload("cv.doc", doc)
+    assert not data["success"]
+    assert "Legacy .doc" in data["error"]
+
+
+def test_utf16_text_with_a_byte_order_mark_is_read_as_text(tmp_path):
+    text = "Développeuse Python et Django"
+    for encoding in ("utf-16", "utf-8-sig"):
+        path = tmp_path / f"cv-{encoding}.txt"
+        path.write_bytes(text.encode(encoding))
+        assert sniff_format(str(path)) == "txt"
+        data = upload("cv.txt", path.read_bytes())
+        assert data["success"] and data["extracted_text"] == text
+
+
+def on_event_loop():
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def test_cache_and_text_reads_stay_off_the_event_loop(tmp_path, monkeypatch):
+    calls = {}
+    cache = app_module.extraction_cache
+
+    def recording(name, func):
+        def call(*args):
+            calls[name] = on_event_loop()
+            return func(*args)
+        return call
+
+    monkeypatch.setattr(cache, "get", recording("get", cache.get))
+    monkeypatch.setattr(cache, "put", recording("put", cache.put))
+    monkeypatch.setitem(EXTRACTORS, "txt", [("text", recording("txt", EXTRACTORS["txt"][0][1]))])
+
+    pdf = tmp_path / "cv.pdf"
+    write_pdf("Elixir and Phoenix, read once", str(pdf))
+    assert upload("cv.pdf", pdf.read_bytes())["success"]
+    assert upload("cv.txt", b"Haskell and OCaml")["success"]
+    assert calls == {"get": False, "put": False, "txt": False}
@@ -0,0 +1,70 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import app as app_module
+from app import app, catalog_store
+from catalog import Catalog
+from extraction import PARSER_MODULES, ParserWarmup
+from parse_pool import ParsePool
+
+client = TestClient(app)
+
+
+def thread_pool():
+    return ParsePool(kind="thread", workers=2)
+
+
+def test_eager_warm_up_is_done_before_start_returns():
+    warmup = ParserWarmup(thread_pool(), mode="eager")
+    assert not warmup.ready
+
+    asyncio.run(warmup.start())
+    assert warmup.ready
+    assert set(warmup.imports_ms) == set(PARSER_MODULES)
+    assert warmup.duration_ms is not None and warmup.error is None
+    warmup.pool.shutdown()
+
+
+def test_background_warm_up_reports_ready_when_done():
+    async def scenario():
+        warmup = ParserWarmup(thread_pool(), mode="background")
+        await warmup.start()
+        assert not warmup.ready
+        await warmup._task
+        assert warmup.ready
+        await warmup.stop()
+        warmup.pool.shutdown()
+    asyncio.run(scenario())
+
+
+def test_lazy_mode_loads_nothing_up_front():
+    warmup = ParserWarmup(thread_pool(), mode="lazy")
+    asyncio.run(warmup.start())
+    assert warmup.ready
+    assert warmup.preload() == {} and warmup.imports_ms == {}
+
+
+def test_readiness_endpoint(monkeypatch):
+    warmup = ParserWarmup(thread_pool(), mode="background")
+    monkeypatch.setattr(app_module, "parser_warmup", warmup)
+
+    response = client.get("/api/ready")
+    assert response.status_code == 503
+    assert not response.json()["success"]
+
+    warmup.ready = True
+    response = client.get("/api/ready")
+    assert response.status_code == 200
+    assert response.json()["parsers"]["mode"] == "background"
+
+
+def test_server_warm_up_loads_every_role(monkeypatch):
+    catalog = Catalog(catalog_store.current.path)
+    monkeypatch.setattr(catalog_store, "current", catalog)
+    assert catalog.stats()["roles_loaded"] == 0
+
+    app_module.warm_up()
+    stats = catalog.stats()
+    assert stats["roles_loaded"] == stats["roles"] > 0
+    catalog.close()
@@ -0,0 +1,143 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+# ========== EXTRACTION CACHE SETTINGS ==========
+RESUME_CACHE_MAX_BYTES = int(os.environ.get("RESUME_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Set to a file path to keep extracted text across restarts
+RESUME_CACHE_PATH = os.environ.get("RESUME_CACHE_PATH", "")
+# Compressed bytes kept in that file; the oldest entries are deleted past it
+RESUME_CACHE_DISK_MAX_BYTES = int(os.environ.get("RESUME_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+def digest_key(hexdigest, kind=""):
+    """Content address for an uploaded file: its SHA-256 plus the parsed format"""
+    return f"{kind}:{hexdigest}"
+
+
+class ExtractionCache:
+    """Extracted resume text keyed by the hash of the uploaded bytes.
+
+    Recently used texts live in an in-memory LRU capped at `max_bytes`.
+    When `disk_path` is set, every entry is also written zlib-compressed to
+    a SQLite file so a restart does not have to re-parse the same uploads;
+    a disk hit is promoted back into memory. The file holds at most
+    `disk_max_bytes` of compressed text; the oldest entries go first.
+    """
+
+    def __init__(self, max_bytes=RESUME_CACHE_MAX_BYTES, disk_path=RESUME_CACHE_PATH,
+                 disk_max_bytes=RESUME_CACHE_DISK_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.size_bytes = 0
+        self.disk_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS extracted_text ("
+                "key TEXT PRIMARY KEY, text BLOB NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS extracted_text_created ON extracted_text (created)")
+            self._db.commit()
+            self.disk_bytes = self._db.execute("SELECT COALESCE(SUM(length(text)), 0) FROM extracted_text").fetchone()[0]
+
+    def get(self, key):
+        """Return the cached text for key, or None"""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+
+            if self._db is not None:
+                row = self._db.execute("SELECT text FROM extracted_text WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    text = zlib.decompress(row[0]).decode("utf-8")
+                    self._remember(key, text)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return text
+
+            self.misses += 1
+            return None
+
+    def put(self, key, text):
+        with self._lock:
+            self._remember(key, text)
+            if self._db is not None:
+                self._store(key, zlib.compress(text.encode("utf-8")))
+
+    def _store(self, key, blob):
+        if len(blob) > self.disk_max_bytes:
+            return
+        old = self._db.execute("SELECT length(text) FROM extracted_text WHERE key = ?", (key,)).fetchone()
+        self._db.execute(
+            "INSERT OR REPLACE INTO extracted_text (key, text, created) VALUES (?, ?, ?)",
+            (key, blob, time.time())
+        )
+        self.disk_bytes += len(blob) - (old[0] if old else 0)
+        if self.disk_bytes > self.disk_max_bytes:
+            # Oldest first, until the file is back under its cap
+            evicted = []
+            excess = self.disk_bytes - self.disk_max_bytes
+            for old_key, size in self._db.execute(
+                "SELECT key, length(text) FROM extracted_text WHERE key != ? ORDER BY created", (key,)
+            ):
+                if excess <= 0:
+                    break
+                evicted.append((old_key,))
+                excess -= size
+                self.disk_bytes -= size
+            self._db.executemany("DELETE FROM extracted_text WHERE key = ?", evicted)
+            self.disk_evictions += len(evicted)
+        self._db.commit()
+
+    def _remember(self, key, text):
+        size = sys.getsizeof(text)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size_bytes -= sys.getsizeof(old)
+        self._entries[key] = text
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= sys.getsizeof(evicted)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "disk_bytes": self.disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes,
+            "disk_evictions": self.disk_evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "disk_enabled": self._db is not None,
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
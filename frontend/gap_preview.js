@@ -0,0 +1,87 @@
+// Skill gaps computed in the browser from the catalog bundle served at
+// /api/catalog/bundle/{version}, so the form can preview them while the user
+// types. Mirrors collect_user_skills and find_skill_gaps in backend/app.py;
+// backend/test_gap_preview.py runs both on the same profiles and compares.
+(function (root) {
+    'use strict';
+
+    // CLIENT_BUNDLE_FORMAT in backend/catalog.py
+    const BUNDLE_FORMAT = 1;
+
+    // normalize_skill: lowercase and collapse internal whitespace to single spaces
+    function normalizeSkill(name) {
+        return name.toLowerCase().split(/\s+/).filter(Boolean).join(' ');
+    }
+
+    function sorted(values) {
+        return [...values].sort((a, b) => (a < b ? -1 : a > b ? 1 : 0));
+    }
+
+    function createGapPreview(bundle) {
+        if (bundle.format !== BUNDLE_FORMAT) {
+            throw new Error(`Catalog bundle format ${bundle.format} is not supported (expected ${BUNDLE_FORMAT})`);
+        }
+        // Maps, not plain objects: an alias or role may be named like an Object property
+        const aliases = new Map(Object.entries(bundle.aliases));
+        const roles = new Map(Object.entries(bundle.roles));
+        const pattern = new RegExp(bundle.pattern, 'g');
+
+        // SkillMatcher.find
+        function findSkills(text) {
+            const found = new Set();
+            const seenAliases = new Set();
+            for (const match of text.toLowerCase().matchAll(pattern)) {
+                const alias = match[0];
+                if (seenAliases.has(alias)) continue;
+                seenAliases.add(alias);
+                aliases.get(normalizeSkill(alias)).forEach(skill => found.add(skill));
+            }
+            return sorted(found);
+        }
+
+        // collect_user_skills
+        function collectUserSkills(resumeText, currentSkills) {
+            const userSkills = new Set(findSkills(resumeText));
+            for (let skill of currentSkills) {
+                skill = skill.toLowerCase().trim();
+                if (!skill) continue;
+                // Known skill or synonym, else any skill mentioned in the phrase, else as-is
+                let matched = aliases.get(normalizeSkill(skill)) || findSkills(skill);
+                if (!matched.length) matched = [skill];
+                matched.forEach(found => userSkills.add(found));
+            }
+            return sorted(userSkills);
+        }
+
+        // find_skill_gaps, with canonical_skill_ids
+        function findSkillGaps(role, userSkills) {
+            const [required, preferred] = roles.get(role);
+            const covered = new Set();
+            for (const skill of userSkills) {
+                const name = normalizeSkill(skill);
+                (aliases.get(name) || [name]).forEach(id => covered.add(id));
+            }
+            const requiredSet = new Set(required);
+            return {
+                required: required.filter(skill => !covered.has(skill)),
+                preferred: preferred.filter(skill => !covered.has(skill) && !requiredSet.has(skill))
+            };
+        }
+
+        // Same fields as the roadmap's analysis.skills_found and skill_gaps; null for a role the catalog lacks
+        function preview(profile) {
+            if (!roles.has(profile.dream_role)) return null;
+            const skills = collectUserSkills(profile.resume_text || '', profile.current_skills || []);
+            return {skills_found: skills, skill_gaps: findSkillGaps(profile.dream_role, skills)};
+        }
+
+        return {version: bundle.version, findSkills, collectUserSkills, findSkillGaps, preview};
+    }
+
+    const api = {BUNDLE_FORMAT, normalizeSkill, createGapPreview};
+    if (typeof module === 'object' && module.exports) {
+        module.exports = api;
+    } else {
+        root.GapPreview = api;
+    }
+})(this);